@@ -0,0 +1,94 @@
+# answer_cache.py
+#
+# Final chat answers, reused when the same question comes back for the same
+# estimate. The key is the normalized question plus a hash of the project
+# inputs and the price catalog digest, so a "set" edit or a new
+# material_prices.json makes old entries miss on their own.
+
+import hashlib
+import json
+import os
+import re
+import time
+
+from intent_router import normalize
+from price_catalog import price_catalog, prices_version
+from utils import LRUCache
+
+# Follow-ups lean on the previous turn ("and for 3 floors?", "why is that so high?"),
+# so the same words can mean something else next time
+FOLLOW_UP = re.compile(r"^(?:and|also|then|so|what about|aur|phir)\b"
+                       r"|\b(?:it|its|that|this|those|these|them|same|above|previous)\b")
+
+
+def inputs_digest(ctx) -> str:
+    raw = json.dumps(ctx.inputs(), sort_keys=True, default=repr)
+    return hashlib.sha1(raw.encode()).hexdigest()[:12]
+
+
+class AnswerCache(LRUCache):
+    """
+    LRU of final agent answers with a time-to-live.
+
+    Entries are (expires_at, agent name, answer). With `path`, the cache is
+    read at start and written by save(), so answers carry across sessions;
+    the price digest (not the in-process version counter) keeps that safe.
+    """
+
+    def __init__(self, maxsize: int = 128, ttl: float = 24 * 3600, path: str = None):
+        super().__init__(maxsize)
+        self.ttl = ttl
+        self.path = path
+        self.expired = 0
+        if path and os.path.exists(path):
+            self.load()
+
+    def key(self, question: str, ctx):
+        text = normalize(question)
+        if not text or FOLLOW_UP.search(text):
+            return None
+        prices_version()  # re-read material_prices.json if it changed, so the digest is current
+        return f"{inputs_digest(ctx)}:{price_catalog.digest}:{text}"
+
+    def lookup(self, question: str, ctx):
+        """(agent name, answer) for a cached question, else None."""
+        key = self.key(question, ctx)
+        if key is None:
+            return None
+        entry = self.get(key)
+        if entry is None:
+            return None
+        expires, agent, answer = entry
+        if expires < time.time():
+            with self._lock:
+                self._data.pop(key, None)
+                self.hits -= 1
+                self.misses += 1
+                self.expired += 1
+            return None
+        return agent, answer
+
+    def store(self, question: str, ctx, agent: str, answer: str):
+        key = self.key(question, ctx)
+        if key is not None and answer and answer.strip():
+            self.put(key, (time.time() + self.ttl, agent, answer))
+
+    def load(self):
+        with open(self.path) as file:
+            entries = json.load(file)
+        now = time.time()
+        for key, entry in entries.items():
+            if entry[0] >= now:
+                self.put(key, tuple(entry))
+
+    def save(self):
+        if not self.path:
+            return
+        now = time.time()
+        with self._lock:
+            entries = {key: list(entry) for key, entry in self._data.items() if entry[0] >= now}
+        with open(self.path, "w") as file:
+            json.dump(entries, file)
+
+    def stats(self) -> dict:
+        return {**super().stats(), "expired": self.expired, "ttl_s": self.ttl}
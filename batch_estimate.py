@@ -0,0 +1,461 @@
+# batch_estimate.py
+
+import numpy as np
+
+from price_catalog import load_prices
+from records import GrayStructureResult, SteelResult
+from room_parser import Room, parse_sizes
+
+# Spec columns understood by the batch engine (same names as shared_inputs)
+SPEC_FIELDS = [
+    "number_of_floors",
+    "plot_length_ft",
+    "plot_width_ft",
+    "number_of_rooms",
+    "room_sizes",
+    "bathroom_sizes",
+    "kitchen_sizes",
+    "number_of_columns",
+    "include_underground_tank",
+    "ug_tank_length_ft",
+    "ug_tank_width_ft",
+    "include_overhead_tank",
+    "oh_tank_length_ft",
+    "oh_tank_width_ft",
+    "include_tower",
+    "tower_length_ft",
+    "tower_width_ft",
+]
+
+SPEC_DEFAULTS = {
+    "number_of_columns": 14,
+    "include_underground_tank": False,
+    "ug_tank_length_ft": 0.0,
+    "ug_tank_width_ft": 0.0,
+    "include_overhead_tank": False,
+    "oh_tank_length_ft": 0.0,
+    "oh_tank_width_ft": 0.0,
+    "include_tower": False,
+    "tower_length_ft": 0.0,
+    "tower_width_ft": 0.0,
+}
+
+
+def _rows_to_columns(specs):
+    """Accept a list of spec dicts or a dict of columns; return a dict of lists."""
+    if isinstance(specs, dict):
+        n = len(next(iter(specs.values()))) if specs else 0
+        columns = {k: list(v) for k, v in specs.items()}
+    else:
+        specs = list(specs)
+        n = len(specs)
+        columns = {k: [row.get(k) for row in specs] for k in SPEC_FIELDS}
+
+    for field in SPEC_FIELDS:
+        values = columns.get(field)
+        if values is None:
+            values = [None] * n
+        default = SPEC_DEFAULTS.get(field)
+        columns[field] = [default if v is None else v for v in values]
+
+    missing = [f for f in ("number_of_floors", "plot_length_ft", "plot_width_ft", "number_of_rooms")
+               if any(v is None for v in columns[f])]
+    if missing:
+        raise ValueError(f"Missing required spec fields: {', '.join(missing)}")
+    return columns, n
+
+
+def _size_matrix(columns, n):
+    """
+    Parse the room/bath/kitchen strings into padded (rows x rooms) matrices
+    of lengths and widths, in the same order the scalar tool walks them.
+    Padding is 0 so it adds nothing to the running sums. `is_int` marks
+    entries that are Python ints in the scalar tool (defaults and padding),
+    which matters for reproducing sum() exactly.
+    """
+    # Rows often share a layout (sweeps, repeated unit types): build each distinct
+    # one once and index into it
+    layouts = {}
+    index = np.fromiter(
+        (layouts.setdefault(key, len(layouts)) for key in zip(
+            columns["room_sizes"], columns["bathroom_sizes"], columns["kitchen_sizes"], columns["number_of_rooms"]
+        )),
+        dtype=np.int64, count=n
+    )
+
+    all_rooms, bath_lists = [], []
+    for room_sizes, bathroom_sizes, kitchen_sizes, rooms in layouts:
+        room_list = parse_sizes(room_sizes)
+        bath_list = parse_sizes(bathroom_sizes)
+        kitchen_list = parse_sizes(kitchen_sizes)
+
+        if not room_list:
+            room_list = (Room(12, 12),) * rooms
+        if not bath_list:
+            bath_list = (Room(6, 6),) * rooms
+        if not kitchen_list:
+            kitchen_list = (Room(8, 10),)
+
+        all_rooms.append(room_list + bath_list + kitchen_list)
+        bath_lists.append(bath_list)
+
+    def pad(lists):
+        m = len(lists)
+        counts = np.fromiter((len(r) for r in lists), dtype=np.int64, count=m)
+        width = int(counts.max()) if m else 0
+        flat = [room for rooms in lists for room in rooms]
+
+        # Scatter the flat (length, width) pairs into their (layout, slot) cells
+        rows = np.repeat(np.arange(m), counts)
+        starts = np.repeat(np.cumsum(counts) - counts, counts)
+        slots = np.arange(len(flat)) - starts
+
+        L = np.zeros((m, width))
+        W = np.zeros((m, width))
+        is_int = np.ones((m, width), dtype=bool)
+        if flat:
+            L[rows, slots] = [room.length for room in flat]
+            W[rows, slots] = [room.width for room in flat]
+            is_int[rows, slots] = [type(room.length) is int for room in flat]
+        return L[index], W[index], is_int[index]
+
+    L, W, is_int = pad(all_rooms)
+    BL, BW, _ = pad(bath_lists)
+    return L, W, is_int, BL, BW
+
+
+def _running_sum(values):
+    # Column-by-column so every row adds in the same order as the scalar loop
+    total = np.zeros(values.shape[0])
+    for j in range(values.shape[1]):
+        total = total + values[:, j]
+    return total
+
+
+def _builtin_sum(values, is_int):
+    """
+    Row-wise equivalent of Python's sum() over a list of ints and floats.
+
+    Since 3.12, sum() adds floats with Neumaier compensation (ints are
+    added plainly once the running total is a float), so a plain running
+    sum can differ in the last bit.
+    """
+    rows = values.shape[0]
+    int_total = np.zeros(rows)
+    f = np.zeros(rows)
+    c = np.zeros(rows)
+    started = np.zeros(rows, dtype=bool)
+
+    for j in range(values.shape[1]):
+        x = values[:, j]
+        ints = is_int[:, j]
+
+        int_total = np.where(~started & ints, int_total + x, int_total)
+        first = ~started & ~ints
+        f = np.where(first, int_total + x, f)
+
+        plain = started & ints
+        f = np.where(plain, f + x, f)
+
+        comp = started & ~ints
+        t = f + x
+        err = np.where(np.abs(f) >= np.abs(x), (f - t) + x, (x - t) + f)
+        c = np.where(comp, c + err, c)
+        f = np.where(comp, t, f)
+
+        started = started | first
+
+    f = np.where((c != 0) & np.isfinite(c), f + c, f)
+    return np.where(started, f, int_total)
+
+
+def _round(values, ndigits=0):
+    """
+    Vectorized round() with Python's semantics. np.round scales by 10**n
+    first, which flips some exact-decimal ties (7.9725 -> 7.973); the few
+    values that land near a tie are rounded by Python instead.
+    """
+    values = np.asarray(values, dtype=float)
+    scale = 10.0 ** ndigits
+    scaled = values * scale
+    out = np.rint(scaled) / scale
+    near_tie = np.abs(scaled - np.floor(scaled) - 0.5) < 1e-6
+    if near_tie.any():
+        out[near_tie] = [round(float(v), ndigits) for v in values[near_tie]]
+    return out
+
+
+def _price(prices, item, field):
+    return prices.get(item, {}).get(field, 0)
+
+
+class BatchResult:
+    """
+    Column arrays for a batch of projects. `columns[name][i]` is the
+    unrounded value for row i; `records()` rebuilds the per-row dicts
+    returned by gray_structure_logic / steel_logic.
+    """
+
+    def __init__(self, columns: dict, prices: dict, size: int):
+        self.columns = columns
+        self.prices = prices
+        self.size = size
+
+    def __len__(self):
+        return self.size
+
+    def record(self, i: int) -> dict:
+        c = {k: v[i] for k, v in self.columns.items()}
+        p = self.prices
+
+        def rate(item, field):
+            swept = c.get(f"price:{item}.{field}")
+            return _price(p, item, field) if swept is None else float(swept)
+
+        gray_structure = {
+            "bricks": {
+                "estimated_bricks": int(c["estimated_bricks"]),
+                "total_wall_area_sqft": round(float(c["total_wall_area"]), 2),
+                "brick_price_per_unit": rate("bricks", "price_per_brick"),
+                "estimated_brick_cost": int(c["estimated_brick_cost"])
+            },
+            "cement_mortar": {
+                "cement_bags": round(float(c["total_cement_bags"]), 1),
+                "sand_cft": round(float(c["total_sand_cft"]), 1),
+                "rohri_cft": round(float(c["rohri_volume"]), 1),
+                "floor_tiles_cmt": round(float(c["flooring_tiles"]), 1),
+                "bath_wall_cmt": round(float(c["bath_wall_tiles"]), 1),
+                "cement_cost": round(float(c["total_cement_cost"])),
+                "sand_cost": round(float(c["total_sand_cost"])),
+                "rohri_cost": round(float(c["rohri_cost"])),
+                "marble_steps_cost": round(float(c["marble_step_cost"])),
+                "floor_tiles_cost": round(float(c["floor_tiles_cost"])),
+                "bath_wall_tiles_cost": round(float(c["bath_tiles_cost"]))
+            },
+            "concrete_mix": {
+                "total_volume_cft": round(float(c["total_volume"]), 2),
+                "cement_bags": round(float(c["cement_bags_concrete"]), 1),
+                "bajri_cft": round(float(c["bajri_cft"]), 1),
+                "crush_cft": round(float(c["crush_cft"]), 1),
+                "cement_cost": round(float(c["cement_cost_concrete"])),
+                "bajri_cost": round(float(c["bajri_cost"])),
+                "crush_cost": round(float(c["crush_cost"])),
+                "concrete_cost": round(float(c["concrete_cost"]))
+            },
+            "totals": {
+                "total_cement_bags": round(float(c["total_cement_bags"] + c["cement_bags_concrete"]), 1),
+                "total_cost": float(c["gray_structure_cost"])
+            }
+        }
+
+        steel = {
+            "rcc_volume_cft": gray_structure["concrete_mix"]["total_volume_cft"],
+            "steel_per_cft_kg": 2,
+            "total_steel_kg": float(c["steel_kg"]),
+            "total_steel_tons": float(c["steel_tons"]),
+            "steel_rate_per_ton": rate("steel", "price_per_ton"),
+            "total_steel_cost_pkr": int(c["steel_cost"])
+        }
+
+        return {
+            "gray_structure_data": gray_structure,
+            "steel_data": steel,
+            "total_cost": float(c["total_cost"])
+        }
+
+    def records(self) -> list:
+        return [self.record(i) for i in range(self.size)]
+
+    def typed_records(self) -> list:
+        """[(GrayStructureResult, SteelResult)] per row: same values as records(), a fraction of the memory."""
+        typed = []
+        for i in range(self.size):
+            record = self.record(i)
+            typed.append((GrayStructureResult.from_dict(record["gray_structure_data"]),
+                          SteelResult.from_dict(record["steel_data"])))
+        return typed
+
+
+def estimate_batch(specs, prices: dict = None, price_columns: dict = None) -> BatchResult:
+    """
+    Estimate bricks, mortar, concrete, steel and totals for many projects at once.
+
+    `specs` is a list of dicts or a dict of columns using the shared_inputs
+    field names. Every row is computed with the same arithmetic (and the same
+    operation order) as gray_structure_logic + steel_logic.
+
+    `price_columns` gives per-row prices as {"item.field": values}, e.g.
+    {"cement.price_per_bag": [1400, 1500]}; other prices come from `prices`.
+    """
+    prices = load_prices() if prices is None else prices
+    columns, n = _rows_to_columns(specs)
+
+    price_columns = {key: np.asarray(values, dtype=float) for key, values in (price_columns or {}).items()}
+    for key in price_columns:
+        item, _, field = key.partition(".")
+        if field not in prices.get(item, {}):
+            raise ValueError(f"Unknown price key '{key}' (expected item.field from material_prices.json)")
+
+    def price(item, field):
+        return price_columns.get(f"{item}.{field}", _price(prices, item, field))
+
+    floors = np.asarray(columns["number_of_floors"], dtype=np.int64)
+    plot_length = np.asarray(columns["plot_length_ft"], dtype=float)
+    plot_width = np.asarray(columns["plot_width_ft"], dtype=float)
+    rooms = np.asarray(columns["number_of_rooms"], dtype=np.int64)
+    cols = np.asarray(columns["number_of_columns"], dtype=np.int64)
+
+    # --- Tank / tower sizes with the tool's defaults ---
+    def sized(flag, length, width, default_l, default_w):
+        flag = np.asarray(columns[flag], dtype=bool)
+        length = np.asarray(columns[length], dtype=float)
+        width = np.asarray(columns[width], dtype=float)
+        length = np.where(flag, np.where(length > 0, length, default_l), 0.0)
+        width = np.where(flag, np.where(width > 0, width, default_w), 0.0)
+        return flag, length, width
+
+    ug, ug_l, ug_w = sized("include_underground_tank", "ug_tank_length_ft", "ug_tank_width_ft", 8.0, 6.0)
+    oh, oh_l, oh_w = sized("include_overhead_tank", "oh_tank_length_ft", "oh_tank_width_ft", 6.0, 5.0)
+    tower, tw_l, tw_w = sized("include_tower", "tower_length_ft", "tower_width_ft", 6.0, 6.0)
+
+    # -------------------- BRICKS --------------------
+    L, W, is_int, BL, BW = _size_matrix(columns, n)
+    wall_height = 9
+    total_wall_area = _running_sum((2 * (L + W)) * wall_height)
+    ceiling_sum = _running_sum(L * W)
+    total_bath_wall_area = _running_sum((2 * (BL + BW)) * wall_height)
+
+    total_ceiling_area = ceiling_sum * floors
+    total_wall_area = total_wall_area * (floors * 0.85)
+    estimated_bricks = np.floor(total_wall_area * 1.5).astype(np.int64)
+    brick_price = price("bricks", "price_per_brick")
+    estimated_brick_cost = np.floor(estimated_bricks * brick_price)
+
+    # -------------------- CEMENT MORTAR --------------------
+    cement_price = price("cement", "price_per_bag")
+    sand_price = price("sand", "price_per_cft")
+    rohri_price = price("rohri", "price_per_cft")
+    floor_tiles_price = price("flooring_tiles", "tiles_per_cmt")
+    bath_tiles_price = price("flooring_tiles", "tiles_per_cmt")
+    floor_area = _builtin_sum(L * W, is_int) * floors
+
+    cement_bags_masonry = estimated_bricks / 200
+    sand_cft_masonry = cement_bags_masonry * 7.5
+
+    plaster_volume = (total_wall_area + total_ceiling_area) * 2 * 0.042
+    cement_bags_plaster = (plaster_volume * 0.2) / 1.25
+    sand_cft_plaster = plaster_volume * 0.8
+
+    flooring_volume = floor_area * 0.25
+    cement_bags_flooring = (flooring_volume * 0.2) / 1.25
+    sand_cft_flooring = flooring_volume * 0.8
+
+    total_bath_wall_area = total_bath_wall_area * floors
+    flooring_tiles = floor_area / 10.7639
+    bath_wall_tiles = total_bath_wall_area / 10.7639
+
+    base_ground = plot_length * plot_width * 0.5
+    cement_bags_base_ground = (base_ground * 0.2) / 1.25
+    sand_base_ground = base_ground * 0.8
+    rohri_volume = plot_length * plot_width * (6 / 12)
+
+    total_cement_bags = cement_bags_masonry + cement_bags_plaster + cement_bags_flooring + cement_bags_base_ground
+    total_sand_cft = sand_cft_masonry + sand_cft_plaster + sand_cft_flooring + sand_base_ground
+    total_cement_cost = total_cement_bags * cement_price
+    total_sand_cost = total_sand_cft * sand_price
+    rohri_cost = rohri_volume * rohri_price
+    floor_tiles_cost = flooring_tiles * floor_tiles_price
+    bath_tiles_cost = bath_wall_tiles * bath_tiles_price
+    total_mortar_cost = total_cement_cost + total_sand_cost + rohri_cost + floor_tiles_cost + bath_tiles_cost
+
+    # -------------------- CONCRETE MIX --------------------
+    bajri_price = price("bajri", "price_per_cft")
+    crush_price = price("crush", "price_per_cft")
+    marble_step_price = price("marble_steps", "step_per_pcs")
+
+    base_concrete = 50 * cols
+    short_col_concrete = 4 * cols
+    full_col_concrete = 10.5 * cols
+    wall_length = ((plot_length + plot_width) * 2) + (rooms * 20)
+    plinth_volume = wall_length * 2 * 0.5
+    slab_volume = (plot_length * plot_width) * 0.42 * floors
+    beam_length = (2 * (plot_length + plot_width)) + (rooms * 10)
+    beam_volume = beam_length * 1.5 * 0.5 * floors
+
+    def tank_volume(flag, length, width, depth):
+        wall_volume = (2 * ((length * depth) + (width * depth))) * 0.5
+        floor = length * width * 0.5
+        return np.where(flag, wall_volume + floor + floor, 0)
+
+    ug_volume = tank_volume(ug, ug_l, ug_w, 9)
+    oh_volume = tank_volume(oh, oh_l, oh_w, 5)
+
+    total_tower_volume = np.where(
+        tower,
+        4 * (1.5 * 0.5 * 10) + tw_l * tw_w * 0.42 + (tw_l + tw_w) * 2 * 1.5 * 0.5,
+        0
+    )
+
+    steps_per_floor = int(10 / 0.583)
+    step_volume = 3.5 * 0.5 * 0.583
+    stair_volume = floors * steps_per_floor * step_volume
+    marble_step_cost = steps_per_floor * floors * marble_step_price
+
+    total_volume = (
+        base_concrete + short_col_concrete + full_col_concrete +
+        slab_volume + beam_volume + plinth_volume +
+        total_tower_volume + stair_volume + ug_volume + oh_volume
+    )
+
+    cement_cft = total_volume * (1 / 7)
+    bajri_cft = total_volume * (4 / 7)
+    crush_cft = total_volume * (2 / 7)
+    cement_bags_concrete = cement_cft / 1.25
+
+    cement_cost_concrete = cement_bags_concrete * cement_price
+    bajri_cost = bajri_cft * bajri_price
+    crush_cost = crush_cft * crush_price
+    concrete_cost = cement_cost_concrete + bajri_cost + crush_cost
+
+    gray_structure_cost = estimated_brick_cost + total_mortar_cost + concrete_cost
+
+    # -------------------- STEEL --------------------
+    steel_price = price("steel", "price_per_ton")
+    steel_kg = _round(_round(total_volume, 2) * 2, 2)
+    steel_tons = _round(steel_kg / 1000, 3)
+    steel_cost = _round(steel_tons * steel_price)
+
+    columns_out = {
+        "total_wall_area": total_wall_area,
+        "estimated_bricks": estimated_bricks,
+        "estimated_brick_cost": estimated_brick_cost,
+        "total_cement_bags": total_cement_bags,
+        "total_sand_cft": total_sand_cft,
+        "rohri_volume": rohri_volume,
+        "flooring_tiles": flooring_tiles,
+        "bath_wall_tiles": bath_wall_tiles,
+        "total_cement_cost": total_cement_cost,
+        "total_sand_cost": total_sand_cost,
+        "rohri_cost": rohri_cost,
+        "marble_step_cost": marble_step_cost,
+        "floor_tiles_cost": floor_tiles_cost,
+        "bath_tiles_cost": bath_tiles_cost,
+        "total_mortar_cost": total_mortar_cost,
+        "total_volume": total_volume,
+        "cement_bags_concrete": cement_bags_concrete,
+        "bajri_cft": bajri_cft,
+        "crush_cft": crush_cft,
+        "cement_cost_concrete": cement_cost_concrete,
+        "bajri_cost": bajri_cost,
+        "crush_cost": crush_cost,
+        "concrete_cost": concrete_cost,
+        "gray_structure_cost": gray_structure_cost,
+        "steel_kg": steel_kg,
+        "steel_tons": steel_tons,
+        "steel_cost": steel_cost,
+        "total_cost": gray_structure_cost + steel_cost,
+    }
+    columns_out.update({f"price:{key}": values for key, values in price_columns.items()})
+    # Broadcast scalars (e.g. marble steps with a fixed price) to full columns
+    columns_out = {k: np.broadcast_to(v, (n,)) for k, v in columns_out.items()}
+    return BatchResult(columns_out, prices, n)
@@ -0,0 +1,102 @@
+# benchmarks/bench_batch.py
+#
+# Compare the vectorized batch engine against looping the scalar tools.
+#
+#   python benchmarks/bench_batch.py --rows 5000
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from batch_estimate import estimate_batch, SPEC_FIELDS
+from shared_inputs import shared_inputs
+from tools.gray_structure_tool import gray_structure_logic
+from tools.steel_estimate_tool import steel_logic
+
+
+def random_sizes(rng, count, low, high):
+    return ", ".join(f"{rng.randint(low, high)}x{rng.randint(low, high)}" for _ in range(count))
+
+
+def random_spec(rng, size_pool=None):
+    rooms = rng.randint(2, 8)
+    spec = {
+        "number_of_floors": rng.randint(1, 4),
+        "plot_length_ft": float(rng.choice([45, 50, 60, 70, 90])),
+        "plot_width_ft": float(rng.choice([25, 30, 35, 40, 50])),
+        "number_of_rooms": rooms,
+        "room_sizes": random_sizes(rng, rooms, 10, 18) if rng.random() > 0.1 else "",
+        "bathroom_sizes": random_sizes(rng, rng.randint(1, rooms), 5, 9) if rng.random() > 0.1 else "",
+        "kitchen_sizes": random_sizes(rng, rng.randint(1, 2), 8, 12),
+        "number_of_columns": rng.randint(10, 30),
+        "include_underground_tank": rng.random() > 0.5,
+        "ug_tank_length_ft": float(rng.randint(0, 10)),
+        "ug_tank_width_ft": float(rng.randint(0, 8)),
+        "include_overhead_tank": rng.random() > 0.5,
+        "oh_tank_length_ft": float(rng.randint(0, 8)),
+        "oh_tank_width_ft": float(rng.randint(0, 6)),
+        "include_tower": rng.random() > 0.5,
+        "tower_length_ft": float(rng.randint(0, 12)),
+        "tower_width_ft": float(rng.randint(0, 12)),
+    }
+    if size_pool:
+        # Housing schemes reuse a handful of layouts
+        spec.update(rng.choice(size_pool))
+    return spec
+
+
+def run_scalar(spec):
+    shared_inputs.update(spec)
+    gray_structure = gray_structure_logic(**{k: spec[k] for k in SPEC_FIELDS})
+    steel = steel_logic()
+    return {
+        "gray_structure_data": gray_structure,
+        "steel_data": steel,
+        "total_cost": gray_structure["totals"]["total_cost"] + steel["total_steel_cost_pkr"]
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=5000)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--layouts", type=int, default=0,
+                        help="number of distinct room layouts to draw from (0 = every row unique)")
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    size_pool = None
+    if args.layouts:
+        size_pool = [
+            {k: spec[k] for k in ("number_of_rooms", "room_sizes", "bathroom_sizes", "kitchen_sizes")}
+            for spec in (random_spec(rng) for _ in range(args.layouts))
+        ]
+    specs = [random_spec(rng, size_pool) for _ in range(args.rows)]
+
+    start = time.perf_counter()
+    scalar = [run_scalar(spec) for spec in specs]
+    scalar_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    batch = estimate_batch(specs)
+    batch_time = time.perf_counter() - start
+    records = batch.records()
+
+    mismatches = [i for i, (a, b) in enumerate(zip(scalar, records)) if a != b]
+
+    print(f"rows:            {args.rows} ({args.layouts or 'all unique'} layouts)")
+    print(f"scalar loop:     {scalar_time:.3f}s  ({args.rows / scalar_time:,.0f} rows/s)")
+    print(f"batch (numpy):   {batch_time:.3f}s  ({args.rows / batch_time:,.0f} rows/s)")
+    print(f"speedup:         {scalar_time / batch_time:.1f}x")
+    print(f"mismatched rows: {len(mismatches)}")
+    if mismatches:
+        print(f"first mismatch at row {mismatches[0]}: {specs[mismatches[0]]}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
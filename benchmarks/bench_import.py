@@ -0,0 +1,71 @@
+# benchmarks/bench_import.py
+#
+# Import cost of the entry points, from `python -X importtime` in a fresh
+# interpreter. Shows whether the agents/openai SDK gets loaded and which
+# packages take the most time.
+#
+#   python benchmarks/bench_import.py
+#   python benchmarks/bench_import.py --modules main tools --runs 5
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Entry points for the CLI, the HTTP/batch workers and the raw tools, plus the SDK itself for reference
+DEFAULT_MODULES = ["tools", "main", "server", "batch_estimate", "agents"]
+SDK_PACKAGES = ("agents", "openai", "dotenv", "pydantic")
+
+
+def import_profile(module: str) -> dict:
+    code = (
+        f"import {module}, sys, json; "
+        f"print(json.dumps(sorted({{m.split('.')[0] for m in sys.modules}} & {set(SDK_PACKAGES)!r})))"
+    )
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", code],
+                          cwd=ROOT, capture_output=True, text=True, check=True)
+
+    # "import time: self [us] | cumulative | imported package"; top-level imports have no indent
+    packages = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        if not name.startswith("  "):
+            packages[name.strip()] = int(cumulative) / 1000
+
+    return {
+        "total_ms": round(sum(packages.values()), 2),
+        "sdk_loaded": json.loads(proc.stdout.strip().splitlines()[-1]),
+        "top": sorted(packages.items(), key=lambda item: -item[1])[:5],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure import time of the entry points")
+    parser.add_argument("--modules", nargs="+", default=DEFAULT_MODULES)
+    parser.add_argument("--runs", type=int, default=3, help="fresh interpreters per module; the fastest is kept")
+    parser.add_argument("--out", help="write results JSON here")
+    args = parser.parse_args()
+
+    report = {}
+    for module in args.modules:
+        runs = [import_profile(module) for _ in range(args.runs)]
+        best = min(runs, key=lambda run: run["total_ms"])
+        report[module] = best
+
+        sdk = ", ".join(best["sdk_loaded"]) or "none"
+        print(f"\n{module:16} {best['total_ms']:9.1f} ms   SDK packages loaded: {sdk}")
+        for name, ms in best["top"]:
+            print(f"    {name:30} {ms:9.1f} ms")
+
+    if args.out:
+        with open(args.out, "w") as file:
+            json.dump(report, file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
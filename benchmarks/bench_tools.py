@@ -0,0 +1,145 @@
+# benchmarks/bench_tools.py
+#
+# Time every estimator in tools.tool_functions, the full phase 1 pipeline and
+# agent construction (lazy and eager) on synthetic projects, and save the
+# numbers as JSON so two commits can be compared.
+#
+#   python benchmarks/bench_tools.py --out bench.json
+#   python benchmarks/bench_tools.py --out new.json --compare bench.json
+
+import argparse
+import inspect
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from benchmarks.synthetic import PRESETS, preset_project
+from room_parser import _parse_normalized
+from shared_inputs import EstimationContext
+from tools import tool_functions
+
+
+def call_tool(func, ctx):
+    # Required positional parameters (bricks, cement mortar) come from the context
+    kwargs = {
+        name: ctx.get(name)
+        for name, param in inspect.signature(func).parameters.items()
+        if name != "ctx" and param.default is inspect.Parameter.empty
+    }
+    return func(ctx=ctx, **kwargs)
+
+
+def measure(fn, iterations: int, cold: bool) -> dict:
+    """Mean/p95 wall time over `iterations` calls, plus allocations of one call."""
+    fn()  # warm up imports and the price catalog
+
+    times = []
+    for _ in range(iterations):
+        if cold:
+            _parse_normalized.cache_clear()
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+
+    if cold:
+        _parse_normalized.cache_clear()
+    tracemalloc.start()
+    fn()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    times.sort()
+    p95 = times[min(len(times) - 1, int(len(times) * 0.95))]
+    return {
+        "mean_ms": round(statistics.fmean(times) * 1000, 4),
+        "p95_ms": round(p95 * 1000, 4),
+        "min_ms": round(times[0] * 1000, 4),
+        "alloc_peak_kb": round(peak / 1024, 2),
+        "alloc_retained_kb": round(current / 1024, 2),
+    }
+
+
+def bench_project(spec: dict, iterations: int, cold: bool) -> dict:
+    import main
+
+    results = {}
+    # Tools that read upstream results (steel, cement mortar) need them in the context
+    base = EstimationContext(spec)
+    main.run_estimates(base, verbose=False)
+
+    for func in tool_functions:
+        results[func.__name__] = measure(lambda: call_tool(func, EstimationContext(base)), iterations, cold)
+
+    results["phase_1_pipeline"] = measure(
+        lambda: main.run_estimates(EstimationContext(spec), verbose=False), iterations, cold
+    )
+    results["build_agents_lazy"] = measure(lambda: main.build_agents(base, lazy=True), iterations, cold)
+    results["build_agents_eager"] = measure(lambda: main.build_agents(base, lazy=False), iterations, cold)
+    return results
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT,
+                              capture_output=True, text=True).stdout.strip()
+    except OSError:
+        return None
+
+
+def compare(current: dict, baseline: dict):
+    print(f"\nvs {baseline['meta'].get('commit')}  (mean ms, + is slower)")
+    for project, benches in current["results"].items():
+        for name, stats in benches.items():
+            old = baseline["results"].get(project, {}).get(name)
+            if not old or not old["mean_ms"]:
+                continue
+            change = (stats["mean_ms"] - old["mean_ms"]) / old["mean_ms"] * 100
+            print(f"  {project:16} {name:28} {old['mean_ms']:10.3f} -> {stats['mean_ms']:10.3f}  {change:+6.1f}%")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the estimators")
+    parser.add_argument("--projects", nargs="+", default=list(PRESETS), choices=list(PRESETS))
+    parser.add_argument("--iterations", type=int, default=50)
+    parser.add_argument("--cold", action="store_true", help="clear the room-size parse cache before every call")
+    parser.add_argument("--out", help="write results JSON here")
+    parser.add_argument("--compare", help="baseline results JSON to diff against")
+    args = parser.parse_args()
+
+    report = {
+        "meta": {
+            "commit": git_commit(),
+            "python": platform.python_version(),
+            "iterations": args.iterations,
+            "cold": args.cold,
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "results": {},
+    }
+
+    for project in args.projects:
+        report["results"][project] = bench_project(preset_project(project), args.iterations, args.cold)
+        print(f"\n{project}")
+        for name, stats in report["results"][project].items():
+            print(f"  {name:28} mean {stats['mean_ms']:9.3f} ms   p95 {stats['p95_ms']:9.3f} ms"
+                  f"   peak {stats['alloc_peak_kb']:9.1f} KiB")
+
+    if args.out:
+        with open(args.out, "w") as file:
+            json.dump(report, file, indent=2)
+
+    if args.compare:
+        with open(args.compare) as file:
+            compare(report, json.load(file))
+
+
+if __name__ == "__main__":
+    main()
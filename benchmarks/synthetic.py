@@ -0,0 +1,53 @@
+# benchmarks/synthetic.py
+#
+# Synthetic project specs, from a small house up to a 50-floor tower.
+
+import random
+
+# name: (floors, rooms, plot length ft, plot width ft)
+PRESETS = {
+    "small_house": (1, 3, 45, 25),
+    "family_house": (2, 6, 60, 35),
+    "apartment_block": (8, 64, 120, 80),
+    "tower": (50, 1000, 200, 150),
+}
+
+
+def sizes(rng, count, low, high):
+    return ", ".join(f"{rng.randint(low, high)}x{rng.randint(low, high)}" for _ in range(count))
+
+
+def synthetic_project(floors: int, rooms: int, plot_length_ft: float = 60, plot_width_ft: float = 35,
+                      seed: int = 0) -> dict:
+    """Return a full shared_inputs-style spec for a building of the given size."""
+    rng = random.Random(seed)
+    bathrooms = max(1, rooms // 2)
+    kitchens = max(1, rooms // 6)
+
+    return {
+        "plot_size_sqft": plot_length_ft * plot_width_ft,
+        "plot_length_ft": float(plot_length_ft),
+        "plot_width_ft": float(plot_width_ft),
+        "number_of_floors": floors,
+        "number_of_rooms": rooms,
+        "room_sizes": sizes(rng, rooms, 10, 18),
+        "bathroom_sizes": sizes(rng, bathrooms, 5, 9),
+        "kitchen_sizes": sizes(rng, kitchens, 8, 12),
+        "number_of_washingareas": max(1, floors),
+        "number_of_geysers": bathrooms,
+        "number_of_columns": max(14, rooms // 2),
+        "include_underground_tank": True,
+        "ug_tank_length_ft": 10.0,
+        "ug_tank_width_ft": 8.0,
+        "include_overhead_tank": True,
+        "oh_tank_length_ft": 8.0,
+        "oh_tank_width_ft": 6.0,
+        "include_tower": floors > 1,
+        "tower_length_ft": 10.0,
+        "tower_width_ft": 10.0,
+    }
+
+
+def preset_project(name: str, seed: int = 0) -> dict:
+    floors, rooms, length, width = PRESETS[name]
+    return synthetic_project(floors, rooms, length, width, seed=seed)
@@ -0,0 +1,68 @@
+# boq.py
+#
+# Bill of quantities: what a trade needs, keyed by price catalog entry,
+# without any prices applied.
+
+
+class BOQ:
+    """
+    Quantity take-off for one trade.
+
+    `lines` maps a line name to (price key, quantity, in_total). A line with
+    price key None is a fixed amount in PKR. Lines with in_total=False are
+    priced for display but left out of the trade total, matching what the
+    estimator has always reported. `measures` holds the geometry behind the
+    quantities (areas, volumes, counts) for the estimator's output.
+    """
+
+    __slots__ = ("trade", "lines", "measures")
+
+    def __init__(self, trade: str):
+        self.trade = trade
+        self.lines = {}
+        self.measures = {}
+
+    def add(self, line: str, key, quantity, in_total: bool = True):
+        self.lines[line] = (key, quantity, in_total)
+
+    def quantity(self, line: str):
+        return self.lines[line][1]
+
+    def price_keys(self) -> set:
+        return {key for key, _, _ in self.lines.values() if key is not None}
+
+    def quantities(self) -> dict:
+        """Quantities summed per price key (only lines that count towards the total)."""
+        totals = {}
+        for key, quantity, in_total in self.lines.values():
+            if in_total and key is not None:
+                totals[key] = totals.get(key, 0) + quantity
+        return totals
+
+    def fixed_cost(self):
+        return sum(q for key, q, in_total in self.lines.values() if in_total and key is None)
+
+    def __repr__(self):
+        return f"BOQ({self.trade!r}, {len(self.lines)} lines)"
+
+
+_NO_DEFAULT = object()
+
+
+def price_boq(boq: BOQ, prices: dict, default=_NO_DEFAULT) -> dict:
+    """
+    {line: cost} for one catalog. Fixed lines cost their quantity. A missing
+    price raises KeyError (like prices[item][field]) unless `default` is given.
+    """
+    costs = {}
+    for line, (key, quantity, _) in boq.lines.items():
+        if key is None:
+            costs[line] = quantity
+            continue
+        item, _, field = key.partition(".")
+        if default is _NO_DEFAULT:
+            price = prices[item][field]
+        else:
+            price = prices.get(item, {}).get(field, default)
+        costs[line] = quantity * price
+    return costs
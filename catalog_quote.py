@@ -0,0 +1,220 @@
+# catalog_quote.py
+#
+# Re-quote one project against several price catalogs (monthly, per city).
+# The quantity take-off runs once; every catalog is then priced with one
+# quantity x price matrix product.
+#
+#   python catalog_quote.py --spec project.json --catalogs material_prices.json prices/*.json
+#   python catalog_quote.py --spec project.json --db prices.db --regions "" lahore karachi --as-of 2025-01-15
+
+import argparse
+import json
+import os
+import time
+
+import numpy as np
+
+from incremental import result_cost
+from price_catalog import PriceCatalog, PriceCatalogError, load_prices
+from shared_inputs import EstimationContext
+from takeoff import PRICING, TRADES, project_takeoff
+
+
+def load_catalogs(paths) -> dict:
+    """{name: prices} with each file validated like material_prices.json; name is the file stem."""
+    catalogs = {}
+    for path in paths:
+        name = os.path.splitext(os.path.basename(path))[0]
+        if name in catalogs:
+            name = path
+        catalogs[name] = PriceCatalog(path).get()
+    return catalogs
+
+
+class CatalogQuote:
+    """
+    `totals` is (trades x catalogs), `lines[trade][line]` is one cost per
+    catalog. A trade whose BOQ needs a price a catalog doesn't have is NaN
+    for that catalog and the keys are listed in `missing[catalog]`.
+    """
+
+    def __init__(self, catalogs, trades, totals, lines, missing):
+        self.catalogs = catalogs
+        self.trades = trades
+        self.totals = totals
+        self.lines = lines
+        self.missing = missing
+
+    def grand_totals(self):
+        return np.nansum(self.totals, axis=0)
+
+    def to_dict(self, lines: bool = True) -> dict:
+        report = {}
+        grand = self.grand_totals()
+        for j, name in enumerate(self.catalogs):
+            totals = {trade: None if np.isnan(self.totals[i, j]) else round(float(self.totals[i, j]), 2)
+                      for i, trade in enumerate(self.trades)}
+            entry = {"totals": totals, "grand_total": round(float(grand[j]), 2)}
+            if lines:
+                entry["lines"] = {trade: {line: round(float(cost[j]), 2) for line, cost in trade_lines.items()}
+                                  for trade, trade_lines in self.lines.items()}
+            if self.missing.get(name):
+                entry["missing_prices"] = self.missing[name]
+            report[name] = entry
+        return report
+
+
+def quote_catalogs(boqs: dict, catalogs: dict) -> CatalogQuote:
+    """
+    Price BOQs against every catalog at once.
+
+    Trade totals are Q @ P + fixed, with Q the (trades x price keys) quantity
+    matrix and P the (price keys x catalogs) price matrix. Totals are not
+    rounded line by line the way some estimators do, so they can differ from
+    a full tool run by those roundings (under 1 PKR per line).
+    """
+    names = list(catalogs)
+    trades = [trade for trade in TRADES if trade in boqs]
+    keys = sorted(set().union(*(boq.price_keys() for boq in boqs.values())))
+    index = {key: k for k, key in enumerate(keys)}
+
+    # 🏷️ Price matrix, 0 where a catalog lacks the key (tracked separately in `absent`)
+    prices = np.zeros((len(keys), len(names)))
+    absent = np.zeros((len(keys), len(names)), dtype=bool)
+    for j, name in enumerate(names):
+        catalog = catalogs[name]
+        for key, k in index.items():
+            item, _, field = key.partition(".")
+            value = catalog.get(item, {}).get(field)
+            if value is None:
+                absent[k, j] = True
+            else:
+                prices[k, j] = value
+
+    quantities = np.zeros((len(trades), len(keys)))
+    fixed = np.zeros(len(trades))
+    for i, trade in enumerate(trades):
+        for key, quantity in boqs[trade].quantities().items():
+            quantities[i, index[key]] = quantity
+        fixed[i] = boqs[trade].fixed_cost()
+
+    totals = quantities @ prices + fixed[:, None]
+    totals[(quantities != 0) @ absent] = np.nan
+
+    lines = {}
+    for trade in trades:
+        lines[trade] = {}
+        for line, (key, quantity, _) in boqs[trade].lines.items():
+            lines[trade][line] = (np.full(len(names), float(quantity)) if key is None
+                                  else quantity * prices[index[key]])
+
+    missing = {name: [key for k, key in enumerate(keys) if absent[k, j]] for j, name in enumerate(names)}
+    return CatalogQuote(names, trades, totals, lines, missing)
+
+
+class QuoteBook:
+    """
+    Open quotes kept as BOQs. A new catalog reprices each quote from its
+    cached take-off in O(BOQ lines), through the same pricing functions the
+    estimators use, so totals match a full tool run exactly.
+    """
+
+    def __init__(self):
+        self.boqs = {}
+        self.errors = {}
+
+    def __len__(self):
+        return len(self.boqs)
+
+    def add(self, quote_id, spec: dict) -> dict:
+        """Run the take-off for a project once; returns {trade: error} for trades that failed."""
+        self.boqs[quote_id], self.errors[quote_id] = project_takeoff(EstimationContext(spec))
+        return self.errors[quote_id]
+
+    def remove(self, quote_id):
+        self.boqs.pop(quote_id, None)
+        self.errors.pop(quote_id, None)
+
+    def price(self, quote_id, prices: dict = None) -> dict:
+        """{trade: estimator result} for one quote."""
+        prices = load_prices() if prices is None else prices
+        results = {}
+        for trade, boq in self.boqs[quote_id].items():
+            try:
+                results[trade] = PRICING[trade](boq, prices)
+            except Exception as e:
+                results[trade] = {"error": str(e)}
+        return results
+
+    def reprice(self, prices: dict = None) -> dict:
+        """{quote_id: {"totals": {trade: cost}, "grand_total"}} for every open quote."""
+        prices = load_prices() if prices is None else prices
+        report = {}
+        for quote_id in self.boqs:
+            totals = {}
+            for trade, result in self.price(quote_id, prices).items():
+                cost = result_cost(result)
+                if cost is not None:
+                    totals[trade] = cost
+            report[quote_id] = {"totals": totals, "grand_total": sum(totals.values())}
+        return report
+
+
+def quote_project(spec: dict, catalogs: dict) -> dict:
+    start = time.perf_counter()
+    boqs, errors = project_takeoff(EstimationContext(spec))
+    quote = quote_catalogs(boqs, catalogs)
+    return {
+        "catalogs": quote.to_dict(),
+        "takeoff_errors": errors,
+        "seconds": time.perf_counter() - start,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Quote one project against several price catalogs")
+    parser.add_argument("--spec", required=True, help="project spec JSON (shared_inputs field names)")
+    sources = parser.add_mutually_exclusive_group(required=True)
+    sources.add_argument("--catalogs", nargs="+", help="price catalog JSON files")
+    sources.add_argument("--db", help="SQLite price store (see price_store.py)")
+    parser.add_argument("--regions", nargs="+", default=[""], help="regions to quote from --db ('' = base catalog)")
+    parser.add_argument("--as-of", help="price date YYYY-MM-DD for --db (default today)")
+    parser.add_argument("--out", help="write the full per-catalog breakdown JSON here")
+    args = parser.parse_args(argv)
+
+    with open(args.spec) as file:
+        spec = json.load(file)
+    if args.db:
+        from price_store import PriceStore
+
+        with PriceStore(args.db) as store:
+            try:
+                catalogs = store.catalogs(args.regions, args.as_of)
+            except (PriceCatalogError, ValueError) as e:  # unknown region, bad --as-of
+                parser.error(str(e))
+    else:
+        catalogs = load_catalogs(args.catalogs)
+    report = quote_project(spec, catalogs)
+
+    names = list(report["catalogs"])
+    width = max(14, *(len(name) for name in names))
+    print(f"{'':16}" + "".join(f"{name:>{width}}" for name in names))
+    for trade in TRADES:
+        row = [report["catalogs"][name]["totals"].get(trade) for name in names]
+        print(f"{trade:16}" + "".join(f"{'-':>{width}}" if v is None else f"{v:>{width},.0f}" for v in row))
+    print(f"{'TOTAL':16}" + "".join(f"{report['catalogs'][name]['grand_total']:>{width},.0f}" for name in names))
+
+    for trade, error in report["takeoff_errors"].items():
+        print(f"❌ {trade}: {error}")
+    for name in names:
+        if report["catalogs"][name].get("missing_prices"):
+            print(f"⚠️ {name} has no price for: {', '.join(report['catalogs'][name]['missing_prices'])}")
+    print(f"\n⏱️ {len(names)} catalogs priced in {report['seconds'] * 1000:.1f} ms")
+
+    if args.out:
+        with open(args.out, "w") as file:
+            json.dump(report, file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
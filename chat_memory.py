@@ -0,0 +1,106 @@
+# chat_memory.py
+#
+# Phase 2 conversation memory with a token budget. The last few turns go to
+# the model verbatim; older ones are folded into a short rolling summary, so
+# follow-ups ("and for 3 floors?") keep their context without the prompt
+# growing every turn.
+
+import json
+import re
+from collections import deque
+
+from utils import estimate_tokens
+
+_FENCED = re.compile(r"```(?:json)?\s*(.*?)```", re.S)
+_MARKDOWN = re.compile(r"[*_#>`|]+")
+
+
+def strip_tool_output(text: str) -> str:
+    """Drop JSON blocks (tool results the agents already have in the shared context)."""
+    def replace(match):
+        try:
+            json.loads(match.group(1))
+        except ValueError:
+            return match.group(0)
+        return "[tool output omitted]"
+
+    text = _FENCED.sub(replace, text)
+    lines = []
+    for line in text.splitlines():
+        stripped = line.strip()
+        if stripped.startswith("{") and stripped.endswith("}"):
+            try:
+                json.loads(stripped)
+                continue
+            except ValueError:
+                pass
+        lines.append(line)
+    return "\n".join(lines).strip()
+
+
+def clip(text: str, limit: int) -> str:
+    text = " ".join(text.split())
+    return text if len(text) <= limit else text[:limit - 1].rstrip() + "…"
+
+
+def gist(answer: str, limit: int = 160) -> str:
+    """One line from an answer: its total lines if it has any, else its first line."""
+    lines = [" ".join(_MARKDOWN.sub(" ", line).split()) for line in answer.splitlines()]
+    lines = [line for line in lines if line and set(line) != {"-"}]
+    totals = [line for line in lines if "total" in line.lower()]
+    return clip("; ".join(totals or lines[:1]), limit)
+
+
+class ChatMemory:
+    """
+    Rolling chat history for Runner input.
+
+    Keeps at most `max_turns` (question, answer) pairs verbatim, and fewer if
+    they go over `token_budget`. Older turns become one summary line each,
+    and the oldest summary lines drop off past `summary_budget` tokens.
+    """
+
+    def __init__(self, max_turns: int = 4, token_budget: int = 1000, summary_budget: int = 250):
+        self.max_turns = max_turns
+        self.token_budget = token_budget
+        self.summary_budget = summary_budget
+        self.turns = deque()
+        self.summary = deque()
+        self.folded = 0
+
+    def add_turn(self, question: str, answer: str):
+        self.turns.append((question, strip_tool_output(answer or "")))
+        while self.turns and (len(self.turns) > self.max_turns or
+                              (len(self.turns) > 1 and self.turn_tokens() > self.token_budget)):
+            self._fold(*self.turns.popleft())
+
+    def _fold(self, question: str, answer: str):
+        self.summary.append(f"- {clip(question, 100)} → {gist(answer)}")
+        self.folded += 1
+        while len(self.summary) > 1 and estimate_tokens("\n".join(self.summary)) > self.summary_budget:
+            self.summary.popleft()
+
+    def turn_tokens(self) -> int:
+        return sum(estimate_tokens(q) + estimate_tokens(a) for q, a in self.turns)
+
+    def input_for(self, question: str):
+        """Runner input: the plain question when there's no history, else a list of messages."""
+        if not self.turns and not self.summary:
+            return question
+        items = []
+        if self.summary:
+            items.append({"role": "system", "content": "Earlier in this chat:\n" + "\n".join(self.summary)})
+        for q, a in self.turns:
+            items.append({"role": "user", "content": q})
+            items.append({"role": "assistant", "content": a})
+        items.append({"role": "user", "content": question})
+        return items
+
+    def history_tokens(self) -> int:
+        summary = estimate_tokens("\n".join(self.summary)) if self.summary else 0
+        return summary + self.turn_tokens()
+
+    def clear(self):
+        self.turns.clear()
+        self.summary.clear()
+        self.folded = 0
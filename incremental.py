@@ -0,0 +1,144 @@
+# incremental.py
+#
+# Re-run only the estimators an input change can affect.
+#
+#   session = IncrementalEstimate(ctx)
+#   session.run_all()
+#   session.update(number_of_columns=20)   # reruns gray structure, then steel
+
+import functools
+import time
+from collections.abc import Mapping
+
+from shared_inputs import ContextView, EstimationContext, shared_inputs
+from price_catalog import prices_version
+from scheduler import ToolSpec, dependencies, run_tools
+from tools import phase_1_tools
+
+_MISSING = object()
+
+# Where each tool reports its total (gray structure nests it under "totals")
+COST_KEYS = ("total_cost", "total_steel_cost_pkr", "total_labour_cost_pkr")
+
+
+def result_cost(result):
+    if not isinstance(result, Mapping):  # dicts and records.Record
+        return None
+    for key in COST_KEYS:
+        if key in result:
+            return result[key]
+    return result_cost(result.get("totals"))
+
+
+def _tracked(func, seen: set, ctx):
+    # Run the tool against a view of ctx and remember which keys it read
+    view = ContextView(ctx)
+    result = func(ctx=view)
+    seen.clear()
+    seen.update(view.reads)
+    return result
+
+
+class IncrementalEstimate:
+    """
+    Phase 1 estimates for one context, kept up to date key by key.
+
+    Each tool's reads are recorded while it runs, so `update()` can rerun just
+    the tools that read a changed key, plus the tools downstream of them.
+    """
+
+    def __init__(self, ctx: EstimationContext = None, specs=None):
+        self.ctx = shared_inputs if ctx is None else ctx
+        self.reads = {}
+        self.specs = []
+        for spec in (phase_1_tools if specs is None else specs):
+            self.reads[spec.name] = set()
+            self.specs.append(ToolSpec(
+                spec.name, functools.partial(_tracked, spec.func, self.reads[spec.name]),
+                spec.reads, spec.produces, spec.label
+            ))
+
+        graph = dependencies(self.specs)
+        self.dependents = {name: {other for other, upstream in graph.items() if name in upstream}
+                           for name in graph}
+        self.runs = {}
+        self.price_version = None
+
+    def record(self, runs: dict):
+        """Store ToolRuns from a run of `self.specs` (e.g. by main.run_estimates)."""
+        self.runs.update(runs)
+        self.price_version = prices_version()
+
+    def run_all(self) -> dict:
+        self.record(run_tools(self.specs, self.ctx))
+        return self.totals()
+
+    def failed(self) -> dict:
+        """{tool name: error} for tools whose last run failed or was skipped."""
+        return {name: run.error for name, run in self.runs.items() if not run.ok}
+
+    def totals(self) -> dict:
+        """Cost per result key, for tools whose last run succeeded."""
+        totals = {}
+        for spec in self.specs:
+            run = self.runs.get(spec.name)
+            if run is not None and not run.ok:
+                continue
+            cost = result_cost(self.ctx.get(spec.produces))
+            if cost is not None:
+                totals[spec.produces] = cost
+        return totals
+
+    def affected(self, keys) -> list:
+        """Tools that read any of `keys`, plus everything downstream of them, in spec order."""
+        keys = set(keys)
+        todo = [name for name, seen in self.reads.items()
+                if keys & seen or name not in self.runs]
+        affected = set()
+        while todo:
+            name = todo.pop()
+            if name not in affected:
+                affected.add(name)
+                todo.extend(self.dependents[name])
+        return [spec.name for spec in self.specs if spec.name in affected]
+
+    def update(self, changes: dict = None, **kwargs) -> dict:
+        """
+        Apply input changes and rerun only the affected tools.
+
+        Returns the changed inputs, the tools that were rerun, the totals that
+        moved ({key: {"old", "new"}}, "new" None for a tool that now fails),
+        the new grand total over the tools that succeeded, and the errors of
+        every tool that is currently failing.
+        """
+        start = time.perf_counter()
+        changes = {**(changes or {}), **kwargs}
+        before = self.totals()
+
+        changed = {}
+        for key, value in changes.items():
+            old = self.ctx.get(key, _MISSING)
+            if old is _MISSING or old != value or type(old) is not type(value):
+                changed[key] = {"old": None if old is _MISSING else old, "new": value}
+                self.ctx[key] = value
+
+        # 🏷️ A new price catalog invalidates every tool
+        if prices_version() != self.price_version:
+            names = [spec.name for spec in self.specs]
+        else:
+            names = self.affected(changed)
+
+        if names:
+            self.ctx["price_version"] = prices_version()
+            self.record(run_tools([spec for spec in self.specs if spec.name in names], self.ctx))
+
+        after = self.totals()
+        return {
+            "changed_inputs": changed,
+            "recomputed": names,
+            "changed_totals": {key: {"old": before.get(key), "new": after.get(key)}
+                               for key in {**before, **after} if before.get(key) != after.get(key)},
+            "grand_total": sum(after.values()),
+            "errors": self.failed(),
+            "seconds": time.perf_counter() - start,
+        }
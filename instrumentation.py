@@ -0,0 +1,234 @@
+# instrumentation.py
+#
+# Call counts and timings for the estimators and agent runs. Every *_logic
+# function is wrapped with @instrument; main.py times Runner calls with
+# instruments.timer(). Nothing is recorded until instruments.enabled is set,
+# and then the wrappers cost a couple of clock reads per call.
+# instruments.profile() adds cProfile / tracemalloc capture for one run.
+
+import cProfile
+import io
+import json
+import pstats
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from functools import wraps
+
+
+def result_size(result) -> int:
+    """Bytes of the result as JSON (what the agents and reports end up carrying)."""
+    try:
+        return len(json.dumps(result, default=str))
+    except (TypeError, ValueError):
+        return len(repr(result))
+
+
+class CallStats:
+    __slots__ = ("calls", "errors", "wall", "cpu", "max_wall", "result_bytes", "last_error")
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.wall = 0.0
+        self.cpu = 0.0
+        self.max_wall = 0.0
+        self.result_bytes = 0
+        self.last_error = None
+
+    def to_dict(self) -> dict:
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "wall_ms": round(self.wall * 1000, 3),
+            "cpu_ms": round(self.cpu * 1000, 3),
+            "mean_wall_ms": round(self.wall / self.calls * 1000, 3) if self.calls else None,
+            "max_wall_ms": round(self.max_wall * 1000, 3),
+            "result_bytes": self.result_bytes,
+            "last_error": self.last_error,
+        }
+
+
+class Instruments:
+    """
+    Registry of CallStats by name.
+
+    Errors are exceptions raised by the call and {"error": ...} results, which
+    is how most estimators report failure. CPU time is per thread, so tools
+    running side by side in the phase 1 pool don't count each other's work.
+    Calls made in a process pool worker are not recorded.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.stats = {}
+        self._lock = threading.Lock()
+
+    def record(self, name: str, wall: float, cpu: float, result=None, error: str = None):
+        if error is None and isinstance(result, dict) and "error" in result:
+            error = str(result["error"])
+        size = result_size(result) if result is not None else 0
+        with self._lock:
+            stats = self.stats.get(name)
+            if stats is None:
+                stats = self.stats[name] = CallStats()
+            stats.calls += 1
+            stats.wall += wall
+            stats.cpu += cpu
+            stats.max_wall = max(stats.max_wall, wall)
+            stats.result_bytes += size
+            if error is not None:
+                stats.errors += 1
+                stats.last_error = error
+
+    def instrument(self, name: str = None):
+        """Decorator: record every call of the function under `name` (default: its name)."""
+        def decorate(func):
+            label = name or func.__name__.removesuffix("_logic")
+
+            @wraps(func)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return func(*args, **kwargs)
+                start, cpu = time.perf_counter(), time.thread_time()
+                try:
+                    result = func(*args, **kwargs)
+                except Exception as e:
+                    self.record(label, time.perf_counter() - start, time.thread_time() - cpu, error=str(e))
+                    raise
+                self.record(label, time.perf_counter() - start, time.thread_time() - cpu, result)
+                return result
+
+            return wrapper
+        return decorate
+
+    @contextmanager
+    def timer(self, name: str):
+        """
+        Time a block (e.g. an awaited Runner.run). Set `.result` on the yielded
+        object to record its size. CPU time here is the whole process's, since
+        an awaited run can hop threads.
+        """
+        if not self.enabled:
+            yield _Timing()
+            return
+        timing = _Timing()
+        start, cpu = time.perf_counter(), time.process_time()
+        try:
+            yield timing
+        except Exception as e:
+            self.record(name, time.perf_counter() - start, time.process_time() - cpu, error=str(e))
+            raise
+        self.record(name, time.perf_counter() - start, time.process_time() - cpu, timing.result)
+
+    @contextmanager
+    def profile(self, cpu: bool = True, memory: bool = False):
+        """
+        Opt-in capture for one run, with recording switched on while it lasts:
+
+            with instruments.profile(memory=True) as capture:
+                run_estimates(ctx, verbose=False)
+            print(capture.report())
+
+        Since Python 3.12 one cProfile profiler sees every thread, so the
+        tools in the phase 1 pool are included.
+        """
+        capture = Capture()
+        previous = self.enabled
+        started_tracing = memory and not tracemalloc.is_tracing()
+        if started_tracing:
+            tracemalloc.start()
+        if memory:
+            tracemalloc.reset_peak()
+        if cpu:
+            capture.profiler = cProfile.Profile()
+            capture.profiler.enable()
+        self.enabled = True
+        try:
+            yield capture
+        finally:
+            self.enabled = previous
+            if cpu:
+                capture.profiler.disable()
+            if memory:
+                capture.peak_bytes = tracemalloc.get_traced_memory()[1]
+                snapshot = tracemalloc.take_snapshot()
+                capture.top_allocations = [str(stat) for stat in snapshot.statistics("lineno")[:25]]
+                if started_tracing:
+                    tracemalloc.stop()
+
+    def reset(self):
+        with self._lock:
+            self.stats.clear()
+
+    def to_dict(self) -> dict:
+        with self._lock:
+            return {name: stats.to_dict() for name, stats in sorted(self.stats.items())}
+
+    def to_json(self) -> str:
+        return json.dumps(self.to_dict(), indent=2)
+
+    def to_prometheus(self, prefix: str = "estimator") -> str:
+        """Prometheus text exposition format, one series per name."""
+        metrics = [
+            ("calls_total", "counter", "Calls", lambda s: s.calls),
+            ("errors_total", "counter", "Calls that raised or returned an error", lambda s: s.errors),
+            ("wall_seconds_total", "counter", "Wall-clock time", lambda s: s.wall),
+            ("cpu_seconds_total", "counter", "CPU time", lambda s: s.cpu),
+            ("wall_seconds_max", "gauge", "Slowest call", lambda s: s.max_wall),
+            ("result_bytes_total", "counter", "Size of the results as JSON", lambda s: s.result_bytes),
+        ]
+        with self._lock:
+            items = sorted(self.stats.items())
+            lines = []
+            for metric, kind, help_text, value in metrics:
+                lines.append(f"# HELP {prefix}_{metric} {help_text}")
+                lines.append(f"# TYPE {prefix}_{metric} {kind}")
+                for name, stats in items:
+                    lines.append(f'{prefix}_{metric}{{name="{name}"}} {value(stats):.9g}')
+        return "\n".join(lines) + "\n"
+
+    def write(self, path: str):
+        """Write the stats to `path`: Prometheus text for .prom/.txt, JSON otherwise."""
+        text = self.to_prometheus() if path.endswith((".prom", ".txt")) else self.to_json() + "\n"
+        with open(path, "w") as file:
+            file.write(text)
+
+
+class _Timing:
+    __slots__ = ("result",)
+
+    def __init__(self):
+        self.result = None
+
+
+class Capture:
+    """What profile() collected: cProfile stats and tracemalloc peak/top allocations."""
+
+    def __init__(self):
+        self.profiler = None
+        self.peak_bytes = None
+        self.top_allocations = []
+
+    def report(self, limit: int = 15) -> str:
+        out = io.StringIO()
+        if self.profiler is not None:
+            stats = pstats.Stats(self.profiler, stream=out)
+            stats.sort_stats("cumulative").print_stats(limit)
+        if self.peak_bytes is not None:
+            out.write(f"Peak traced memory: {self.peak_bytes / 1024:,.1f} KiB\n")
+            for line in self.top_allocations[:limit]:
+                out.write(f"  {line}\n")
+        return out.getvalue()
+
+    def dump(self, path: str):
+        """Save the cProfile data for snakeviz / pstats."""
+        if self.profiler is not None:
+            self.profiler.dump_stats(path)
+
+
+# Shared by the estimators and main.py
+instruments = Instruments()
+instrument = instruments.instrument
+profile = instruments.profile
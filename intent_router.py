@@ -0,0 +1,226 @@
+# intent_router.py
+#
+# Answer direct lookups ("steel cost?", "kitni bricks?", "grand total?") from
+# the phase 1 results, without a model round trip. Anything the tables don't
+# cover with confidence goes to the agents as before.
+
+import re
+import time
+from collections.abc import Mapping
+
+# 🔎 Subject patterns, most specific first. A match blanks its words out so
+# "doors and windows" isn't also read as "doors" + "windows".
+SUBJECTS = [
+    ("grand_total", r"\bgrand\s*total\b|\btotal\s+(?:project\s+)?(?:cost|estimate|budget)\b(?!\s+of)"
+                    r"|\boverall\s+(?:cost|total)\b|\bkul\s+(?:kharcha|cost)\b"),
+    ("doors_windows", r"\bdoors?\s*(?:and|&|/|n|aur)?\s*windows?\b"),
+    ("gray_structure", r"\bgr[ae]y\s*structure\b|\bstructure\b"),
+    ("concrete", r"\bconcrete\b|\brcc\b"),
+    ("floor_tiles", r"\b(?:floor(?:ing)?\s+)?tiles?\b"),
+    ("wiring", r"\bwir(?:e|es|ing)\b"),
+    ("bricks", r"\bbricks?\b|\beent(?:ain|en)?\b|\bint(?:ain|en)\b"),
+    ("cement", r"\bcement\b"),
+    ("sand", r"\bsand\b|\breti?\b"),
+    ("bajri", r"\bbajri\b|\bgravel\b"),
+    ("crush", r"\bcrush\b"),
+    ("rohri", r"\brohri\b"),
+    ("steel", r"\bsteel\b|\bsar[iy]+a\b|\brebar\b"),
+    ("labour", r"\blabou?r\b|\bmazdoori\b"),
+    ("plumbing", r"\bplumbing\b|\bsanitary\b"),
+    ("electric", r"\belectric(?:al|ity)?\b|\bbijli\b"),
+    ("paint", r"\bpaint(?:ing)?\b|\brang\b"),
+    ("doors", r"\bdoors?\b|\bdarwaz(?:a|ay|e|ey)\b"),
+    ("windows", r"\bwindows?\b|\bkhirki(?:yan|an)?\b"),
+]
+
+COST = re.compile(r"\bcost\b|\bprice\b|\bkharcha\b|\bqeemat\b|\bkitne\s+(?:ka|ki|ke)\b|\bpkr\b|\brs\b"
+                  r"|\brupees?\b|\bbudget\b|\bamount\b|\bexpense\b")
+QUANTITY = re.compile(r"\bhow\s+(?:many|much)\b|\bquantity\b|\bqty\b|\bnumber\s+of\b|\bcount\b|\bkitni\b|\bkitne\b"
+                      r"|\bneed(?:ed)?\b|\brequired?\b|\bchahiye\b|\bbags?\b|\bcft\b|\btons?\b|\bgallons?\b"
+                      r"|\bvolume\b|\bfeet\b|\bft\b")
+AREA = re.compile(r"\barea\b|\bsq\s*ft\b|\bsqft\b")
+
+# Anything that asks for reasoning, a comparison or a what-if is for the agents
+BLOCK = re.compile(r"\bwhy\b|\bexplain\b|\bcompare\b|\bvs\b|\bversus\b|\breduce\b|\bsave\b|\bcheap|\bbetter\b"
+                   r"|\bshould\b|\bif\b|\bper\b|\beach\b|\bbreakdown\b|\bdetail|\bformula\b|\bcalculat"
+                   r"|\bhow\s+(?:is|was|did|do|does|to|can)\b|\bkyun\b|\bkaise\b|\bchange\b|\bdifference\b"
+                   r"|\binstead\b|\bwhich\b|\bbest\b|\bsuggest|\brecommend|\bincrease\b|\bdecrease\b"
+                   r"|\bpercent|%|\bmarket\b|\bquality\b|\bbrand|\bsupplier"
+                   r"|\bwhat\s+about\b|\bfor\s+\d|\brates?\b|\benough\b|^(?:is|are|does|do|can|will)\b")
+
+# A part of the house narrows the question ("sand for plaster"); the tables only hold whole-house totals
+SCOPE = re.compile(r"\bfor\b|\bke\s+liye\b|\bmein\b|\bplaster|\bmortar\b|\bmasonry\b|\bbrickwork\b|\bslabs?\b"
+                   r"|\broof\b|\bfoundation|\bcolumns?\b|\bbeams?\b|\bwalls?\b|\bceiling|\bfloors?\b|\bstor(?:ey|y|ies)\b"
+                   r"|\brooms?\b|\bbath(?:room)?s?\b|\bkitchens?\b|\binterior\b|\bexterior\b|\btanks?\b|\btower\b")
+
+# Words that can sit next to a bare subject ("the steel?", "grand total") without changing the question
+FILLER = {"the", "total", "my", "our", "ka", "ki", "ke"}
+
+MAX_WORDS = 12  # longer questions are rarely plain lookups
+
+# (subject, "cost" | "quantity" | "area") -> (label, unit, result paths to sum)
+FIELDS = {
+    ("bricks", "quantity"): ("Bricks", "pcs", [("gray_structure_data", "bricks", "estimated_bricks")]),
+    ("bricks", "cost"): ("Bricks cost", "PKR", [("gray_structure_data", "bricks", "estimated_brick_cost")]),
+    ("cement", "quantity"): ("Cement", "bags", [("gray_structure_data", "totals", "total_cement_bags")]),
+    ("cement", "cost"): ("Cement cost", "PKR", [("gray_structure_data", "cement_mortar", "cement_cost"),
+                                                ("gray_structure_data", "concrete_mix", "cement_cost")]),
+    ("sand", "quantity"): ("Sand", "cft", [("gray_structure_data", "cement_mortar", "sand_cft")]),
+    ("sand", "cost"): ("Sand cost", "PKR", [("gray_structure_data", "cement_mortar", "sand_cost")]),
+    ("bajri", "quantity"): ("Bajri", "cft", [("gray_structure_data", "concrete_mix", "bajri_cft")]),
+    ("bajri", "cost"): ("Bajri cost", "PKR", [("gray_structure_data", "concrete_mix", "bajri_cost")]),
+    ("crush", "quantity"): ("Crush", "cft", [("gray_structure_data", "concrete_mix", "crush_cft")]),
+    ("crush", "cost"): ("Crush cost", "PKR", [("gray_structure_data", "concrete_mix", "crush_cost")]),
+    ("rohri", "quantity"): ("Rohri", "cft", [("gray_structure_data", "cement_mortar", "rohri_cft")]),
+    ("rohri", "cost"): ("Rohri cost", "PKR", [("gray_structure_data", "cement_mortar", "rohri_cost")]),
+    ("concrete", "quantity"): ("Concrete volume", "cft", [("gray_structure_data", "concrete_mix", "total_volume_cft")]),
+    ("concrete", "cost"): ("Concrete cost", "PKR", [("gray_structure_data", "concrete_mix", "concrete_cost")]),
+    ("floor_tiles", "quantity"): ("Floor tiles", "cmt", [("gray_structure_data", "cement_mortar", "floor_tiles_cmt")]),
+    ("floor_tiles", "cost"): ("Floor tiles cost", "PKR", [("gray_structure_data", "cement_mortar", "floor_tiles_cost")]),
+    ("gray_structure", "cost"): ("Gray structure cost", "PKR", [("gray_structure_data", "totals", "total_cost")]),
+    ("steel", "quantity"): ("Steel", "tons", [("steel_data", "total_steel_tons")]),
+    ("steel", "cost"): ("Steel cost", "PKR", [("steel_data", "total_steel_cost_pkr")]),
+    ("labour", "area"): ("Labour area", "sqft", [("labour_data", "total_area_including_tanks_and_tower_sqft")]),
+    ("labour", "cost"): ("Labour cost", "PKR", [("labour_data", "total_labour_cost_pkr")]),
+    ("plumbing", "cost"): ("Plumbing cost", "PKR", [("plumbing_data", "total_cost")]),
+    ("electric", "cost"): ("Electrical cost", "PKR", [("electric_data", "total_cost")]),
+    ("wiring", "quantity"): ("Wire", "ft", [("electric_data", "wiring", "3_29_ft"), ("electric_data", "wiring", "7_29_ft"),
+                                           ("electric_data", "wiring", "7_36_ft"), ("electric_data", "wiring", "7_44_ft")]),
+    ("wiring", "cost"): ("Wiring cost", "PKR", [("electric_data", "wiring", "cost")]),
+    ("paint", "quantity"): ("Paint (interior + exterior)", "gallons", [("paint_data", "interior", "paint", "gallons_required"),
+                                                                      ("paint_data", "exterior", "gallons_required")]),
+    ("paint", "cost"): ("Paint cost", "PKR", [("paint_data", "total_cost")]),
+    ("doors", "quantity"): ("Doors", "pcs", [("doors_windows_data", "total_doors_qty")]),
+    ("doors", "cost"): ("Doors cost", "PKR", [("doors_windows_data", "door_cost")]),
+    ("windows", "quantity"): ("Windows", "pcs", [("doors_windows_data", "total_windows_qty")]),
+    ("windows", "cost"): ("Windows cost", "PKR", [("doors_windows_data", "window_cost")]),
+    ("doors_windows", "cost"): ("Doors & windows cost", "PKR", [("doors_windows_data", "total_cost")]),
+}
+
+_SUBJECTS = [(subject, re.compile(pattern)) for subject, pattern in SUBJECTS]
+
+
+def normalize(question: str) -> str:
+    text = re.sub(r"[^\w%&/]+", " ", question.lower())
+    return re.sub(r"\s+", " ", text).strip()
+
+
+def _lookup(ctx, path):
+    value = ctx.get(path[0])
+    for key in path[1:]:
+        if not isinstance(value, Mapping):
+            return None
+        value = value.get(key)
+    return value if isinstance(value, (int, float)) and not isinstance(value, bool) else None
+
+
+def _format(value, unit: str) -> str:
+    if unit == "PKR" or float(value).is_integer():
+        return f"{value:,.0f} {unit}"
+    return f"{value:,.2f} {unit}"
+
+
+class IntentRouter:
+    """
+    Keyword/pattern matcher over the phase 1 results in `ctx`.
+
+    `answer()` returns text for a question it can answer from the tables, or
+    None to send it to the agents. `totals` is a callable returning the
+    summary totals, or None when they can't be trusted (a tool failed), so
+    "grand total" matches the printed summary. `failed` is a callable
+    returning the result keys whose tool failed on its last run; answers
+    that read them go to the agents.
+    """
+
+    def __init__(self, ctx, totals=None, failed=None):
+        self.ctx = ctx
+        self.totals = totals
+        self.failed = failed
+        self.questions = 0
+        self.hits = 0
+        self.local_seconds = 0.0
+        self.fallback_turns = 0
+        self.fallback_seconds = 0.0
+
+    def match(self, question: str):
+        """[(subject, metric), ...] or None if the question isn't a plain lookup."""
+        text = normalize(question)
+        if not text or len(text.split()) > MAX_WORDS or BLOCK.search(text):
+            return None
+
+        subjects = []
+        for subject, pattern in _SUBJECTS:
+            text, found = pattern.subn(" ", text)
+            if found:
+                subjects.append(subject)
+        if len(subjects) > 1 and "grand_total" in subjects:
+            subjects.remove("grand_total")  # "steel total cost" is about steel
+        if not subjects or SCOPE.search(text):
+            return None
+
+        # Only answer when the question says what it wants, or is nothing but the subject
+        if COST.search(text) or subjects == ["grand_total"]:
+            metric = "cost"
+        elif AREA.search(text):
+            metric = "area"
+        elif QUANTITY.search(text):
+            metric = "quantity"
+        elif set(text.split()) <= FILLER:
+            metric = "cost"
+        else:
+            return None
+        if any(subject != "grand_total" and (subject, metric) not in FIELDS for subject in subjects):
+            return None
+        return [(subject, metric) for subject in subjects]
+
+    def lookup(self, subject: str, metric: str):
+        """(label, value, unit), or None if the tool has no result for it."""
+        if subject == "grand_total":
+            totals = self.totals() if self.totals is not None else None
+            if not totals:
+                return None
+            return "Grand Total", sum(totals.values()), "PKR"
+
+        label, unit, paths = FIELDS[(subject, metric)]
+        failed = self.failed() if self.failed is not None else ()
+        if any(path[0] in failed for path in paths):
+            return None
+        values = [_lookup(self.ctx, path) for path in paths]
+        if any(value is None for value in values):
+            return None
+        return label, sum(values), unit
+
+    def answer(self, question: str):
+        start = time.perf_counter()
+        self.questions += 1
+
+        intents = self.match(question)
+        lines = []
+        for subject, metric in intents or ():
+            found = self.lookup(subject, metric)
+            if found is None:
+                return None  # tool failed or hasn't run; let the agents explain
+            label, value, unit = found
+            lines.append(f"{label}: {_format(value, unit)}")
+        if not lines:
+            return None
+
+        self.hits += 1
+        self.local_seconds += time.perf_counter() - start
+        return "\n".join(lines)
+
+    def record_fallback(self, seconds: float):
+        """Time of a turn that went to the agents, used to estimate what local answers saved."""
+        self.fallback_turns += 1
+        self.fallback_seconds += seconds
+
+    def stats(self) -> dict:
+        model_turn = self.fallback_seconds / self.fallback_turns if self.fallback_turns else None
+        return {
+            "questions": self.questions,
+            "hits": self.hits,
+            "hit_rate": self.hits / self.questions if self.questions else 0.0,
+            "avg_local_ms": self.local_seconds / self.hits * 1000 if self.hits else 0.0,
+            "avg_model_turn_s": model_turn,
+            "seconds_saved": None if model_turn is None else self.hits * model_turn - self.local_seconds,
+        }
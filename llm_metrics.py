@@ -0,0 +1,157 @@
+# llm_metrics.py
+#
+# Per-turn model metrics for the phase 2 chat, from the agents SDK's own
+# tracing. Spans go to a local JSONL file; nothing is sent to a tracing
+# service. Imported only by the chat phase, since it needs the SDK.
+
+import json
+import threading
+from datetime import datetime
+
+from agents import TracingProcessor
+
+
+def _seconds(span) -> float:
+    if not span.started_at or not span.ended_at:
+        return 0.0
+    return (datetime.fromisoformat(span.ended_at) - datetime.fromisoformat(span.started_at)).total_seconds()
+
+
+class TurnMetrics:
+    """What one Runner.run (one trace) cost: model calls, tokens, agents, tools."""
+
+    __slots__ = ("trace_id", "agents", "handoffs", "model_calls", "input_tokens", "output_tokens",
+                 "tool_calls", "calls", "errors")
+
+    def __init__(self, trace_id: str):
+        self.trace_id = trace_id
+        self.agents = []  # in the order they ran: main agent, then the specialist it handed off to
+        self.handoffs = []
+        self.model_calls = 0
+        self.input_tokens = 0
+        self.output_tokens = 0
+        self.tool_calls = []
+        self.calls = []  # one {"agent", "model", "seconds", "input_tokens", "output_tokens"} per model call
+        self.errors = []
+
+    def to_dict(self) -> dict:
+        return {
+            "object": "turn",
+            "trace_id": self.trace_id,
+            "agents": self.agents,
+            "handoffs": self.handoffs,
+            "model_calls": self.model_calls,
+            "input_tokens": self.input_tokens,
+            "output_tokens": self.output_tokens,
+            "model_seconds": round(sum(call["seconds"] for call in self.calls), 3),
+            "tool_calls": self.tool_calls,
+            "calls": self.calls,
+            "errors": self.errors,
+        }
+
+
+class JsonlSpanExporter(TracingProcessor):
+    """
+    Tracing processor that appends every finished span, and a summary line
+    per turn, to a JSONL file. Also keeps per-agent totals for the session,
+    so expensive specialist prompts and the cost of the main agent hop show
+    up at the end of the chat.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.turns = []
+        self.by_agent = {}
+        self._open = {}  # trace_id -> TurnMetrics
+        self._agent_spans = {}  # span_id -> agent name, to attribute model calls
+        self._lock = threading.Lock()
+        self._file = open(path, "a", encoding="utf-8")
+
+    @property
+    def last_turn(self):
+        return self.turns[-1] if self.turns else None
+
+    def _write(self, item: dict):
+        self._file.write(json.dumps(item, default=str) + "\n")
+        self._file.flush()
+
+    def on_trace_start(self, trace):
+        with self._lock:
+            self._open[trace.trace_id] = TurnMetrics(trace.trace_id)
+
+    def on_trace_end(self, trace):
+        with self._lock:
+            turn = self._open.pop(trace.trace_id, None)
+            if turn is None:
+                return
+            self.turns.append(turn)
+            self._write(turn.to_dict())
+
+    def on_span_start(self, span):
+        data = span.span_data
+        if data.type != "agent":
+            return
+        with self._lock:
+            self._agent_spans[span.span_id] = data.name
+            turn = self._open.get(span.trace_id)
+            if turn is not None:
+                turn.agents.append(data.name)
+
+    def on_span_end(self, span):
+        data = span.span_data
+        with self._lock:
+            exported = span.export()
+            if exported is not None:
+                self._write(exported)
+            turn = self._open.get(span.trace_id)
+            if span.error:
+                if turn is not None:
+                    turn.errors.append(span.error.get("message"))
+            if data.type == "agent":
+                self._agent_spans.pop(span.span_id, None)
+            if turn is None:
+                return
+
+            if data.type == "generation":
+                usage = data.usage or {}
+                agent = self._agent_spans.get(span.parent_id, "?")
+                call = {
+                    "agent": agent,
+                    "model": data.model,
+                    "seconds": round(_seconds(span), 3),
+                    "input_tokens": usage.get("input_tokens", 0),
+                    "output_tokens": usage.get("output_tokens", 0),
+                }
+                turn.model_calls += 1
+                turn.input_tokens += call["input_tokens"]
+                turn.output_tokens += call["output_tokens"]
+                turn.calls.append(call)
+
+                totals = self.by_agent.setdefault(agent, {"calls": 0, "input_tokens": 0, "output_tokens": 0,
+                                                          "seconds": 0.0})
+                totals["calls"] += 1
+                totals["input_tokens"] += call["input_tokens"]
+                totals["output_tokens"] += call["output_tokens"]
+                totals["seconds"] += call["seconds"]
+            elif data.type == "function":
+                turn.tool_calls.append(data.name)
+            elif data.type == "handoff":
+                turn.handoffs.append(f"{data.from_agent} → {data.to_agent}")
+
+    def shutdown(self):
+        with self._lock:
+            if not self._file.closed:
+                self._file.close()
+
+    def force_flush(self):
+        with self._lock:
+            if not self._file.closed:
+                self._file.flush()
+
+
+def format_turn(turn: TurnMetrics) -> str:
+    chain = " → ".join(dict.fromkeys(turn.agents)) or "-"
+    tools = f" · tools: {', '.join(turn.tool_calls)}" if turn.tool_calls else ""
+    seconds = sum(call["seconds"] for call in turn.calls)
+    return (f"📡 {turn.model_calls} model calls ({chain}) · {turn.input_tokens:,} in / {turn.output_tokens:,} out"
+            f" tokens · {seconds:.2f} s in the model{tools}")
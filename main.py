@@ -1,146 +1,191 @@
 import os
+import re
+import sys
 import json
+import time
 import asyncio
-from dotenv import load_dotenv
-from agents import Agent, Runner, AsyncOpenAI, OpenAIChatCompletionsModel
-from agents.run import RunConfig
-from shared_inputs import shared_inputs, get_initial_inputs
-from tools.bricks_estimate_tool import bricks_agent
-from tools import (
-    estimate_steel,
-    estimate_plumbing, estimate_paint, estimate_electric, estimate_gray_structure, estimate_labour,
-    doors_windows_tool,
-    steel_estimate_tool_func, plumbing_tool_func, gray_structure_tool_func, 
-    paint_estimate_tool_func, electric_estimate_tool_func, doors_windows_tool_func, labour_cost_tool_func
-)
-
-# Load environment variables
-load_dotenv()
-gemini_api_key = os.getenv("GEMINI_API_KEY")
-
-if not gemini_api_key:
-    raise ValueError(" GEMINI_API_KEY is missing in .env")
-
-# 🔌 Gemini API Client Setup
-external_client = AsyncOpenAI(
-    api_key=gemini_api_key,
-    base_url="https://generativelanguage.googleapis.com/v1beta/"
-)
-
-model = OpenAIChatCompletionsModel(
-    model="gemini-2.0-flash",
-    openai_client=external_client
-)
-
-config = RunConfig(
-    model=model,
-    model_provider=external_client,
-    tracing_disabled=True
-)
-
+import argparse
+from shared_inputs import DEFAULT_INPUTS, EstimationContext, shared_inputs, get_initial_inputs, parse_input
+from price_catalog import PriceCatalogError, price_catalog, prices_version
+from price_store import add_store_arguments, use_store
+import tools
+from tools import phase_1_tools
+from scheduler import run_tools
+from incremental import IncrementalEstimate, result_cost
+from intent_router import IntentRouter
+from chat_memory import ChatMemory
+from answer_cache import AnswerCache
+from instrumentation import instruments
+from utils import estimate_tokens, tool_cache
+
+model = None  # created by setup_model()
+config = None
 main_agent = None  # will be created later
+shared_context = ""  # serialized context shared by all agent prompts
 estimation_summary_text = ""  # global summary
+estimate_session = None  # IncrementalEstimate for the chat phase
+lazy_specialists = True  # build specialist agents on first handoff
+turn_timings = []  # per chat turn: answering agent, time to first token, total seconds
+intent_router = None  # answers plain lookups from phase 1 results without the model
+chat_memory = None  # recent turns + rolling summary sent with each question
+answer_cache = None  # final answers by (question, inputs, price catalog)
+llm_tracer = None  # JsonlSpanExporter when --trace is given
+
+
+def setup_model(trace_path: str = None):
+    """
+    Connect to Gemini. Only the chat phase needs this (and the API key).
+    With `trace_path`, the SDK's tracing is on and spans go to that JSONL
+    file only (never to a tracing service), for per-turn model metrics.
+    """
+    global model, config, llm_tracer
+
+    # The SDK is imported here, not at module level, so `estimate` never loads it
+    from dotenv import load_dotenv
+    from agents import AsyncOpenAI, OpenAIChatCompletionsModel
+    from agents.run import RunConfig
+
+    # Load environment variables
+    load_dotenv()
+    gemini_api_key = os.getenv("GEMINI_API_KEY")
+
+    if not gemini_api_key:
+        raise ValueError(" GEMINI_API_KEY is missing in .env")
+
+    # 🔌 Gemini API Client Setup
+    external_client = AsyncOpenAI(
+        api_key=gemini_api_key,
+        base_url="https://generativelanguage.googleapis.com/v1beta/"
+    )
 
+    model = OpenAIChatCompletionsModel(
+        model="gemini-2.0-flash",
+        openai_client=external_client
+    )
 
-#  PHASE 1 - INPUT + TOOL ESTIMATES
-def phase_1_estimation():
-    global main_agent, estimation_summary_text
+    config = RunConfig(
+        model=model,
+        model_provider=external_client,
+        tracing_disabled=trace_path is None,
+        trace_include_sensitive_data=False,  # token counts and timings only, not prompts
+        workflow_name="Construction chat"
+    )
 
-    print("\n Project info do:")
-    get_initial_inputs()
+    if trace_path:
+        from agents import set_trace_processors
+        from llm_metrics import JsonlSpanExporter
+
+        llm_tracer = JsonlSpanExporter(trace_path)
+        set_trace_processors([llm_tracer])  # replaces the default exporter to the OpenAI backend
 
-    print("\n Estimations shuru ho rahi hain...\n")
 
+def run_estimates(ctx: EstimationContext, verbose: bool = True, specs=None) -> dict:
+    """Run every phase 1 estimator (or `specs`) against ctx and return their ToolRuns."""
 
+    # 🏷️ Record which price snapshot this estimate was built with
     try:
-        gray_structure = gray_structure_tool_func(
-            number_of_floors=shared_inputs["number_of_floors"],
-            plot_length_ft=shared_inputs["plot_length_ft"],
-            plot_width_ft=shared_inputs["plot_width_ft"],
-            number_of_rooms=shared_inputs["number_of_rooms"],
-            room_sizes=shared_inputs["room_sizes"],
-            bathroom_sizes=shared_inputs["bathroom_sizes"],
-            kitchen_sizes=shared_inputs["kitchen_sizes"]
-        )
-        shared_inputs["gray_structure_data"] = gray_structure
-        print("\n🔹 gray structure Estimate:")
-        print(json.dumps(gray_structure, indent=2))
+        ctx["price_version"] = prices_version()
+        if verbose:
+            print(f"Price catalog v{price_catalog.version} ({price_catalog.digest})")
     except Exception as e:
-        print(f"❌ Grey structure tool error: {e}")
+        print(f"❌ Price catalog error: {e}")
 
+    # 🧮 Run the estimators; independent tools run concurrently, steel waits for gray structure
+    start = time.perf_counter()
+    with instruments.timer("phase_1"):
+        runs = run_tools(phase_1_tools if specs is None else specs, ctx)
+    elapsed = time.perf_counter() - start
 
-    try:
-        steel = steel_estimate_tool_func()
-        shared_inputs["steel_data"] = steel
-        print("\n🔹 Steel Estimate:")
-        print(json.dumps(steel, indent=2))
-    except Exception as e:
-        print(f"❌ Steel tool error: {e}")
+    if verbose:
+        for run in runs.values():
+            if run.ok:
+                print(f"\n🔹 {run.spec.label} Estimate ({run.seconds * 1000:.1f} ms):")
+                print(json.dumps(run.result, indent=2))
+            else:
+                print(f"❌ {run.spec.label} tool error: {run.error}")
+        print(f"\n⏱️ Estimates done in {elapsed * 1000:.1f} ms")
 
-    try:
-        plumbing = plumbing_tool_func()
-        shared_inputs["plumbing_data"] = plumbing
-        print("\n🔹 Plumbing Estimate:")
-        print(json.dumps(plumbing, indent=2))
-    except Exception as e:
-        print(f"❌ Plumbing tool error: {e}")
+    return runs
 
-    try:
-        paint = paint_estimate_tool_func()
-        shared_inputs["paint_data"] = paint
-        print("\n🔹 Paint Estimate:")
-        print(json.dumps(paint, indent=2))
-    except Exception as e:
-        print(f"❌ Paint tool error: {e}")
 
-    try:
-        electric = electric_estimate_tool_func()
-        shared_inputs["electric_data"] = electric
-        print("\n🔹 Electric Estimate:")
-        print(json.dumps(electric, indent=2))
-    except Exception as e:
-        print(f"❌ Electric tool error: {e}")
+def summary_totals(ctx: EstimationContext, runs: dict) -> dict:
+    totals = {}
+    for key in (run.spec.produces for run in runs.values()):
+        cost = result_cost(ctx.get(key))
+        if cost is not None:
+            totals[key] = cost
+    return totals
 
-    try:
-        doors_windows = doors_windows_tool_func()
-        shared_inputs["doors_windows_data"] = doors_windows
-        print("\n🔹 Doors / Windows Estimate:")
-        print(json.dumps(doors_windows, indent=2))
-    except Exception as e:
-        print(f"❌ Doors_windows tool error: {e}")
 
-    try:
-        labour_cost = labour_cost_tool_func()
-        shared_inputs["labour_data"] = labour_cost
-        print("\n🔹 Labour Estimate:")
-        print(json.dumps(labour_cost, indent=2))
-    except Exception as e:
-        print(f"❌ Labour cost tool error: {e}")
-
-    def generate_summary():
-        summary_lines = []
-        total_cost = 0
-
-        for key, value in shared_inputs.items():
-            if isinstance(value, dict) and "total_cost" in value:
-                name = key.replace("_data", "").replace("_", " ").title()
-                cost = value["total_cost"]
-                summary_lines.append(f"{name}: {cost:,} PKR")
-                total_cost += cost
-
-        summary_lines.append(f"\n**Grand Total**: {total_cost:,} PKR")
-        return "\n".join(summary_lines)
-    
-    estimation_summary_text = generate_summary()
+def failed_results() -> set:
+    """Result keys whose tool failed on its last run in the chat session."""
+    return {run.spec.produces for run in estimate_session.runs.values() if not run.ok}
+
+
+def session_totals():
+    """The chat session's totals (what 'set key=value' reports), or None if any tool failed."""
+    if failed_results():
+        return None
+    return estimate_session.totals()
+
+
+def generate_summary(ctx: EstimationContext, runs: dict) -> str:
+    summary_lines = []
+    total_cost = 0
+
+    for key, cost in summary_totals(ctx, runs).items():
+        name = key.replace("_data", "").replace("_", " ").title()
+        summary_lines.append(f"{name}: {cost:,.0f} PKR")
+        total_cost += cost
+
+    summary_lines.append(f"\n**Grand Total**: {total_cost:,.0f} PKR")
+    return "\n".join(summary_lines)
+
+
+#  PHASE 1 - INPUT + TOOL ESTIMATES
+def phase_1_estimation(ctx: EstimationContext = None, lazy_agents: bool = True):
+    global estimation_summary_text, estimate_session, lazy_specialists, intent_router
+    ctx = shared_inputs if ctx is None else ctx
+    lazy_specialists = lazy_agents
+
+    print("\n Project info do:")
+    get_initial_inputs(ctx)
+
+    print("\n Estimations shuru ho rahi hain...\n")
+
+    # 🔁 Track what each tool reads so later edits only rerun what they affect
+    estimate_session = IncrementalEstimate(ctx)
+    runs = run_estimates(ctx, specs=estimate_session.specs)
+    estimate_session.record(runs)
+    intent_router = IntentRouter(ctx, totals=session_totals, failed=failed_results)
+
+    estimation_summary_text = generate_summary(ctx, runs)
     print("\n📋 ESTIMATION SUMMARY:")
     print(estimation_summary_text)
 
+    start = time.perf_counter()
+    build_agents(ctx, lazy=lazy_agents)
+    print(f"\n🤖 Agents ready in {(time.perf_counter() - start) * 1000:.1f} ms"
+          f" ({'lazy' if lazy_agents else 'eager'} specialists)")
+    print_prompt_sizes(main_agent)
+    return ctx
+
 
+def print_prompt_sizes(agent):
+    """Instruction size of the main agent and each specialist (built or not yet)."""
+    prompts = {agent.name: agent.instructions}
+    prompts.update({name: instructions + shared_context for name, (instructions, _) in SPECIALISTS.items()})
 
-    #  multiple Agents
-    gray_structure_agent = Agent(
-        name = "Gray Structure Agent",
-        instructions = """You are a professional and friendly construction advisor who creates accurate 
+    print("\n📏 Agent prompt sizes:")
+    for name, text in prompts.items():
+        print(f"  {name:28} {len(text):7,} chars  ~{estimate_tokens(text):6,} tokens")
+
+
+# 🧑‍🔧 Specialist agents the main agent hands off to: name -> (instructions, tool name in tools).
+# The shared context is appended to the instructions when the agent is built.
+SPECIALISTS = {
+    "Gray Structure Agent": (
+        """You are a professional and friendly construction advisor who creates accurate 
                         material and cost estimates for gray structures in residential construction projects. 
                         You must always rely on the shared inputs provided below and the previously calculated 
                         material breakdown. You will respond in simple and easy-to-understand english. In the 
@@ -148,14 +193,11 @@ def phase_1_estimation():
                         sand, gravel, roof slab, columns, beams, plaster, flooring, and related gray structure items. 
                         Every response will be based on realistic construction logic — you will not provide speculative 
                         or irrelevant information. If a user asks about something unrelated to construction, politely 
-                        explain that you are only a construction estimate advisor."""
-                      f"Shared Inputs:\n{json.dumps(shared_inputs, indent=2)}\n\n",
-        tools = [estimate_gray_structure]
-    )
-
-    door_windows_agent = Agent(
-        name = "Doors and Windows Agent",
-        instructions = """
+                        explain that you are only a construction estimate advisor.""",
+        "estimate_gray_structure"
+    ),
+    "Doors and Windows Agent": (
+        """
                         You are a professional and friendly construction advisor specializing in doors, 
                         windows, and frames (chokhat) estimation. This is part of a residential construction 
                         project where a complete material and cost estimate is being generated. Always use the 
@@ -165,14 +207,11 @@ def phase_1_estimation():
                         Provide the output in a well-structured, itemized format with each component's quantity, 
                         unit, rate, and total cost. Keep your tone professional, concise, and focused only on construction 
                         estimation.
-                    """
-                    f"Shared Inputs:\n{json.dumps(shared_inputs, indent=2)}\n\n",
-        tools = [doors_windows_tool]
-    )
-
-    electrict_agent = Agent(
-        name = "Electrical Agent",
-        instructions = """
+                    """,
+        "doors_windows_tool"
+    ),
+    "Electrical Agent": (
+        """
                         You are a professional and friendly construction advisor specializing in residential 
                         electrical work estimation. This is part of a complete construction cost estimation 
                         project. Always use the shared inputs provided (number of rooms, bathrooms, kitchens, 
@@ -188,43 +227,11 @@ def phase_1_estimation():
                         Provide the output in an itemized table showing quantity, unit, rate, and total cost 
                         for each item, along with a grand total. Keep the tone professional, concise, and 
                         focused on accurate residential construction estimation only.
-                    """
-                    f"Shared Inputs:\n{json.dumps(shared_inputs, indent=2)}\n\n",
-        tools = [estimate_electric]
-    )
-
-    paint_agent = Agent(
-        name = "Paint Agent",
-        instructions = """
-                        You are a professional and friendly construction advisor specializing in paint works.
-                        This is a residential construction project for which you have generated a detailed 
-                        paint material and cost estimate. Always use the provided shared inputs and summary for reference.
-                        You can also answer any other relevant questions about paint materials, application methods, 
-                        coverage, types, durability, or maintenance. If the user asks something irrelevant to paint or 
-                        construction, politely explain that you are only a construction estimate and materials advisor.
-                    """
-                    f"Shared Inputs:\n{json.dumps(shared_inputs, indent=2)}\n\n",
-        tools = [estimate_paint]
-    )
-
-    steel_agent = Agent(
-        name = "Steel Agent",
-        instructions = """
-                        You are a professional and friendly construction advisor specializing in steel works.
-                        This is a residential construction project for which you have generated a detailed steel 
-                        material and cost estimate. Always use the provided shared inputs and summary for reference.
-                        You can also answer any other relevant questions about steel materials, grades, strength, usage 
-                        in columns, beams, slabs, bending, cutting, or storage. If the user asks something irrelevant 
-                        to steel or construction, politely explain that you are only a construction estimate and materials 
-                        advisor.
-                    """
-                    f"Shared Inputs:\n{json.dumps(shared_inputs, indent=2)}\n\n",
-        tools = [estimate_steel]     
-    )
-
-    plumbing_agent = Agent(
-        name = "Plumbing Agent",
-        instructions = """
+                    """,
+        "estimate_electric"
+    ),
+    "Plumbing Agent": (
+        """
                         You are a professional and friendly construction advisor specializing in plumbing works.
                         This is a residential construction project for which you have generated a detailed 
                         plumbing material and cost estimate. Always refer to the provided shared inputs and summary 
@@ -232,14 +239,11 @@ def phase_1_estimation():
                         pipe types and sizes, fittings, installation methods, water supply systems, drainage systems, 
                         and maintenance tips. If the user asks something unrelated to plumbing or construction, 
                         politely explain that you are only a construction estimate and materials advisor.
-                    """
-                    f"Shared Inputs:\n{json.dumps(shared_inputs, indent=2)}\n\n",
-        tools = [estimate_plumbing]
-    )
-
-    labour_agent = Agent(
-        name = "Labour Agent",
-        instructions = """
+                    """,
+        "estimate_plumbing"
+    ),
+    "Labour Agent": (
+        """
                     You are a professional and friendly construction advisor specializing in labour estimation and 
                     workforce requirements. This is a residential construction project for which you have generated a 
                     detailed labour quantity and cost estimate. Always refer to the provided shared inputs and summary 
@@ -247,42 +251,291 @@ def phase_1_estimation():
                     daily wages, productivity rates, crew sizes, work timelines, and best practices for managing 
                     construction workers. If the user asks something unrelated to labour or construction, politely 
                     explain that you are only a construction labour estimation and workforce advisor.
-                    """
-                    f"Shared Inputs:\n{json.dumps(shared_inputs, indent=2)}\n\n",
-        tools = [estimate_labour]
+                    """,
+        "estimate_labour"
+    ),
+    "Steel Agent": (
+        """
+                        You are a professional and friendly construction advisor specializing in steel works.
+                        This is a residential construction project for which you have generated a detailed steel 
+                        material and cost estimate. Always use the provided shared inputs and summary for reference.
+                        You can also answer any other relevant questions about steel materials, grades, strength, usage 
+                        in columns, beams, slabs, bending, cutting, or storage. If the user asks something irrelevant 
+                        to steel or construction, politely explain that you are only a construction estimate and materials 
+                        advisor.
+                    """,
+        "estimate_steel"
+    ),
+    "Paint Agent": (
+        """
+                        You are a professional and friendly construction advisor specializing in paint works.
+                        This is a residential construction project for which you have generated a detailed 
+                        paint material and cost estimate. Always use the provided shared inputs and summary for reference.
+                        You can also answer any other relevant questions about paint materials, application methods, 
+                        coverage, types, durability, or maintenance. If the user asks something irrelevant to paint or 
+                        construction, politely explain that you are only a construction estimate and materials advisor.
+                    """,
+        "estimate_paint"
+    ),
+}
+
+
+def build_specialist(name: str, shared_context: str):
+    from agents import Agent
+
+    instructions, tool_name = SPECIALISTS[name]
+    return Agent(name=name, instructions=instructions + shared_context, tools=[getattr(tools, tool_name)])
+
+
+def lazy_handoff(name: str, shared_context: str):
+    """
+    Handoff to a specialist that is only built when the main agent first
+    transfers to it, then reused for the rest of the session.
+    """
+    from agents import Handoff
+
+    built = []
+
+    async def on_invoke_handoff(wrapper, input_json):
+        if not built:
+            built.append(build_specialist(name, shared_context))
+        return built[0]
+
+    # Same tool name/description/schema that handoff(agent) would generate
+    return Handoff(
+        tool_name=re.sub(r"[^a-zA-Z0-9]", "_", f"transfer_to_{name}").lower(),
+        tool_description=f"Handoff to the {name} agent to handle the request. ",
+        input_json_schema={"additionalProperties": False, "type": "object", "properties": {}, "required": []},
+        on_invoke_handoff=on_invoke_handoff,
+        agent_name=name,
     )
 
+
+def build_agents(ctx: EstimationContext, lazy: bool = True):
+    """
+    Create the main agent and its handoffs. With lazy=True the specialists are
+    built on first handoff instead of up front.
+    """
+    global main_agent, shared_context
+    from agents import Agent
+
+    # 📦 Serialize the context once; every agent gets the same compact copy
+    shared_context = f"Shared Inputs:\n{ctx.prompt_json()}\n\n"
+
+    if lazy:
+        handoffs = [lazy_handoff(name, shared_context) for name in SPECIALISTS]
+    else:
+        handoffs = [build_specialist(name, shared_context) for name in SPECIALISTS]
+
     full_context = (
         "You are a professional and friendly construction advisor."  
         "This is a residential construction project for which an estimate has already been generated."  
         "Always rely on the shared inputs and summary provided below."
         "pass user query to relevent agent"  
         "If the user asks something irrelevant, politely explain that this is only a construction estimate advisor."
-        f"Shared Inputs:\n{json.dumps(shared_inputs, indent=2)}\n\n"
-        f"{estimation_summary_text}"
+        + shared_context
+        + estimation_summary_text
     )
 
     main_agent = Agent(
         name="Construction Expert Agent",
         instructions=full_context,
         model= model,
-        handoffs = [gray_structure_agent, door_windows_agent, electrict_agent, plumbing_agent, 
-                    labour_agent, steel_agent, paint_agent]
-        
+        handoffs = handoffs
     )
+    return main_agent
+
+
+def apply_edit(ctx: EstimationContext, text: str) -> dict:
+    """Handle 'set key=value' from the chat: rerun only the affected estimators."""
+    global estimation_summary_text
+
+    key, _, raw = text.strip()[len("set "):].partition("=")
+    key = key.strip()
+    value = parse_input(key, raw)  # raises before anything in ctx changes
+
+    report = estimate_session.update({key: value})
+    print(f"✏️ {key} = {value!r}: reran {', '.join(report['recomputed']) or 'nothing'}"
+          f" in {report['seconds'] * 1000:.2f} ms")
+    for name, error in report["errors"].items():
+        print(f"❌ {name} tool error: {error}")
+    for name, change in report["changed_totals"].items():
+        label = name.replace("_data", "").replace("_", " ").title()
+        old = "-" if change["old"] is None else f"{change['old']:,.0f}"
+        new = "failed" if change["new"] is None else f"{change['new']:,.0f} PKR"
+        print(f"  {label}: {old} -> {new}")
+    failed = f" (without {', '.join(report['errors'])})" if report["errors"] else ""
+    print(f"  Grand Total: {report['grand_total']:,.0f} PKR{failed}\n")
+
+    # Agents quote the context in their prompts, so rebuild them with the new numbers
+    if report["recomputed"]:
+        estimation_summary_text = generate_summary(ctx, estimate_session.runs)
+        build_agents(ctx, lazy=lazy_specialists)
+        # Earlier answers quote the old figures; don't send them back as history
+        if chat_memory:
+            chat_memory.clear()
+    return report
 
 
 # ✅ PHASE 2 - AGENT Q&A LOOP
-async def phase_2_agent_loop():
+async def stream_turn(agent, user_input, ctx: EstimationContext) -> dict:
+    """
+    Run one chat turn with the streamed runner: print text as it arrives and
+    each handoff as it happens. Returns the timings, the answering agent and
+    the final output.
+    """
+    from agents import Runner
+
+    start = time.perf_counter()
+    first_token = None
+    current = agent.name
+
+    result = Runner.run_streamed(agent, user_input, context=ctx, run_config=config)
+    print(f"\n🤖 {current}: ", end="", flush=True)
+    async for event in result.stream_events():
+        if event.type == "raw_response_event":
+            if event.data.type == "response.output_text.delta" and event.data.delta:
+                if first_token is None:
+                    first_token = time.perf_counter() - start
+                print(event.data.delta, end="", flush=True)
+        elif event.type == "agent_updated_stream_event":
+            if event.new_agent.name != current:
+                current = event.new_agent.name
+                print(f"\n🔀 {current}: ", end="", flush=True)
+        elif event.type == "run_item_stream_event" and event.name == "tool_called":
+            print(f"\n🔧 {getattr(event.item.raw_item, 'name', 'tool')}...", end="", flush=True)
+    print("\n")
+
+    return {
+        "agent": result.last_agent.name,
+        "output": result.final_output,
+        "ttft": first_token,
+        "total": time.perf_counter() - start,
+    }
+
+
+def report_prompt_size(run_input, question: str):
+    """Per-turn prompt estimate, so growth over a long session is visible."""
+    instructions = estimate_tokens(main_agent.instructions) if isinstance(main_agent.instructions, str) else 0
+    history = chat_memory.history_tokens() if chat_memory and not isinstance(run_input, str) else 0
+    asked = estimate_tokens(question)
+    memory = ""
+    if chat_memory:
+        memory = f"; {len(chat_memory.turns)} recent turns, {chat_memory.folded} summarized"
+    print(f"🧠 prompt ~{instructions + history + asked:,} tokens"
+          f" (instructions {instructions:,} + history {history:,} + question {asked:,}{memory})")
+
+
+def report_llm_turn(traced_before: int):
+    """Print the model calls, tokens and handoffs of the turn that just finished (with --trace)."""
+    if llm_tracer and len(llm_tracer.turns) > traced_before:
+        from llm_metrics import format_turn
+        print(format_turn(llm_tracer.last_turn))
+
+
+async def phase_2_agent_loop(ctx: EstimationContext = None, stream: bool = True, route: bool = True,
+                             memory_turns: int = 4, memory_tokens: int = 1000, cache: AnswerCache = None,
+                             stats_path: str = None):
+    global chat_memory, answer_cache
+    from agents import Runner
+
+    ctx = shared_inputs if ctx is None else ctx
+    chat_memory = ChatMemory(memory_turns, memory_tokens) if memory_turns > 0 else None
+    answer_cache = cache
     print("\n Ab aap kisi bhi construction ya material related sawal ka jawab le sakte hain (type 'quit' to exit):\n")
     while True:
         user_input = input("🧑 You: ")
         if user_input.lower() in ["quit", "exit"]:
+            stats = tool_cache.stats()
+            print(f"🗃️ Tool cache: {stats['hits']} hits / {stats['misses']} misses")
+            if turn_timings:
+                ttfts = [t["ttft"] for t in turn_timings if t["ttft"] is not None]
+                avg_ttft = f"{sum(ttfts) / len(ttfts):.2f} s" if ttfts else "-"
+                avg_total = sum(t["total"] for t in turn_timings) / len(turn_timings)
+                print(f"⏱️ {len(turn_timings)} turns: avg first token {avg_ttft} · avg total {avg_total:.2f} s")
+            if intent_router and intent_router.questions:
+                stats = intent_router.stats()
+                saved = "-" if stats["seconds_saved"] is None else f"~{stats['seconds_saved']:.1f} s"
+                print(f"🧭 Local answers: {stats['hits']}/{stats['questions']} ({stats['hit_rate']:.0%}),"
+                      f" avg {stats['avg_local_ms']:.2f} ms, model time saved {saved}")
+            if llm_tracer and llm_tracer.by_agent:
+                print("📡 Model calls per agent:")
+                for name, totals in llm_tracer.by_agent.items():
+                    print(f"  {name:28} {totals['calls']:3} calls  {totals['input_tokens']:8,} in"
+                          f"  {totals['output_tokens']:7,} out  {totals['seconds']:6.2f} s")
+                print(f"  Spans written to {llm_tracer.path}")
+            if answer_cache is not None:
+                stats = answer_cache.stats()
+                print(f"♻️ Answer cache: {stats['hits']} hits / {stats['misses']} misses"
+                      f" ({stats['expired']} expired, {stats['size']} stored)")
+                answer_cache.save()
+            if stats_path:
+                instruments.write(stats_path)
+                print(f"📊 Call stats written to {stats_path}")
             print("👋 Allah Hafiz!")
             break
 
+        # ✏️ "set key=value" edits an input without a model round trip
+        if user_input.lower().startswith("set "):
+            try:
+                apply_edit(ctx, user_input)
+            except ValueError as e:
+                print(f"❌ {e}")
+            continue
+
+        # ⚡ Plain lookups ("steel cost?", "grand total?") come straight from the phase 1 results
+        if route and intent_router:
+            answer = intent_router.answer(user_input)
+            if answer is not None:
+                print(f"\n⚡ {answer}\n")
+                if chat_memory:
+                    chat_memory.add_turn(user_input, answer)
+                continue
+
+        # ♻️ Same question, same inputs, same prices: reuse the earlier answer
+        if answer_cache is not None:
+            start = time.perf_counter()
+            cached = answer_cache.lookup(user_input, ctx)
+            if cached is not None:
+                agent_name, answer = cached
+                print(f"\n♻️ {agent_name}: {answer}\n")
+                print(f"⏱️ cached answer in {(time.perf_counter() - start) * 1000:.2f} ms\n")
+                if chat_memory:
+                    chat_memory.add_turn(user_input, answer)
+                continue
+
+        traced = len(llm_tracer.turns) if llm_tracer else 0
         try:
-            result = await Runner.run(main_agent, user_input, run_config=config)
+            run_input = chat_memory.input_for(user_input) if chat_memory else user_input
+            report_prompt_size(run_input, user_input)
+
+            start = time.perf_counter()
+            if stream:
+                with instruments.timer("runner.run_streamed") as measured:
+                    timing = await stream_turn(main_agent, run_input, ctx)
+                    measured.result = timing["output"]
+                turn_timings.append(timing)
+                if chat_memory:
+                    chat_memory.add_turn(user_input, str(timing["output"]))
+                if answer_cache is not None:
+                    answer_cache.store(user_input, ctx, timing["agent"], str(timing["output"]))
+                if intent_router:
+                    intent_router.record_fallback(timing["total"])
+                ttft = "-" if timing["ttft"] is None else f"{timing['ttft']:.2f} s"
+                print(f"⏱️ first token {ttft} · total {timing['total']:.2f} s")
+                report_llm_turn(traced)
+                print()
+                continue
+
+            with instruments.timer("runner.run") as measured:
+                result = await Runner.run(main_agent, run_input, context=ctx, run_config=config)
+                measured.result = result.final_output
+            if intent_router:
+                intent_router.record_fallback(time.perf_counter() - start)
+            if chat_memory:
+                chat_memory.add_turn(user_input, str(result.final_output))
+            if answer_cache is not None:
+                answer_cache.store(user_input, ctx, result.last_agent.name, str(result.final_output))
             for item in reversed(result.new_items):
                 try:
                     print(result.last_agent.name)
@@ -290,14 +543,126 @@ async def phase_2_agent_loop():
                     break
                 except Exception:
                     continue
+            report_llm_turn(traced)
         except Exception as e:
             print(f"❌ Agent error: {e}")
 
 
-# ✅ MAIN PROGRAM
-if __name__ == "__main__":
-    phase_1_estimation()
-    asyncio.run(phase_2_agent_loop())
-
+# ✅ HEADLESS ESTIMATE (no prompts, no agents, no API key)
+def load_spec(path: str) -> dict:
+    with open(path, "r") as file:
+        return validate_spec(json.load(file))
+
+
+def validate_spec(spec) -> dict:
+    if not isinstance(spec, dict):
+        raise ValueError("Project spec must be a JSON object")
+    unknown = sorted(set(spec) - set(DEFAULT_INPUTS))
+    if unknown:
+        raise ValueError(f"Unknown project fields: {', '.join(unknown)}")
+    return spec
+
+
+def estimate_project(spec: dict) -> dict:
+    """Run all estimators for one project spec and return a JSON-ready report."""
+    ctx = EstimationContext(spec)
+    start = time.perf_counter()
+    runs = run_estimates(ctx, verbose=False)
+    elapsed = time.perf_counter() - start
+
+    totals = summary_totals(ctx, runs)
+    return {
+        "inputs": ctx.inputs(),
+        "price_version": ctx.get("price_version"),
+        "price_digest": price_catalog.digest,
+        "results": {run.spec.produces: run.result for run in runs.values() if run.result is not None},
+        "errors": {run.spec.name: run.error for run in runs.values() if not run.ok},
+        "timings_ms": {
+            **{run.spec.name: round(run.seconds * 1000, 3) for run in runs.values()},
+            "total": round(elapsed * 1000, 3)
+        },
+        "totals": totals,
+        "grand_total": sum(totals.values())
+    }
+
+
+def estimate_command(args) -> int:
+    spec = load_spec(args.spec)
+    if args.profile or args.profile_memory:
+        with instruments.profile(cpu=args.profile, memory=args.profile_memory) as capture:
+            report = estimate_project(spec)
+        print(capture.report(), file=sys.stderr)
+    else:
+        report = estimate_project(spec)
+    output = json.dumps(report, indent=2)
+    if args.stats:
+        instruments.write(args.stats)
+
+    if args.out:
+        with open(args.out, "w") as file:
+            file.write(output + "\n")
+    else:
+        print(output)
+    return 1 if report["errors"] else 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Construction material cost estimator")
+    commands = parser.add_subparsers(dest="command")
+
+    estimate = commands.add_parser("estimate", help="estimate a project from a JSON spec without prompts or agents")
+    estimate.add_argument("--spec", required=True, help="project spec JSON (shared_inputs field names)")
+    estimate.add_argument("--out", help="write the result JSON here instead of stdout")
+    estimate.add_argument("--profile", action="store_true", help="print a cProfile report of the estimators to stderr")
+    estimate.add_argument("--profile-memory", action="store_true", help="add the tracemalloc peak and top allocations")
+    estimate.add_argument("--stats", metavar="PATH", default=argparse.SUPPRESS,
+                          help="write per-tool call stats here (.prom for Prometheus text, else JSON)")
+    add_store_arguments(estimate)
+
+    parser.add_argument("--stats", metavar="PATH",
+                        help="record per-tool and per-run call stats and write them here on exit"
+                             " (.prom for Prometheus text, else JSON)")
+
+    parser.add_argument("--eager-agents", action="store_true",
+                        help="build every specialist agent at startup instead of on first handoff")
+    parser.add_argument("--no-stream", action="store_true",
+                        help="print each answer only when the whole run is done")
+    parser.add_argument("--no-router", action="store_true",
+                        help="send every question to the agents, even plain lookups")
+    parser.add_argument("--memory-turns", type=int, default=4,
+                        help="recent chat turns sent verbatim with each question (0 = no memory)")
+    parser.add_argument("--memory-tokens", type=int, default=1000,
+                        help="token budget for those turns; older turns are summarized")
+    parser.add_argument("--trace", metavar="PATH",
+                        help="record model calls, tokens, handoffs and tool calls per turn as JSONL spans here")
+    parser.add_argument("--no-answer-cache", action="store_true",
+                        help="always ask the agents, even for a question already answered for this estimate")
+    parser.add_argument("--answer-cache", metavar="PATH",
+                        help="keep cached answers in this JSON file so they carry across sessions")
+    parser.add_argument("--answer-cache-ttl", type=float, default=24,
+                        help="hours a cached answer stays valid (default 24)")
+
+    args = parser.parse_args(argv)
+    instruments.enabled = bool(args.stats)
+
+    if args.command == "estimate":
+        if args.db:
+            try:
+                use_store(args.db, args.as_of, args.region)
+            except (PriceCatalogError, ValueError) as e:  # unknown region, bad --as-of
+                estimate.error(str(e))
+        return estimate_command(args)
+
+    setup_model(trace_path=args.trace)
+    ctx = EstimationContext()
+    phase_1_estimation(ctx, lazy_agents=not args.eager_agents)
+    cache = None if args.no_answer_cache else AnswerCache(ttl=args.answer_cache_ttl * 3600, path=args.answer_cache)
+    asyncio.run(phase_2_agent_loop(ctx, stream=not args.no_stream, route=not args.no_router,
+                                   memory_turns=args.memory_turns, memory_tokens=args.memory_tokens,
+                                   cache=cache, stats_path=args.stats))
+    return 0
 
 
+# ✅ MAIN PROGRAM
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,221 @@
+# portfolio.py
+#
+# Estimate a housing scheme: many houses, a handful of unit types. Each
+# distinct type is estimated once, in its own EstimationContext, and its
+# costs and quantities are scaled by the number of houses of that type.
+#
+#   python portfolio.py --scheme scheme.json --out scheme_report.json
+#   python portfolio.py --scheme scheme.json --db prices.db --as-of 2025-01-15 --region lahore
+#
+# scheme.json: [{"name": "5 marla", "count": 120, "spec": {...shared_inputs fields...}}, ...]
+
+import argparse
+import json
+import time
+
+from incremental import result_cost
+from price_catalog import PriceCatalogError, load_prices
+from price_store import add_store_arguments, use_store
+from room_parser import normalize_sizes
+from shared_inputs import DEFAULT_INPUTS, FLOAT_FIELDS, INT_FIELDS, SIZE_FIELDS, EstimationContext
+from takeoff import PRICING, TRADES, project_takeoff
+
+# Optional parts and the dimensions that only matter when they're included
+OPTIONAL_PARTS = {
+    "include_underground_tank": ("ug_tank_length_ft", "ug_tank_width_ft"),
+    "include_overhead_tank": ("oh_tank_length_ft", "oh_tank_width_ft"),
+    "include_tower": ("tower_length_ft", "tower_width_ft"),
+}
+
+# Scheme-level bulk quantities: name -> price catalog key the BOQs count them under
+BULK = {
+    "steel_tons": "steel.price_per_ton",
+    "cement_bags": "cement.price_per_bag",
+    "bricks": "bricks.price_per_brick",
+    "sand_cft": "sand.price_per_cft",
+    "bajri_cft": "bajri.price_per_cft",
+    "crush_cft": "crush.price_per_cft",
+    "paint_gallons": "paint.price_per_gallon",
+}
+
+
+def _number(value, kind):
+    if value is None or isinstance(value, bool):
+        return value
+    value = float(value)
+    return int(value) if kind is int and value.is_integer() else value
+
+
+def canonical_unit(spec: dict) -> dict:
+    """
+    The full input set for one unit type, in a form where two specs that
+    estimate the same are equal: defaults filled in, sizes normalized
+    ('12 x 12, 14X14' -> '12x12,14x14'), numbers typed, and tank/tower
+    sizes dropped when the part isn't included.
+    """
+    unknown = sorted(set(spec) - set(DEFAULT_INPUTS))
+    if unknown:
+        raise ValueError(f"Unknown project fields: {', '.join(unknown)}")
+
+    inputs = EstimationContext(spec).inputs()
+    for field in INT_FIELDS:
+        inputs[field] = _number(inputs[field], int)
+    for field in FLOAT_FIELDS:
+        inputs[field] = _number(inputs[field], float)
+    for field in SIZE_FIELDS:
+        inputs[field] = normalize_sizes(inputs[field])
+    for flag, dimensions in OPTIONAL_PARTS.items():
+        inputs[flag] = bool(inputs[flag])
+        for field in dimensions:
+            inputs[field] = _number(inputs[field], float) if inputs[flag] else None
+    return inputs
+
+
+def unit_key(inputs: dict) -> str:
+    return json.dumps(inputs, sort_keys=True)
+
+
+def estimate_unit(inputs: dict, prices: dict) -> dict:
+    """Take-off and pricing for one unit type: {"results", "totals", "quantities", "errors"}."""
+    boqs, errors = project_takeoff(EstimationContext(inputs))
+    results, totals, quantities = {}, {}, {}
+    for trade in TRADES:
+        if trade not in boqs:
+            continue
+        try:
+            results[trade] = PRICING[trade](boqs[trade], prices)
+        except Exception as e:
+            results[trade] = {"error": str(e)}
+        cost = result_cost(results[trade])
+        if cost is None:
+            errors[trade] = results[trade].get("error", "no total cost")
+            continue
+        totals[trade] = cost
+        for key, quantity in boqs[trade].quantities().items():
+            quantities[key] = quantities.get(key, 0) + quantity
+    return {"results": results, "totals": totals, "quantities": quantities, "errors": errors}
+
+
+def estimate_portfolio(units, prices: dict = None) -> dict:
+    """
+    Estimate a scheme given as [{"name", "count", "spec"}, ...].
+
+    Units whose canonical inputs match are one type and are estimated once.
+    Scheme totals are unit totals x count; `materials` is the scheme's
+    bill of quantities by price catalog key and `bulk` picks out the
+    headline items (steel tons, cement bags, bricks...).
+    """
+    prices = load_prices() if prices is None else prices
+    start = time.perf_counter()
+
+    types = {}
+    for i, unit in enumerate(units):
+        count = unit.get("count", 1)
+        if isinstance(count, bool) or not isinstance(count, int) or count < 1:
+            raise ValueError(f"Unit {i}: count must be a positive integer, got {count!r}")
+        spec = unit.get("spec")
+        if not isinstance(spec, dict):
+            raise ValueError(f"Unit {i}: 'spec' must be a JSON object of project fields")
+        inputs = canonical_unit(spec)
+        entry = types.setdefault(unit_key(inputs), {"names": [], "count": 0, "inputs": inputs})
+        entry["names"].append(unit.get("name") or f"unit {i + 1}")
+        entry["count"] += count
+
+    totals, materials, report_types = {}, {}, []
+    seconds_without_dedup = 0.0
+    for entry in types.values():
+        unit_start = time.perf_counter()
+        unit = estimate_unit(entry["inputs"], prices)
+        seconds = time.perf_counter() - unit_start
+        seconds_without_dedup += seconds * entry["count"]
+
+        count = entry["count"]
+        for trade, cost in unit["totals"].items():
+            totals[trade] = totals.get(trade, 0) + cost * count
+        for key, quantity in unit["quantities"].items():
+            materials[key] = materials.get(key, 0) + quantity * count
+
+        unit_cost = sum(unit["totals"].values())
+        report_types.append({
+            "names": entry["names"],
+            "count": count,
+            "inputs": entry["inputs"],
+            "unit_totals": unit["totals"],
+            "unit_cost": unit_cost,
+            "extended_cost": unit_cost * count,
+            "errors": unit["errors"],
+            "results": unit["results"],
+        })
+
+    houses = sum(entry["count"] for entry in types.values())
+    elapsed = time.perf_counter() - start
+    return {
+        "types": report_types,
+        "totals": {trade: totals[trade] for trade in TRADES if trade in totals},
+        "grand_total": sum(totals.values()),
+        "bulk": {name: round(materials[key], 3) for name, key in BULK.items() if key in materials},
+        "materials": {key: round(materials[key], 3) for key in sorted(materials)},
+        "dedup": {
+            "unit_entries": len(units),
+            "houses": houses,
+            "distinct_types": len(types),
+            "estimates_run": len(types),
+            "estimates_saved": houses - len(types),
+            "seconds": elapsed,
+            "seconds_without_dedup": seconds_without_dedup,
+        },
+    }
+
+
+def load_scheme(path: str) -> list:
+    with open(path) as file:
+        scheme = json.load(file)
+    units = scheme.get("units") if isinstance(scheme, dict) else scheme
+    if not isinstance(units, list) or not units:
+        raise ValueError("Scheme must be a non-empty list of units (or {\"units\": [...]})")
+    return units
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Estimate a housing scheme of repeated unit types")
+    parser.add_argument("--scheme", required=True, help="JSON list of {name, count, spec} units")
+    parser.add_argument("--out", help="write the full scheme report JSON here")
+    add_store_arguments(parser)
+    args = parser.parse_args(argv)
+
+    prices = None
+    if args.db:
+        try:
+            prices = use_store(args.db, args.as_of, args.region)
+        except (PriceCatalogError, ValueError) as e:  # unknown region, bad --as-of
+            parser.error(str(e))
+    report = estimate_portfolio(load_scheme(args.scheme), prices)
+
+    print(f"{'Unit type':32}{'Houses':>8}{'Unit cost':>16}{'Extended':>18}")
+    for entry in report["types"]:
+        print(f"{', '.join(entry['names'])[:31]:32}{entry['count']:>8,}"
+              f"{entry['unit_cost']:>16,.0f}{entry['extended_cost']:>18,.0f}")
+        for trade, error in entry["errors"].items():
+            print(f"  ❌ {trade}: {error}")
+
+    print("\n📋 Scheme totals:")
+    for trade, cost in report["totals"].items():
+        print(f"  {trade.replace('_', ' ').title():20}{cost:>20,.0f} PKR")
+    print(f"  {'Grand Total':20}{report['grand_total']:>20,.0f} PKR")
+
+    print("\n🧱 Bulk materials:")
+    for name, quantity in report["bulk"].items():
+        print(f"  {name.replace('_', ' '):20}{quantity:>20,.2f}")
+
+    dedup = report["dedup"]
+    print(f"\n♻️ {dedup['houses']:,} houses, {dedup['distinct_types']} distinct types:"
+          f" {dedup['estimates_saved']:,} estimates skipped,"
+          f" {dedup['seconds'] * 1000:.1f} ms instead of ~{dedup['seconds_without_dedup'] * 1000:.1f} ms")
+
+    if args.out:
+        with open(args.out, "w") as file:
+            json.dump(report, file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+# price_catalog.py
+
+import hashlib
+import json
+import os
+import threading
+
+# Resolve relative to the repo so tools work from any working directory
+PRICES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "material_prices.json")
+
+
+class PriceCatalogError(Exception):
+    pass
+
+
+def validate_prices(prices: dict) -> dict:
+    """
+    Check the catalog shape: {"item": {"price_field": number, ...}, ...}.
+    """
+    if not isinstance(prices, dict):
+        raise PriceCatalogError("material_prices.json must contain a JSON object")
+
+    for item, fields in prices.items():
+        if not isinstance(fields, dict) or not fields:
+            raise PriceCatalogError(f"'{item}' must map to an object of prices")
+        for field, value in fields.items():
+            if isinstance(value, bool) or not isinstance(value, (int, float)):
+                raise PriceCatalogError(f"'{item}.{field}' must be a number, got {value!r}")
+    return prices
+
+
+class PriceCatalog:
+    """
+    Process-wide, in-memory copy of material_prices.json.
+
+    The file is parsed and validated once and re-read only when its mtime or
+    size changes. `version` goes up by one on every (re)load and `digest`
+    identifies the file contents, so results can record which snapshot
+    they were priced with. The returned dict is shared: treat it as read-only.
+
+    `pin()` serves a catalog from elsewhere (a PriceStore snapshot) instead
+    of the file until `unpin()`.
+    """
+
+    def __init__(self, path: str = PRICES_PATH):
+        self.path = path
+        self.version = 0
+        self.digest = None
+        self._prices = None
+        self._stamp = None
+        self._pinned = False
+        self._lock = threading.Lock()
+
+    def get(self) -> dict:
+        if self._pinned:
+            return self._prices
+        try:
+            st = os.stat(self.path)
+        except OSError as e:
+            raise PriceCatalogError(f"Cannot read {self.path}: {e}") from e
+
+        stamp = (st.st_mtime_ns, st.st_size)
+        if stamp != self._stamp:
+            with self._lock:
+                if stamp != self._stamp:
+                    self._load(stamp)
+        return self._prices
+
+    def _load(self, stamp):
+        with open(self.path, "rb") as file:
+            raw = file.read()
+        try:
+            prices = json.loads(raw)
+        except ValueError as e:
+            raise PriceCatalogError(f"Invalid JSON in {self.path}: {e}") from e
+
+        self._prices = validate_prices(prices)
+        self.digest = hashlib.sha1(raw).hexdigest()[:12]
+        self.version += 1
+        self._stamp = stamp
+
+    def pin(self, prices: dict):
+        raw = json.dumps(prices, sort_keys=True).encode()
+        with self._lock:
+            self._prices = validate_prices(prices)
+            self.digest = hashlib.sha1(raw).hexdigest()[:12]
+            self.version += 1
+            self._pinned = True
+
+    def unpin(self):
+        with self._lock:
+            self._pinned = False
+            self._stamp = None
+
+    def invalidate(self):
+        with self._lock:
+            self._stamp = None
+
+
+price_catalog = PriceCatalog()
+
+
+def load_prices() -> dict:
+    return price_catalog.get()
+
+
+def prices_version() -> int:
+    price_catalog.get()
+    return price_catalog.version
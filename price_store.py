@@ -0,0 +1,259 @@
+# price_store.py
+#
+# Optional SQLite store for price history and regional catalogs. Each price
+# has an effective date and a region; a catalog "as of" a date is bulk-loaded
+# into the same {"item": {"field": price}} dict material_prices.json gives,
+# so the pricing code and BOQs don't change.
+#
+#   python price_store.py import material_prices.json --db prices.db --date 2025-07-01
+#   python price_store.py import lahore.json --db prices.db --date 2025-07-01 --region lahore
+#   python price_store.py export --db prices.db --as-of 2025-01-15 --region lahore --out old_lahore.json
+#   python main.py estimate --spec project.json --db prices.db --as-of 2025-01-15 --region lahore
+#   python portfolio.py --scheme scheme.json --db prices.db --region karachi
+
+import argparse
+import json
+import sqlite3
+from datetime import date
+
+from price_catalog import PriceCatalogError, price_catalog, validate_prices
+
+BASE_REGION = ""  # the default catalog; regions override it item by item
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS items (
+    id INTEGER PRIMARY KEY,
+    item TEXT NOT NULL,
+    field TEXT NOT NULL,
+    unit TEXT NOT NULL,
+    UNIQUE (item, field)
+);
+CREATE TABLE IF NOT EXISTS prices (
+    item_id INTEGER NOT NULL REFERENCES items (id),
+    region TEXT NOT NULL,
+    effective_date TEXT NOT NULL,
+    price REAL NOT NULL,
+    source TEXT,
+    PRIMARY KEY (item_id, region, effective_date)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS prices_by_region ON prices (region, item_id, effective_date);
+"""
+
+# Field names in material_prices.json are "<something>_per_<unit>"; a few units are spelled differently
+UNIT_ALIASES = {"sft": "sqft", "pcs": "piece", "unit": "piece"}
+
+
+def field_unit(field: str) -> str:
+    """'price_per_bag' -> 'bag', 'step_per_pcs' -> 'piece', 'price_per_sft' -> 'sqft'."""
+    _, sep, unit = field.rpartition("_per_")
+    if not sep:
+        return field
+    return UNIT_ALIASES.get(unit, unit)
+
+
+def _day(value) -> str:
+    if value is None:
+        return date.today().isoformat()
+    if isinstance(value, date):
+        return value.isoformat()
+    try:
+        return date.fromisoformat(value).isoformat()
+    except ValueError as e:
+        raise ValueError(f"Dates must be YYYY-MM-DD, got {value!r}") from e
+
+
+def _number(value: float):
+    # SQLite REAL gives floats back; keep whole prices as ints like the JSON catalog
+    return int(value) if value.is_integer() else value
+
+
+class PriceStore:
+    """
+    Prices by (item, field, region, effective date) in SQLite.
+
+    A price holds from its effective date until the next one for the same
+    item and region. `catalog(as_of, region)` returns the prices in effect
+    on that day; with `fallback`, items the region has no price for come
+    from the base catalog. Lookups go through the (item, region, date)
+    primary key and the (region, item, date) index.
+    """
+
+    def __init__(self, path: str = ":memory:"):
+        self.path = path
+        self.db = sqlite3.connect(path)
+        self.db.execute("PRAGMA foreign_keys = ON")
+        self.db.executescript(SCHEMA)
+        self._load_ids()
+
+    def _load_ids(self):
+        self._ids = dict(((item, field), item_id) for item_id, item, field in
+                         self.db.execute("SELECT id, item, field FROM items"))
+
+    def close(self):
+        self.db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _item_id(self, item: str, field: str) -> int:
+        key = (item, field)
+        if key not in self._ids:
+            cursor = self.db.execute("INSERT INTO items (item, field, unit) VALUES (?, ?, ?)",
+                                     (item, field, field_unit(field)))
+            self._ids[key] = cursor.lastrowid
+        return self._ids[key]
+
+    def _write(self, rows: list, region: str, day: str, source: str = None):
+        """Store [(item, field, price), ...] in one transaction; inputs must already be valid."""
+        try:
+            with self.db:
+                self.db.executemany("INSERT OR REPLACE INTO prices VALUES (?, ?, ?, ?, ?)",
+                                    [(self._item_id(item, field), region, day, price, source)
+                                     for item, field, price in rows])
+        except Exception:
+            self._load_ids()  # the rollback dropped any items added above
+            raise
+
+    def import_catalog(self, prices: dict, effective_date=None, region: str = BASE_REGION,
+                       source: str = None) -> int:
+        """Add every price in a material_prices.json-style dict; returns the number of rows written."""
+        validate_prices(prices)
+        rows = [(item, field, float(price)) for item, fields in prices.items() for field, price in fields.items()]
+        self._write(rows, region, _day(effective_date), source)
+        return len(rows)
+
+    def import_json(self, path: str, effective_date=None, region: str = BASE_REGION) -> int:
+        try:
+            with open(path) as file:
+                prices = json.load(file)
+        except (OSError, ValueError) as e:
+            raise PriceCatalogError(f"Cannot read {path}: {e}") from e
+        return self.import_catalog(prices, effective_date, region, source=path)
+
+    def set_price(self, item: str, field: str, price: float, effective_date=None, region: str = BASE_REGION):
+        validate_prices({item: {field: price}})
+        self._write([(item, field, float(price))], region, _day(effective_date))
+
+    def price(self, item: str, field: str, as_of=None, region: str = BASE_REGION):
+        """The price in effect on `as_of` (default today), or None."""
+        item_id = self._ids.get((item, field))
+        if item_id is None:
+            return None
+        row = self.db.execute(
+            "SELECT price FROM prices WHERE item_id = ? AND region = ? AND effective_date <= ?"
+            " ORDER BY effective_date DESC LIMIT 1",
+            (item_id, region, _day(as_of)),
+        ).fetchone()
+        return None if row is None else _number(row[0])
+
+    def _region_prices(self, region: str, day: str) -> dict:
+        rows = self.db.execute(
+            """
+            SELECT i.item, i.field, p.price
+            FROM prices p JOIN items i ON i.id = p.item_id
+            WHERE p.region = ? AND p.effective_date = (
+                SELECT MAX(q.effective_date) FROM prices q
+                WHERE q.item_id = p.item_id AND q.region = p.region AND q.effective_date <= ?
+            )
+            """,
+            (region, day),
+        )
+        catalog = {}
+        for item, field, price in rows:
+            catalog.setdefault(item, {})[field] = _number(price)
+        return catalog
+
+    def catalog(self, as_of=None, region: str = BASE_REGION, fallback: bool = True) -> dict:
+        """Bulk-load the prices in effect on `as_of` into the material_prices.json shape."""
+        day = _day(as_of)
+        prices = self._region_prices(region, day)
+        if not prices:
+            # Also for regions with fallback on: a misspelled region must not quietly quote base prices
+            label = f"region '{region}'" if region else "the base catalog"
+            known = ", ".join(name or "'' (base)" for name in self.regions()) or "none, the store is empty"
+            raise PriceCatalogError(f"No prices for {label} on or before {day} (regions: {known})")
+        catalog = self._region_prices(BASE_REGION, day) if fallback and region != BASE_REGION else {}
+        for item, fields in prices.items():
+            catalog.setdefault(item, {}).update(fields)
+        return validate_prices(catalog)
+
+    def catalogs(self, regions, as_of=None, fallback: bool = True) -> dict:
+        """{region: catalog} for catalog_quote.quote_catalogs; '' is the base catalog."""
+        return {region or "base": self.catalog(as_of, region, fallback) for region in regions}
+
+    def regions(self) -> list:
+        return [row[0] for row in self.db.execute("SELECT DISTINCT region FROM prices ORDER BY region")]
+
+    def history(self, item: str, field: str, region: str = BASE_REGION) -> list:
+        """[(effective_date, price), ...] oldest first."""
+        item_id = self._ids.get((item, field))
+        if item_id is None:
+            return []
+        rows = self.db.execute(
+            "SELECT effective_date, price FROM prices WHERE item_id = ? AND region = ? ORDER BY effective_date",
+            (item_id, region),
+        )
+        return [(day, _number(price)) for day, price in rows]
+
+    def units(self) -> dict:
+        """{"item.field": unit} for every item in the store."""
+        return {f"{item}.{field}": unit for item, field, unit in
+                self.db.execute("SELECT item, field, unit FROM items ORDER BY item, field")}
+
+
+def use_store(path: str, as_of=None, region: str = BASE_REGION) -> dict:
+    """Price every estimator from the store's catalog for `as_of`/`region` (via load_prices())."""
+    with PriceStore(path) as store:
+        prices = store.catalog(as_of, region)
+    price_catalog.pin(prices)
+    return prices
+
+
+def add_store_arguments(parser):
+    """--db/--as-of/--region, for CLIs that price from a PriceStore instead of material_prices.json."""
+    parser.add_argument("--db", help="price from this SQLite price store instead of material_prices.json")
+    parser.add_argument("--as-of", help="price date YYYY-MM-DD for --db (default today)")
+    parser.add_argument("--region", default=BASE_REGION, help="region for --db (default: the base catalog)")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="SQLite price history and regional catalogs")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    imports = commands.add_parser("import", help="add a material_prices.json-style file to the store")
+    imports.add_argument("path")
+    imports.add_argument("--db", required=True)
+    imports.add_argument("--date", help="effective date YYYY-MM-DD (default today)")
+    imports.add_argument("--region", default=BASE_REGION, help="region name (default: the base catalog)")
+
+    export = commands.add_parser("export", help="write the catalog in effect on a date as JSON")
+    export.add_argument("--db", required=True)
+    export.add_argument("--as-of", help="YYYY-MM-DD (default today)")
+    export.add_argument("--region", default=BASE_REGION)
+    export.add_argument("--no-fallback", action="store_true", help="leave out items the region has no price for")
+    export.add_argument("--out", help="write here instead of stdout")
+
+    args = parser.parse_args(argv)
+    with PriceStore(args.db) as store:
+        if args.command == "import":
+            count = store.import_json(args.path, args.date, args.region)
+            print(f"✅ {count} prices imported ({args.region or 'base'}, effective {_day(args.date)})")
+            return
+
+        try:
+            catalog = store.catalog(args.as_of, args.region, fallback=not args.no_fallback)
+        except (PriceCatalogError, ValueError) as e:  # unknown region, bad --as-of
+            parser.error(str(e))
+        output = json.dumps(catalog, indent=2)
+        if args.out:
+            with open(args.out, "w") as file:
+                file.write(output + "\n")
+        else:
+            print(output)
+
+
+if __name__ == "__main__":
+    main()
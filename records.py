@@ -0,0 +1,394 @@
+# records.py
+#
+# Slotted result records for the estimators. The *_logic functions still
+# return plain dicts (agent tools, the context and the JSON reports use
+# those); code that keeps many results around (batch runs, quote books,
+# schemes) can hold them as records instead and serialize them in bulk.
+#
+#   record = to_record("plumbing", result)      # dict -> PlumbingResult
+#   record["total_cost"], record.total_cost     # dict-style and attribute access
+#   data = pack_many(records)                   # compact binary
+#   records = unpack_many(PlumbingResult, data)
+
+import json
+import struct
+from collections.abc import Mapping
+from dataclasses import dataclass, fields
+from operator import attrgetter
+
+
+class Record(Mapping):
+    """
+    Base for result records: a read-only Mapping over the estimator's dict
+    keys (in the estimator's order), so `record["bricks"]["estimated_bricks"]`,
+    `.get()`, `in` and `dict(record)` behave like the dict it came from, and
+    a record compares equal to that dict.
+
+    Subclasses are slotted dataclasses made with @record. `KEYS` maps field
+    names to dict keys where the key isn't a valid identifier.
+    """
+
+    __slots__ = ()
+    KEYS = {}
+
+    @classmethod
+    def from_dict(cls, data: dict):
+        values = []
+        for name, key, nested in cls._schema:
+            value = data[key]
+            values.append(nested.from_dict(value) if nested else value)
+        return cls(*values)
+
+    def to_dict(self) -> dict:
+        out = {}
+        for name, key, nested in self._schema:
+            value = getattr(self, name)
+            out[key] = value.to_dict() if nested else value
+        return out
+
+    def to_json(self) -> str:
+        return json.dumps(self.to_dict(), separators=(",", ":"))
+
+    # --- Mapping ---
+    def __getitem__(self, key):
+        return getattr(self, self._names[key])
+
+    def __iter__(self):
+        return iter(self._names)
+
+    def __len__(self):
+        return len(self._schema)
+
+    def __contains__(self, key):
+        return key in self._names
+
+    # --- Binary form: every leaf as a float64, plus one bit per leaf marking ints ---
+    def _leaves(self, out: list):
+        if self._flat:
+            out.extend(self._getter(self))
+            return out
+        for name, _, nested in self._schema:
+            value = getattr(self, name)
+            if nested:
+                value._leaves(out)
+            else:
+                out.append(value)
+        return out
+
+    @classmethod
+    def _build(cls, values, flags: int, position: int):
+        if cls._flat:
+            end = position + len(cls._schema)
+            args = values[position:end]
+            if flags:
+                for i in range(len(args)):
+                    if flags >> (position + i) & 1:
+                        args[i] = int(args[i])
+            return cls(*args), end
+        args = []
+        for name, _, nested in cls._schema:
+            if nested:
+                value, position = nested._build(values, flags, position)
+            else:
+                value = values[position]
+                if flags >> position & 1:
+                    value = int(value)
+                position += 1
+            args.append(value)
+        return cls(*args), position
+
+    def pack(self) -> bytes:
+        values = self._leaves([])
+        flags = 0
+        for i, value in enumerate(values):
+            if type(value) is int:
+                flags |= 1 << i
+        return self._struct.pack(*values, flags.to_bytes(self._flag_bytes, "little"))
+
+    @classmethod
+    def unpack(cls, data: bytes):
+        *values, flags = cls._struct.unpack(data)
+        return cls._build(values, int.from_bytes(flags, "little"), 0)[0]
+
+
+def record(cls):
+    """Make `cls` a slotted dataclass record and precompute its schema."""
+    cls = dataclass(slots=True, eq=False)(cls)
+    cls._schema = tuple(
+        (f.name, cls.KEYS.get(f.name, f.name), f.type if isinstance(f.type, type) and issubclass(f.type, Record) else None)
+        for f in fields(cls)
+    )
+    cls._names = {key: name for name, key, _ in cls._schema}
+    cls._flat = not any(nested for _, _, nested in cls._schema)
+    cls._getter = attrgetter(*(name for name, _, _ in cls._schema))
+
+    def count(record_type):
+        return sum(count(nested) if nested else 1 for _, _, nested in record_type._schema)
+
+    leaves = count(cls)
+    cls._flag_bytes = (leaves + 7) // 8
+    cls._struct = struct.Struct(f"<{leaves}d{cls._flag_bytes}s")
+    return cls
+
+
+# --- Gray structure ---
+@record
+class BricksSection(Record):
+    estimated_bricks: int
+    total_wall_area_sqft: float
+    brick_price_per_unit: float
+    estimated_brick_cost: int
+
+
+@record
+class CementMortarSection(Record):
+    cement_bags: float
+    sand_cft: float
+    rohri_cft: float
+    floor_tiles_cmt: float
+    bath_wall_cmt: float
+    cement_cost: int
+    sand_cost: int
+    rohri_cost: int
+    marble_steps_cost: int
+    floor_tiles_cost: int
+    bath_wall_tiles_cost: int
+
+
+@record
+class ConcreteMixSection(Record):
+    total_volume_cft: float
+    cement_bags: float
+    bajri_cft: float
+    crush_cft: float
+    cement_cost: int
+    bajri_cost: int
+    crush_cost: int
+    concrete_cost: int
+
+
+@record
+class GrayStructureTotals(Record):
+    total_cement_bags: float
+    total_cost: float
+
+
+@record
+class GrayStructureResult(Record):
+    bricks: BricksSection
+    cement_mortar: CementMortarSection
+    concrete_mix: ConcreteMixSection
+    totals: GrayStructureTotals
+
+
+# --- Steel / labour ---
+@record
+class SteelResult(Record):
+    rcc_volume_cft: float
+    steel_per_cft_kg: float
+    total_steel_kg: float
+    total_steel_tons: float
+    steel_rate_per_ton: float
+    total_steel_cost_pkr: int
+
+
+@record
+class LabourResult(Record):
+    base_plot_area_sqft: float
+    number_of_floors: int
+    total_area_including_tanks_and_tower_sqft: float
+    labour_rate_per_sqft: float
+    total_labour_cost_pkr: int
+
+
+# --- Plumbing ---
+@record
+class PlumbingResult(Record):
+    pipe_1_2_length: float
+    pipe_1_2cost: float
+    elbow_1_2_cost: float
+    socket_1_2_cost: float
+    tee_1_2_cost: float
+    brass_socket_cost: float
+    total_1_2_pipe_cost: float
+    sewer_pipe_6inch_ft: float
+    sewer_pipe_cost: float
+    sewer_6_inch_elbows_cost: float
+    sewer_6_inch_sockets_cost: float
+    sewer_6_inch_total_cost: float
+    pipe_1_25_inch_ft: float
+    pipe_1_25_inch_cost: float
+    pipe_1_25_elbows: float
+    pipe_1_25_sockets: float
+    pipe_1_25_tees: float
+    total_1_25_cost: float
+    sewer_pipe_4inch_ft: float
+    sewer_pipe_4inch_cost: float
+    sewer_4_inch_elbows: float
+    sewer_4_inch_tees: float
+    sewer_4_inch_ytees: float
+    sewer_4_inch_ptraps: float
+    total_4_inch_cost: float
+    number_of_bathrooms: int
+    number_of_kitchens: int
+    bathroom_sets_cost: float
+    commodes_cost: float
+    wash_basin_cost: float
+    kitchen_sink_cost: float
+    kitchen_mixture_cost: float
+    washong_tap_cost: float
+    total_ceramics_cost: float
+    total_cost: float
+
+
+# --- Electric ---
+@record
+class WiringSection(Record):
+    KEYS = {"wire_3_29_ft": "3_29_ft", "wire_7_29_ft": "7_29_ft", "wire_7_36_ft": "7_36_ft", "wire_7_44_ft": "7_44_ft"}
+    wire_3_29_ft: float
+    wire_7_29_ft: float
+    wire_7_36_ft: float
+    wire_7_44_ft: float
+    cost: float
+
+
+@record
+class ConduitSection(Record):
+    length_ft: float
+    cost: float
+
+
+@record
+class BandsSocketsSection(Record):
+    band_quantity: int
+    socket_quantity: int
+    cost: float
+
+
+@record
+class BoxesSection(Record):
+    fan_boxes: int
+    switch_boxes: int
+    cost: float
+
+
+@record
+class QuantityCostSection(Record):
+    quantity: float
+    cost: float
+
+
+@record
+class DbBreakersSection(Record):
+    db_quantity: int
+    breaker_quantity: int
+    cost: float
+
+
+@record
+class ElectricResult(Record):
+    wiring: WiringSection
+    conduit_pipe: ConduitSection
+    bands_and_socket: BandsSocketsSection
+    boxes: BoxesSection
+    electric_sheets: QuantityCostSection
+    led_lights: QuantityCostSection
+    db_and_breakers: DbBreakersSection
+    total_cost: float
+
+
+# --- Paint ---
+@record
+class CoatSection(Record):
+    gallons_required: float
+    price_per_gallon: float
+    cost: float
+
+
+@record
+class InteriorPaintSection(Record):
+    wall_area_sqft: float
+    ceiling_area_sqft: float
+    total_paint_area_sqft: float
+    paint: CoatSection
+    primer: CoatSection
+    putty: CoatSection
+
+
+@record
+class ExteriorPaintSection(Record):
+    wall_area_sqft: float
+    gallons_required: float
+    price_per_gallon: float
+    cost: float
+
+
+@record
+class PaintResult(Record):
+    interior: InteriorPaintSection
+    exterior: ExteriorPaintSection
+    total_cost: float
+
+
+# --- Doors / windows ---
+@record
+class DoorsWindowsResult(Record):
+    total_doors_qty: int
+    total_windows_qty: int
+    door_area_sft: float
+    window_area_sft: float
+    total_chokhat_rft: float
+    door_cost: float
+    window_cost: float
+    chokhat_cost: float
+    door_lock_cost: float
+    bolt_cost: float
+    door_stopper_cost: float
+    total_cost: float
+
+
+RESULT_TYPES = {
+    "gray_structure": GrayStructureResult,
+    "steel": SteelResult,
+    "labour": LabourResult,
+    "plumbing": PlumbingResult,
+    "electric": ElectricResult,
+    "paint": PaintResult,
+    "doors_windows": DoorsWindowsResult,
+}
+
+
+def to_record(trade: str, result):
+    """The typed record for an estimator result, or None for an {"error": ...} result."""
+    if isinstance(result, Record):
+        return result
+    if not isinstance(result, dict) or "error" in result:
+        return None
+    return RESULT_TYPES[trade].from_dict(result)
+
+
+def _default(value):
+    if isinstance(value, Record):
+        return value.to_dict()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(value) -> str:
+    """Compact JSON for records, or dicts/lists holding them."""
+    return json.dumps(value, separators=(",", ":"), default=_default)
+
+
+def pack_many(records) -> bytes:
+    """Records of one type back to back in the binary form (no header)."""
+    return b"".join(record.pack() for record in records)
+
+
+def unpack_many(record_type, data: bytes) -> list:
+    size = record_type._struct.size
+    if len(data) % size:
+        raise ValueError(f"{len(data)} bytes is not a whole number of {record_type.__name__} records ({size} bytes)")
+    build = record_type._build
+    records = []
+    for *values, flags in record_type._struct.iter_unpack(data):
+        records.append(build(values, int.from_bytes(flags, "little"), 0)[0])
+    return records
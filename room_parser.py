@@ -0,0 +1,62 @@
+# room_parser.py
+
+from functools import lru_cache
+
+
+class Room:
+    """One 'LxW' entry from a size string, with perimeter and area precomputed."""
+
+    __slots__ = ("length", "width", "perimeter", "area")
+
+    def __init__(self, length, width):
+        self.length = length
+        self.width = width
+        self.perimeter = 2 * (length + width)
+        self.area = length * width
+
+    def __iter__(self):
+        # Allows `length, width = room`
+        yield self.length
+        yield self.width
+
+    def __eq__(self, other):
+        return isinstance(other, Room) and (self.length, self.width) == (other.length, other.width)
+
+    def __hash__(self):
+        return hash((self.length, self.width))
+
+    def __repr__(self):
+        return f"Room({self.length!r}, {self.width!r})"
+
+
+def normalize_sizes(size_str) -> str:
+    """'12 x 12, 14X14' -> '12x12,14x14'"""
+    if not size_str:
+        return ""
+    return "".join(str(size_str).lower().replace("×", "x").split())
+
+
+@lru_cache(maxsize=4096)
+def _parse_normalized(normalized: str) -> tuple:
+    rooms = []
+    for item in normalized.split(","):
+        if "x" in item:
+            try:
+                length, width = map(float, item.split("x"))
+                rooms.append(Room(length, width))
+            except ValueError:
+                continue
+    return tuple(rooms)
+
+
+def parse_sizes(size_str) -> tuple:
+    """
+    Parse comma-separated sizes like '12x12, 14x14' into Room records.
+    Malformed entries are skipped. Results are cached by the normalized
+    string and shared between callers, so treat them as read-only.
+    """
+    return _parse_normalized(normalize_sizes(size_str))
+
+
+def count_sizes(size_str) -> int:
+    return len(parse_sizes(size_str))
@@ -0,0 +1,155 @@
+# scheduler.py
+
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+
+from shared_inputs import EstimationContext
+
+
+class DependencyError(Exception):
+    pass
+
+
+class ToolSpec:
+    """
+    One estimator in the phase 1 graph.
+
+    `reads` lists the context keys the tool uses and `produces` is the key its
+    result is stored under. A tool depends on every other tool whose
+    `produces` key appears in its `reads`.
+    """
+
+    def __init__(self, name: str, func, reads: tuple, produces: str, label: str = None):
+        self.name = name
+        self.func = func
+        self.reads = tuple(reads)
+        self.produces = produces
+        self.label = label or name.replace("_", " ").title()
+
+    def __repr__(self):
+        return f"ToolSpec({self.name!r}, reads={self.reads}, produces={self.produces!r})"
+
+
+class ToolRun:
+    def __init__(self, spec: ToolSpec, result=None, error: str = None, seconds: float = 0.0):
+        self.spec = spec
+        self.result = result
+        self.error = error
+        self.seconds = seconds
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+def dependencies(specs) -> dict:
+    """Map each tool name to the names of the tools it reads from."""
+    producers = {spec.produces: spec.name for spec in specs}
+    if len(producers) != len(specs):
+        raise ValueError("Two tools produce the same context key")
+
+    graph = {
+        spec.name: {producers[key] for key in spec.reads if key in producers and producers[key] != spec.name}
+        for spec in specs
+    }
+
+    # Reject cycles up front instead of deadlocking later
+    done, visiting = set(), set()
+
+    def visit(name):
+        if name in done:
+            return
+        if name in visiting:
+            raise ValueError(f"Dependency cycle through '{name}'")
+        visiting.add(name)
+        for upstream in graph[name]:
+            visit(upstream)
+        visiting.discard(name)
+        done.add(name)
+
+    for name in graph:
+        visit(name)
+    return graph
+
+
+def _run_tool(func, ctx):
+    start = time.perf_counter()
+    result = func(ctx=ctx)
+    return result, time.perf_counter() - start
+
+
+def _run_tool_in_process(func, ctx):
+    # The worker gets a copy of the context; send back what the tool wrote
+    before = set(ctx)
+    before_ids = {key: id(value) for key, value in ctx.items()}
+    result, seconds = _run_tool(func, ctx)
+    written = {key: value for key, value in ctx.items()
+               if key not in before or id(value) != before_ids[key]}
+    return result, seconds, written
+
+
+def run_tools(specs, ctx: EstimationContext, max_workers: int = None, use_processes: bool = False) -> dict:
+    """
+    Run the tools in dependency order, independent ones concurrently.
+
+    Returns {tool name: ToolRun} in the order of `specs`. A tool whose upstream
+    failed is not run; its ToolRun carries a DependencyError message instead.
+    A tool that raises or is skipped has its `produces` key removed from ctx;
+    an {"error": ...} result is stored like any other.
+    """
+    specs = list(specs)
+    graph = dependencies(specs)
+    by_name = {spec.name: spec for spec in specs}
+    runs = {}
+    pending = set(by_name)
+    running = {}
+
+    pool_class = ProcessPoolExecutor if use_processes else ThreadPoolExecutor
+    with pool_class(max_workers=max_workers or len(specs)) as pool:
+        while pending or running:
+            for name in sorted(pending, key=list(by_name).index):
+                upstream = graph[name]
+                if not upstream <= runs.keys():
+                    continue
+                pending.discard(name)
+                spec = by_name[name]
+
+                failed = [runs[u] for u in upstream if not runs[u].ok]
+                if failed:
+                    reasons = "; ".join(f"{r.spec.name}: {r.error}" for r in failed)
+                    error = DependencyError(
+                        f"{name} needs {', '.join(r.spec.produces for r in failed)} but upstream failed ({reasons})"
+                    )
+                    runs[name] = ToolRun(spec, error=str(error))
+                    ctx.pop(spec.produces, None)  # don't leave an earlier run's result looking current
+                    continue
+
+                if use_processes:
+                    future = pool.submit(_run_tool_in_process, spec.func, EstimationContext(ctx))
+                else:
+                    future = pool.submit(_run_tool, spec.func, ctx)
+                running[future] = spec
+
+            if not running:
+                continue
+
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                spec = running.pop(future)
+                try:
+                    if use_processes:
+                        result, seconds, written = future.result()
+                        ctx.update(written)
+                    else:
+                        result, seconds = future.result()
+                except Exception as e:
+                    runs[spec.name] = ToolRun(spec, error=str(e))
+                    ctx.pop(spec.produces, None)
+                    continue
+
+                ctx[spec.produces] = result
+                # Tools report their own failures as {"error": ...}
+                error = result.get("error") if isinstance(result, dict) else None
+                runs[spec.name] = ToolRun(spec, result=result, error=error, seconds=seconds)
+
+    return {spec.name: runs[spec.name] for spec in specs}
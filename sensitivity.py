@@ -0,0 +1,190 @@
+# sensitivity.py
+#
+# "What if" sweeps: evaluate gray structure + steel cost over a grid of
+# project inputs and/or prices in one vectorized batch.
+#
+#   python sensitivity.py --spec project.json \
+#       --grid plot_length_ft=25:35:11 --grid cement.price_per_bag=1400,1500
+
+import argparse
+import itertools
+import json
+
+import numpy as np
+
+from batch_estimate import SPEC_FIELDS, estimate_batch
+from price_catalog import load_prices
+
+# Inputs where a relative change means something (ints are stepped by 1)
+NUMERIC_FIELDS = {
+    "number_of_floors", "number_of_rooms", "number_of_columns",
+    "plot_length_ft", "plot_width_ft",
+    "ug_tank_length_ft", "ug_tank_width_ft", "oh_tank_length_ft", "oh_tank_width_ft",
+    "tower_length_ft", "tower_width_ft",
+}
+INT_FIELDS = {"number_of_floors", "number_of_rooms", "number_of_columns"}
+ELASTICITY_STEP = 0.01  # ±1% for continuous inputs and prices
+
+
+def _is_price(name: str) -> bool:
+    return "." in name
+
+
+def _price(prices: dict, name: str):
+    item, _, field = name.partition(".")
+    return prices.get(item, {}).get(field)
+
+
+class SweepResult:
+    """
+    `surface` holds total cost (gray structure + steel) with one axis per
+    swept parameter, in the order of `axes`. `elasticity[name]` has the same
+    shape: d ln(cost) / d ln(param) along that axis. `base_elasticity` is the
+    elasticity at the base project for every numeric parameter in the sweep.
+    """
+
+    def __init__(self, axes: dict, surface, base_cost: float, base_elasticity: dict):
+        self.axes = axes
+        self.surface = surface
+        self.base_cost = base_cost
+        self.base_elasticity = base_elasticity
+        self.elasticity = {}
+
+        for dim, (name, values) in enumerate(axes.items()):
+            values = np.asarray(values)
+            if values.dtype.kind not in "if" or len(values) < 2:
+                continue
+            # Point elasticity from the surface itself (central differences inside the grid)
+            slope = np.gradient(surface, values.astype(float), axis=dim)
+            shape = [1] * surface.ndim
+            shape[dim] = len(values)
+            with np.errstate(divide="ignore", invalid="ignore"):
+                self.elasticity[name] = slope * values.reshape(shape) / surface
+
+    def to_dict(self) -> dict:
+        return {
+            "axes": {name: np.asarray(values).tolist() for name, values in self.axes.items()},
+            "surface": self.surface.tolist(),
+            "base_cost": self.base_cost,
+            "base_elasticity": self.base_elasticity,
+            "elasticity": {name: np.nan_to_num(e).round(4).tolist() for name, e in self.elasticity.items()},
+        }
+
+
+def sweep(base: dict, grid: dict, prices: dict = None) -> SweepResult:
+    """
+    Cost surface over the full grid of `grid` values around the `base` spec.
+
+    Keys of `grid` are gray structure inputs (shared_inputs names) or price
+    keys as "item.field" from material_prices.json. The grid points and the
+    ±steps for the base elasticities all go through one estimate_batch call.
+    """
+    prices = load_prices() if prices is None else prices
+    unknown = [name for name in grid if not _is_price(name) and name not in SPEC_FIELDS]
+    if unknown:
+        raise ValueError(f"Can't sweep {', '.join(unknown)}; use gray structure inputs or item.field price keys")
+    missing = [name for name in grid if _is_price(name) and _price(prices, name) is None]
+    if missing:
+        raise ValueError(f"Can't sweep {', '.join(missing)}; not in the price catalog")
+
+    names = list(grid)
+    axes = {name: list(grid[name]) for name in names}
+    shape = tuple(len(values) for values in axes.values())
+
+    # 🔢 Grid points: every combination, in C order so they reshape to `shape`
+    points = list(itertools.product(*axes.values()))
+
+    # ± probes around the base for the elasticities
+    probes = []
+    for name in names:
+        if _is_price(name):
+            value = _price(prices, name)
+        elif name in NUMERIC_FIELDS:
+            value = base.get(name)
+        else:
+            continue
+        if not value:
+            continue
+        step = 1 if name in INT_FIELDS else value * ELASTICITY_STEP
+        probes.append((name, value, step))
+
+    n_grid = len(points)
+    n = n_grid + 1 + 2 * len(probes)
+
+    spec_columns = {field: [base.get(field)] * n for field in SPEC_FIELDS}
+    price_columns = {}
+    for name in names:
+        if _is_price(name):
+            price_columns[name] = [_price(prices, name)] * n
+
+    for row, point in enumerate(points):
+        for name, value in zip(names, point):
+            (price_columns if _is_price(name) else spec_columns)[name][row] = value
+
+    # Row n_grid is the base project, then (minus, plus) pairs per probe
+    for k, (name, value, step) in enumerate(probes):
+        target = price_columns if _is_price(name) else spec_columns
+        target[name][n_grid + 1 + 2 * k] = value - step
+        target[name][n_grid + 2 + 2 * k] = value + step
+
+    # Size strings are fixed unless swept, so the batch parses each layout once
+    total = np.asarray(estimate_batch(spec_columns, prices, price_columns).columns["total_cost"])
+
+    base_cost = float(total[n_grid])
+    base_elasticity = {}
+    for k, (name, value, step) in enumerate(probes):
+        minus, plus = total[n_grid + 1 + 2 * k], total[n_grid + 2 + 2 * k]
+        base_elasticity[name] = round(float((plus - minus) / (2 * step) * value / base_cost), 4)
+
+    return SweepResult(axes, total[:n_grid].reshape(shape), base_cost, base_elasticity)
+
+
+def parse_grid(text: str):
+    """
+    'name=a,b,c' or 'name=start:stop:count' (inclusive linspace). Size strings
+    contain commas, so an axis of them is separated by ';' instead:
+    'room_sizes=12x12,14x14;10x10,12x12'.
+    """
+    name, _, values = text.partition("=")
+    name, values = name.strip(), values.strip()
+    if ":" in values:
+        start, stop, count = values.split(":")
+        points = np.linspace(float(start), float(stop), int(count))
+        if name in INT_FIELDS:
+            points = np.unique(points.round().astype(int))
+        return name, points.tolist()
+    points = []
+    for value in values.split(";" if ";" in values else ","):
+        try:
+            points.append(json.loads(value))
+        except ValueError:
+            points.append(value.strip())  # size strings
+    return name, points
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Cost sensitivity sweep over inputs and prices")
+    parser.add_argument("--spec", required=True, help="base project spec JSON")
+    parser.add_argument("--grid", action="append", required=True,
+                        help="name=a,b,c or name=start:stop:count (size strings: name=a;b); repeat for more axes")
+    parser.add_argument("--out", help="write the full surface JSON here")
+    args = parser.parse_args(argv)
+
+    with open(args.spec) as file:
+        base = json.load(file)
+    result = sweep(base, dict(parse_grid(g) for g in args.grid))
+
+    print(f"Base cost (gray structure + steel): {result.base_cost:,.0f} PKR")
+    print(f"Grid: {' x '.join(f'{name}[{len(v)}]' for name, v in result.axes.items())}"
+          f" = {result.surface.size:,} points")
+    print(f"Cost range: {result.surface.min():,.0f} - {result.surface.max():,.0f} PKR")
+    for name, e in result.base_elasticity.items():
+        print(f"  elasticity {name:28} {e:+.3f}")
+
+    if args.out:
+        with open(args.out, "w") as file:
+            json.dump(result.to_dict(), file)
+
+
+if __name__ == "__main__":
+    main()
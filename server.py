@@ -0,0 +1,338 @@
+# server.py
+#
+# Local HTTP service for the estimators, so other programs can get estimates
+# without the interactive prompts or the chat phase.
+#
+#   python server.py --port 8080 --workers 4
+#
+#   POST /estimate          full phase 1 pipeline, body = project spec (JSON)
+#   POST /tools/<name>      one estimator (plus whatever it depends on)
+#   GET  /tools             list of estimator names
+#   GET  /stats             request counts and latency histograms
+#   GET  /health
+#
+# Connections are kept alive (HTTP/1.1). Estimates run on a bounded worker
+# pool; when every worker is busy and the queue is full the server answers
+# 503 instead of piling up requests.
+
+import os
+import json
+import time
+import asyncio
+import argparse
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from shared_inputs import EstimationContext
+from price_catalog import price_catalog, prices_version
+from scheduler import run_tools
+from tools import phase_1_tools
+
+MAX_BODY_BYTES = 1024 * 1024
+IDLE_TIMEOUT = 15  # seconds a kept-alive connection may sit idle
+
+REASONS = {
+    200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+    413: "Payload Too Large", 500: "Internal Server Error", 503: "Service Unavailable",
+}
+
+TOOLS_BY_NAME = {spec.name: spec for spec in phase_1_tools}
+
+
+class HttpError(Exception):
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+# 🧮 Work done on the pool. Module-level so it can be sent to worker processes.
+
+def tool_closure(name: str) -> list:
+    """The named tool and every tool it depends on, in phase 1 order."""
+    needed = set()
+    by_produces = {spec.produces: spec for spec in phase_1_tools}
+
+    def visit(spec):
+        if spec.name in needed:
+            return
+        needed.add(spec.name)
+        for key in spec.reads:
+            if key in by_produces:
+                visit(by_produces[key])
+
+    visit(TOOLS_BY_NAME[name])
+    return [spec for spec in phase_1_tools if spec.name in needed]
+
+
+def run_job(kind: str, name: str, spec: dict) -> dict:
+    if kind == "estimate":
+        import main
+        return main.estimate_project(spec)
+
+    ctx = EstimationContext(spec)
+    ctx["price_version"] = prices_version()
+    run = run_tools(tool_closure(name), ctx)[name]
+    return {
+        "tool": name,
+        "price_version": ctx["price_version"],
+        "price_digest": price_catalog.digest,
+        "result": run.result,
+        "error": run.error,
+        "timing_ms": round(run.seconds * 1000, 3),
+    }
+
+
+class LatencyHistogram:
+    BUCKETS_MS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+    def __init__(self):
+        self.counts = [0] * (len(self.BUCKETS_MS) + 1)
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def observe(self, ms: float):
+        for i, bound in enumerate(self.BUCKETS_MS):
+            if ms <= bound:
+                break
+        else:
+            i = len(self.BUCKETS_MS)
+        self.counts[i] += 1
+        self.count += 1
+        self.total_ms += ms
+        self.max_ms = max(self.max_ms, ms)
+
+    def percentile(self, q: float):
+        """Upper bucket bound containing the q-th quantile (None above the last bucket)."""
+        if not self.count:
+            return None
+        target = q * self.count
+        seen = 0
+        for bound, n in zip(self.BUCKETS_MS, self.counts):
+            seen += n
+            if seen >= target:
+                return bound
+        return None
+
+    def to_dict(self) -> dict:
+        buckets = {f"le_{bound}": n for bound, n in zip(self.BUCKETS_MS, self.counts)}
+        buckets["le_inf"] = self.counts[-1]
+        return {
+            "count": self.count,
+            "mean_ms": round(self.total_ms / self.count, 3) if self.count else None,
+            "max_ms": round(self.max_ms, 3),
+            "p50_ms": self.percentile(0.5),
+            "p95_ms": self.percentile(0.95),
+            "p99_ms": self.percentile(0.99),
+            "buckets": buckets,
+        }
+
+
+class EstimationServer:
+    def __init__(self, workers: int = None, queue_size: int = 64, use_threads: bool = False):
+        self.workers = workers or os.cpu_count() or 1
+        self.capacity = self.workers + queue_size
+        pool_class = ThreadPoolExecutor if use_threads else ProcessPoolExecutor
+        self.pool = pool_class(max_workers=self.workers)
+        self.in_flight = 0
+        self.rejected = 0
+        self.connections = 0
+        self.started = time.time()
+        self.latency = {}
+        self.status_counts = {}
+
+    # 🔌 Connection handling
+
+    async def handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.connections += 1
+        try:
+            while True:
+                try:
+                    request = await asyncio.wait_for(self.read_request(reader), IDLE_TIMEOUT)
+                except (asyncio.TimeoutError, asyncio.IncompleteReadError, ConnectionError):
+                    break
+                except HttpError as e:
+                    await self.send(writer, e.status, {"error": e.message}, keep_alive=False)
+                    break
+                if request is None:
+                    break
+
+                method, path, version, headers, body = request
+                connection = headers.get("connection", "").lower()
+                keep_alive = connection != "close" if version == "HTTP/1.1" else connection == "keep-alive"
+
+                start = time.perf_counter()
+                status, payload = await self.dispatch(method, path, body)
+                self.record(method, path, status, (time.perf_counter() - start) * 1000)
+
+                await self.send(writer, status, payload, keep_alive)
+                if not keep_alive:
+                    break
+        finally:
+            self.connections -= 1
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    async def read_request(self, reader: asyncio.StreamReader):
+        try:
+            head = await reader.readuntil(b"\r\n\r\n")
+        except asyncio.IncompleteReadError as e:
+            if not e.partial:
+                return None  # client closed between requests
+            raise
+        except asyncio.LimitOverrunError:
+            raise HttpError(400, "Request headers too large")
+
+        lines = head.decode("latin-1").split("\r\n")
+        try:
+            method, path, version = lines[0].split(" ", 2)
+        except ValueError:
+            raise HttpError(400, "Malformed request line")
+
+        headers = {}
+        for line in lines[1:]:
+            if ":" in line:
+                key, value = line.split(":", 1)
+                headers[key.strip().lower()] = value.strip()
+
+        try:
+            length = int(headers.get("content-length", 0))
+        except ValueError:
+            raise HttpError(400, "Invalid Content-Length")
+        if length > MAX_BODY_BYTES:
+            raise HttpError(413, f"Body larger than {MAX_BODY_BYTES} bytes")
+        body = await reader.readexactly(length) if length else b""
+        return method.upper(), path.split("?", 1)[0], version, headers, body
+
+    async def send(self, writer: asyncio.StreamWriter, status: int, payload, keep_alive: bool):
+        body = json.dumps(payload).encode()
+        head = (
+            f"HTTP/1.1 {status} {REASONS.get(status, '')}\r\n"
+            "Content-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n"
+        )
+        if status == 503:
+            head += "Retry-After: 1\r\n"
+        writer.write(head.encode() + b"\r\n" + body)
+        await writer.drain()
+
+    # 🧭 Routing
+
+    async def dispatch(self, method: str, path: str, body: bytes):
+        try:
+            if path == "/health":
+                self.require(method, "GET")
+                return 200, {"status": "ok", "price_version": prices_version(), "price_digest": price_catalog.digest}
+            if path == "/stats":
+                self.require(method, "GET")
+                return 200, self.stats()
+            if path == "/tools":
+                self.require(method, "GET")
+                return 200, {"tools": list(TOOLS_BY_NAME)}
+            if path == "/estimate":
+                self.require(method, "POST")
+                return 200, await self.submit("estimate", None, self.parse_spec(body))
+            if path.startswith("/tools/"):
+                name = path[len("/tools/"):]
+                if name not in TOOLS_BY_NAME:
+                    raise HttpError(404, f"Unknown tool '{name}'")
+                self.require(method, "POST")
+                return 200, await self.submit("tool", name, self.parse_spec(body))
+            raise HttpError(404, f"No route for {path}")
+        except HttpError as e:
+            return e.status, {"error": e.message}
+        except Exception as e:
+            return 500, {"error": str(e)}
+
+    @staticmethod
+    def require(method: str, allowed: str):
+        if method != allowed:
+            raise HttpError(405, f"Use {allowed}")
+
+    @staticmethod
+    def parse_spec(body: bytes) -> dict:
+        import main
+
+        try:
+            spec = json.loads(body or b"{}")
+        except ValueError as e:
+            raise HttpError(400, f"Invalid JSON: {e}")
+        try:
+            return main.validate_spec(spec)
+        except ValueError as e:
+            raise HttpError(400, str(e))
+
+    async def submit(self, kind: str, name: str, spec: dict) -> dict:
+        # 🚦 Backpressure: refuse instead of queueing without limit
+        if self.in_flight >= self.capacity:
+            self.rejected += 1
+            raise HttpError(503, "Server busy, try again")
+
+        self.in_flight += 1
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self.pool, run_job, kind, name, spec)
+        finally:
+            self.in_flight -= 1
+
+    # 📊 Stats
+
+    def record(self, method: str, path: str, status: int, ms: float):
+        route = "/tools/<name>" if path.startswith("/tools/") else path
+        key = f"{method} {route}"
+        self.latency.setdefault(key, LatencyHistogram()).observe(ms)
+        self.status_counts[status] = self.status_counts.get(status, 0) + 1
+
+    def stats(self) -> dict:
+        return {
+            "uptime_s": round(time.time() - self.started, 1),
+            "workers": self.workers,
+            "capacity": self.capacity,
+            "in_flight": self.in_flight,
+            "rejected": self.rejected,
+            "open_connections": self.connections,
+            "price_version": prices_version(),  # loads (or reloads) the catalog, so the digest is current
+            "price_digest": price_catalog.digest,
+            "status_counts": {str(k): v for k, v in sorted(self.status_counts.items())},
+            "latency": {key: hist.to_dict() for key, hist in sorted(self.latency.items())},
+        }
+
+    def close(self):
+        self.pool.shutdown(wait=True, cancel_futures=True)
+
+
+async def serve(host: str, port: int, workers: int = None, queue_size: int = 64, use_threads: bool = False):
+    app = EstimationServer(workers, queue_size, use_threads)
+    prices_version()  # fail fast on a bad catalog, and stamp the digest for /health and /stats
+    server = await asyncio.start_server(app.handle_connection, host, port)
+    print(f"🚀 Estimation server on http://{host}:{port}  "
+          f"({app.workers} {'threads' if use_threads else 'processes'}, queue {queue_size},"
+          f" prices {price_catalog.digest})")
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        app.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve the estimators over HTTP")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--workers", type=int, help="size of the worker pool (default: CPU count)")
+    parser.add_argument("--queue", type=int, default=64, help="requests allowed to wait for a worker")
+    parser.add_argument("--threads", action="store_true", help="use a thread pool instead of processes")
+    args = parser.parse_args(argv)
+
+    try:
+        asyncio.run(serve(args.host, args.port, args.workers, args.queue, args.threads))
+    except KeyboardInterrupt:
+        print("\n👋 Server band ho gaya")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,9 @@
 # shared_inputs.py
 
-shared_inputs = {
+import json
+import math
+
+DEFAULT_INPUTS = {
     "plot_size_sqft": None,
     "plot_length_ft": None,
     "plot_width_ft": None,
@@ -23,48 +26,140 @@ shared_inputs = {
     "tower_width_ft": None
 }
 
-def get_initial_inputs():
+# Field types, for checking values that don't come from get_initial_inputs
+INT_FIELDS = ("number_of_floors", "number_of_rooms", "number_of_columns", "number_of_washingareas", "number_of_geysers")
+FLOAT_FIELDS = ("plot_size_sqft", "plot_length_ft", "plot_width_ft", "ug_tank_length_ft", "ug_tank_width_ft",
+                "oh_tank_length_ft", "oh_tank_width_ft", "tower_length_ft", "tower_width_ft")
+BOOL_FIELDS = ("include_underground_tank", "include_overhead_tank", "include_tower")
+SIZE_FIELDS = ("room_sizes", "bathroom_sizes", "kitchen_sizes")
+
+
+def parse_input(key: str, raw: str):
+    """Typed value for one input given as text ('set number_of_floors=3'); ValueError if it doesn't fit."""
+    if key not in DEFAULT_INPUTS:
+        raise ValueError(f"Unknown input '{key}'. Use one of: {', '.join(DEFAULT_INPUTS)}")
+    raw = raw.strip()
+    if key in SIZE_FIELDS:
+        return raw
+    if key in BOOL_FIELDS:
+        if raw.lower() in ("true", "yes", "y", "1"):
+            return True
+        if raw.lower() in ("false", "no", "n", "0"):
+            return False
+        raise ValueError(f"{key} must be true or false, got {raw!r}")
+
+    try:
+        number = float(raw)
+    except ValueError:
+        raise ValueError(f"{key} must be a number, got {raw!r}") from None
+    if not math.isfinite(number) or number < 0:
+        raise ValueError(f"{key} must be a non-negative number, got {raw!r}")
+    if key in INT_FIELDS:
+        if not number.is_integer():
+            raise ValueError(f"{key} must be a whole number, got {raw!r}")
+        return int(number)
+    return number
+
+
+class EstimationContext(dict):
+    """
+    Inputs and tool results for one estimate.
+
+    Every *_logic function takes an optional `ctx` and reads/writes only that
+    object, so separate estimates can run side by side in one process.
+    """
+
+    def __init__(self, inputs: dict = None, **kwargs):
+        super().__init__(DEFAULT_INPUTS)
+        if inputs:
+            self.update(inputs)
+        self.update(kwargs)
+
+    def inputs(self) -> dict:
+        return {key: self.get(key) for key in DEFAULT_INPUTS}
+
+    def prompt_json(self) -> str:
+        """Compact JSON with sorted keys, so the same estimate always gives the same prompt text."""
+        return json.dumps(self, separators=(",", ":"), sort_keys=True)
+
+
+class ContextView:
+    """
+    Pass-through view of an EstimationContext that records which keys a tool
+    reads. Writes go straight to the underlying context.
+    """
+
+    def __init__(self, ctx: EstimationContext):
+        self.ctx = ctx
+        self.reads = set()
+
+    def get(self, key, default=None):
+        self.reads.add(key)
+        return self.ctx.get(key, default)
+
+    def __getitem__(self, key):
+        self.reads.add(key)
+        return self.ctx[key]
+
+    def __contains__(self, key):
+        self.reads.add(key)
+        return key in self.ctx
+
+    def __setitem__(self, key, value):
+        self.ctx[key] = value
+
+    def update(self, *args, **kwargs):
+        self.ctx.update(*args, **kwargs)
+
+
+# Compatibility shim: code that still imports the module-level dict shares this
+# default context. New code should create its own EstimationContext.
+shared_inputs = EstimationContext()
+
+
+def get_initial_inputs(ctx: EstimationContext = None):
+    ctx = shared_inputs if ctx is None else ctx
     print("📥 Enter your project details:\n")
 
     try:
-        shared_inputs["plot_size_sqft"] = float(input("Plot size (sqft): "))
-        shared_inputs["plot_length_ft"] = float(input("Plot length (ft): "))
-        shared_inputs["plot_width_ft"] = float(input("Plot width (ft): "))
-        shared_inputs["number_of_floors"] = int(input("Number of floors: "))
-        shared_inputs["number_of_rooms"] = int(input("Number of rooms: "))
-        shared_inputs["room_sizes"] = input("Room sizes (comma-separated, e.g. 12x12, 14x14): ")
-        shared_inputs["bathroom_sizes"] = input("Bathroom sizes (comma-separated): ")
-        shared_inputs["kitchen_sizes"] = input("Kitchen sizes (comma-separated): ")
-        shared_inputs["number_of_washingareas"] = int(input("Number of washing areas: "))
-        shared_inputs["number_of_geysers"] = int(input("Number of geysers: "))
+        ctx["plot_size_sqft"] = float(input("Plot size (sqft): "))
+        ctx["plot_length_ft"] = float(input("Plot length (ft): "))
+        ctx["plot_width_ft"] = float(input("Plot width (ft): "))
+        ctx["number_of_floors"] = int(input("Number of floors: "))
+        ctx["number_of_rooms"] = int(input("Number of rooms: "))
+        ctx["room_sizes"] = input("Room sizes (comma-separated, e.g. 12x12, 14x14): ")
+        ctx["bathroom_sizes"] = input("Bathroom sizes (comma-separated): ")
+        ctx["kitchen_sizes"] = input("Kitchen sizes (comma-separated): ")
+        ctx["number_of_washingareas"] = int(input("Number of washing areas: "))
+        ctx["number_of_geysers"] = int(input("Number of geysers: "))
 
         # Optional: User-defined columns
         columns_input = input("Number of columns [default 14]: ")
         if columns_input:
-            shared_inputs["number_of_columns"] = int(columns_input)
+            ctx["number_of_columns"] = int(columns_input)
 
         # Underground Tank
         if input("Include underground tank? (y/n): ").lower() == 'y':
-            shared_inputs["include_underground_tank"] = True
-            shared_inputs["ug_tank_length_ft"] = float(input("Underground tank length (ft) : "))
-            shared_inputs["ug_tank_width_ft"] = float(input("Underground tank width (ft) : "))
+            ctx["include_underground_tank"] = True
+            ctx["ug_tank_length_ft"] = float(input("Underground tank length (ft) : "))
+            ctx["ug_tank_width_ft"] = float(input("Underground tank width (ft) : "))
         else:
-            shared_inputs["include_underground_tank"] = False
+            ctx["include_underground_tank"] = False
 
         # Overhead Tank
         if input("Include overhead tank? (y/n): ").lower() == 'y':
-            shared_inputs["include_overhead_tank"] = True
-            shared_inputs["oh_tank_length_ft"] = float(input("Overhead tank length (ft) : "))
-            shared_inputs["oh_tank_width_ft"] = float(input("Overhead tank width (ft) : "))
+            ctx["include_overhead_tank"] = True
+            ctx["oh_tank_length_ft"] = float(input("Overhead tank length (ft) : "))
+            ctx["oh_tank_width_ft"] = float(input("Overhead tank width (ft) : "))
         else:
-            shared_inputs["include_overhead_tank"] = False
+            ctx["include_overhead_tank"] = False
 
         if input("include_tower? (y/n): ").lower() == 'y':
-            shared_inputs["include_tower"] = True
-            shared_inputs["tower_length_ft"] = float(input("Tower length (ft) : "))
-            shared_inputs["tower_width_ft"] = float(input("Tower width (ft) : "))
+            ctx["include_tower"] = True
+            ctx["tower_length_ft"] = float(input("Tower length (ft) : "))
+            ctx["tower_width_ft"] = float(input("Tower width (ft) : "))
         else:
-            shared_inputs["include_tower"] = False
+            ctx["include_tower"] = False
 
     except Exception as e:
         print(f"❌ Input error: {e}")
@@ -0,0 +1,59 @@
+# takeoff.py
+#
+# One project's quantity take-off for every trade, and the pricing stage
+# that turns each BOQ into the estimator's result. Pure Python, so the
+# scheme estimator can use it without numpy; catalog_quote.py prices the
+# same BOQs against many catalogs at once.
+
+from shared_inputs import EstimationContext
+from tools.gray_structure_tool import gray_structure_takeoff, price_gray_structure
+from tools.steel_estimate_tool import steel_takeoff, price_steel
+from tools.labour_cost_tool import labour_takeoff, price_labour
+from tools.plumbing_estimate_tool import plumbing_takeoff, price_plumbing
+from tools.electric_estimate_tool import electric_takeoff, price_electric
+from tools.paint_estimate_tool import paint_takeoff, price_paint
+from tools.door_windows_tool import doors_windows_takeoff, price_doors_windows
+
+TRADES = ["gray_structure", "steel", "labour", "plumbing", "electric", "paint", "doors_windows"]
+
+# Pricing stage per trade: (BOQ, prices) -> the estimator's result dict
+PRICING = {
+    "gray_structure": price_gray_structure,
+    "steel": price_steel,
+    "labour": price_labour,
+    "plumbing": price_plumbing,
+    "electric": price_electric,
+    "paint": price_paint,
+    "doors_windows": price_doors_windows,
+}
+
+
+def project_takeoff(ctx: EstimationContext) -> tuple:
+    """BOQ per trade for one project, plus {trade: error} for take-offs that failed."""
+    boqs, errors = {}, {}
+
+    def paint(ctx):
+        return paint_takeoff(ctx.get("number_of_floors"), ctx.get("room_sizes") or "",
+                             ctx.get("bathroom_sizes") or "", ctx.get("kitchen_sizes") or "")
+
+    def steel(ctx):
+        if "gray_structure" not in boqs:
+            raise ValueError("steel needs the gray structure concrete volume")
+        # Same rounding as gray_structure_data["concrete_mix"]["total_volume_cft"]
+        return steel_takeoff(round(boqs["gray_structure"].measures["total_volume_cft"], 2))
+
+    takeoffs = {
+        "gray_structure": lambda ctx: gray_structure_takeoff(ctx=ctx),
+        "steel": steel,
+        "labour": labour_takeoff,
+        "plumbing": plumbing_takeoff,
+        "electric": electric_takeoff,
+        "paint": paint,
+        "doors_windows": doors_windows_takeoff,
+    }
+    for trade in TRADES:
+        try:
+            boqs[trade] = takeoffs[trade](ctx)
+        except Exception as e:
+            errors[trade] = str(e)
+    return boqs, errors
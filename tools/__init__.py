@@ -1,28 +1,33 @@
-from .bricks_estimate_tool import bricks_agent, bricks_tool_func
-from .cement_mortar_tool import estimate_cement_mortar, cement_mortar_tool_func
-from .concrete_mix_tool import estimate_concrete, concrete_tool_func
-from .steel_estimate_tool import estimate_steel, steel_estimate_tool_func
-from .plumbing_estimate_tool import estimate_plumbing, plumbing_tool_func
-from .paint_estimate_tool import estimate_paint, paint_estimate_tool_func
-from .electric_estimate_tool import estimate_electric, electric_estimate_tool_func
-from .gray_structure_tool import estimate_gray_structure, gray_structure_tool_func
-from .door_windows_tool import doors_windows_tool, doors_windows_tool_func
-from .labour_cost_tool import estimate_labour, labour_cost_tool_func
-
-
-# Export for agent tools
-agents = [
-    bricks_agent,
-    estimate_cement_mortar,
-    estimate_concrete, 
-    estimate_steel,
-    estimate_plumbing,
-    estimate_paint,
-    estimate_electric,
-    estimate_gray_structure,
-    doors_windows_tool,
-    estimate_labour
-]
+from scheduler import ToolSpec
+from utils import tool_cache
+from .bricks_estimate_tool import bricks_tool_func
+from .cement_mortar_tool import cement_mortar_tool_func
+from .concrete_mix_tool import concrete_tool_func
+from .steel_estimate_tool import steel_estimate_tool_func
+from .plumbing_estimate_tool import plumbing_tool_func
+from .paint_estimate_tool import paint_estimate_tool_func
+from .electric_estimate_tool import electric_estimate_tool_func
+from .gray_structure_tool import gray_structure_tool_func
+from .door_windows_tool import doors_windows_tool_func
+from .labour_cost_tool import labour_cost_tool_func
+
+
+# Agent tools (and the `agents` list) live in tools/agent_tools.py, which
+# pulls in the agents SDK. Load it only when one of those names is asked for,
+# so numeric estimates don't pay for the SDK import.
+AGENT_TOOL_NAMES = {
+    "agents", "bricks_agent", "estimate_bricks", "estimate_cement_mortar", "estimate_concrete",
+    "estimate_steel", "estimate_plumbing", "estimate_paint", "estimate_electric",
+    "estimate_gray_structure", "doors_windows_tool", "estimate_labour",
+}
+
+
+def __getattr__(name):
+    if name in AGENT_TOOL_NAMES:
+        from . import agent_tools
+        return getattr(agent_tools, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 # Export for internal logic calls
 tool_functions = [
@@ -38,3 +43,64 @@ tool_functions = [
     labour_cost_tool_func
 ]
 
+
+# Phase 1 estimation graph: what each tool reads from the context and where
+# its result is stored. Steel is the only tool that depends on another one.
+TANK_AND_TOWER_INPUTS = (
+    "include_underground_tank", "ug_tank_length_ft", "ug_tank_width_ft",
+    "include_overhead_tank", "oh_tank_length_ft", "oh_tank_width_ft",
+    "include_tower", "tower_length_ft", "tower_width_ft",
+)
+
+phase_1_tools = [
+    ToolSpec(
+        "gray_structure", gray_structure_tool_func,
+        reads=("number_of_floors", "room_sizes", "bathroom_sizes", "kitchen_sizes",
+               "plot_length_ft", "plot_width_ft", "number_of_rooms", "number_of_columns")
+              + TANK_AND_TOWER_INPUTS,
+        produces="gray_structure_data", label="Gray Structure"
+    ),
+    ToolSpec(
+        "steel", steel_estimate_tool_func,
+        reads=("gray_structure_data",),
+        produces="steel_data", label="Steel"
+    ),
+    ToolSpec(
+        "plumbing", plumbing_tool_func,
+        reads=("bathroom_sizes", "kitchen_sizes", "number_of_washingareas",
+               "number_of_floors", "number_of_geysers"),
+        produces="plumbing_data", label="Plumbing"
+    ),
+    ToolSpec(
+        "paint", paint_estimate_tool_func,
+        reads=("number_of_floors", "room_sizes", "bathroom_sizes", "kitchen_sizes"),
+        produces="paint_data", label="Paint"
+    ),
+    ToolSpec(
+        "electric", electric_estimate_tool_func,
+        reads=("number_of_floors", "number_of_rooms", "bathroom_sizes", "kitchen_sizes",
+               "number_of_washingareas"),
+        produces="electric_data", label="Electric"
+    ),
+    ToolSpec(
+        "doors_windows", doors_windows_tool_func,
+        reads=("number_of_floors", "number_of_rooms", "bathroom_sizes", "kitchen_sizes"),
+        produces="doors_windows_data", label="Doors / Windows"
+    ),
+    ToolSpec(
+        "labour", labour_cost_tool_func,
+        reads=("plot_size_sqft", "number_of_floors") + TANK_AND_TOWER_INPUTS,
+        produces="labour_data", label="Labour"
+    ),
+]
+
+
+# Let the agent tool cache know which context keys each tool's result depends on
+tool_cache.register_reads({spec.name: spec.reads for spec in phase_1_tools})
+tool_cache.register_reads({
+    "bricks": ("number_of_floors", "room_sizes", "bathroom_sizes", "kitchen_sizes"),
+    "cement_mortar": ("number_of_floors", "room_sizes", "bathroom_sizes", "kitchen_sizes", "bricks_data"),
+    "concrete": ("number_of_floors", "number_of_rooms", "number_of_columns", "plot_length_ft", "plot_width_ft",
+                 "include_underground_tank", "ug_tank_length_ft", "ug_tank_width_ft",
+                 "include_overhead_tank", "oh_tank_length_ft", "oh_tank_width_ft"),
+})
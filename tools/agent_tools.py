@@ -0,0 +1,55 @@
+# tools/agent_tools.py
+#
+# Agent SDK wrappers for the estimators. Importing this module loads the
+# agents/openai SDK and builds the tool schemas, so the tools package only
+# imports it when one of these names is first used (see tools/__init__.py).
+
+from agents import Agent
+from utils import context_tool
+from .bricks_estimate_tool import bricks_logic
+from .cement_mortar_tool import cement_mortar_logic
+from .concrete_mix_tool import concrete_logic
+from .steel_estimate_tool import steel_logic
+from .plumbing_estimate_tool import plumbing_logic
+from .paint_estimate_tool import paint_estimate_logic
+from .electric_estimate_tool import electric_estimate_logic
+from .gray_structure_tool import gray_structure_logic
+from .door_windows_tool import doors_windows_logic
+from .labour_cost_tool import labour_logic
+
+
+# ✅ Phase 2: Agent-compatible tools
+estimate_bricks = context_tool(bricks_logic)
+estimate_cement_mortar = context_tool(cement_mortar_logic)
+estimate_concrete = context_tool(concrete_logic)
+estimate_steel = context_tool(steel_logic)
+estimate_plumbing = context_tool(plumbing_logic)
+estimate_paint = context_tool(paint_estimate_logic, name="paint")
+estimate_electric = context_tool(electric_estimate_logic, name="electric")
+estimate_gray_structure = context_tool(gray_structure_logic)
+doors_windows_tool = context_tool(doors_windows_logic)
+estimate_labour = context_tool(labour_logic)
+
+
+bricks_agent = Agent(
+    name="Bricks Estimation Agent",
+    instructions="You are a bricks estimation expert. Use shared inputs to calculate estimates."
+                 "Always rely on the shared inputs and summary provided below.",
+
+    tools=[estimate_bricks]
+)
+
+
+# Export for agent tools
+agents = [
+    bricks_agent,
+    estimate_cement_mortar,
+    estimate_concrete,
+    estimate_steel,
+    estimate_plumbing,
+    estimate_paint,
+    estimate_electric,
+    estimate_gray_structure,
+    doors_windows_tool,
+    estimate_labour
+]
@@ -1,14 +1,17 @@
 # tools/cement_mortar_tool.py
 
-import json
-from agents import function_tool
-from shared_inputs import shared_inputs
+from shared_inputs import EstimationContext, shared_inputs
+from price_catalog import load_prices
+from room_parser import parse_sizes
+from instrumentation import instrument
 
+@instrument()
 def cement_mortar_logic(
     number_of_floors: int,
     room_sizes: str,
     bathroom_sizes: str,
-    kitchen_sizes: str
+    kitchen_sizes: str,
+    ctx: EstimationContext = None,
 ) -> dict:
     """
     Estimate cement & sand needed for:
@@ -16,18 +19,18 @@ def cement_mortar_logic(
     - Plaster (1:4)
     - Flooring (1:4 with avg 1.5 inch thickness)
     """
+    ctx = shared_inputs if ctx is None else ctx
 
     # Inputs from shared or arguments
-    number_of_floors = shared_inputs.get("number_of_floors", number_of_floors)
-    room_sizes = shared_inputs.get("room_sizes", room_sizes)
-    bathroom_sizes = shared_inputs.get("bathroom_sizes", bathroom_sizes)
-    kitchen_sizes = shared_inputs.get("kitchen_sizes", kitchen_sizes)
-    bricks_data = shared_inputs.get("bricks_data", {})
+    number_of_floors = ctx.get("number_of_floors", number_of_floors)
+    room_sizes = ctx.get("room_sizes", room_sizes)
+    bathroom_sizes = ctx.get("bathroom_sizes", bathroom_sizes)
+    kitchen_sizes = ctx.get("kitchen_sizes", kitchen_sizes)
+    bricks_data = ctx.get("bricks_data", {})
 
     # Load prices
     try:
-        with open("material_prices.json", "r") as file:
-            prices = json.load(file)
+        prices = load_prices()
     except Exception as e:
         return {"error": f"Failed to load material_prices.json: {str(e)}"}
 
@@ -40,18 +43,6 @@ def cement_mortar_logic(
     cement_price = prices["cement"]["price_per_bag"]
     sand_price = prices["sand"]["price_per_cft"]
 
-    def parse_sizes(size_str):
-        sizes = []
-        for item in size_str.split(","):
-            item = item.strip().lower().replace(" ", "")
-            if "x" in item:
-                try:
-                    length, width = map(float, item.split("x"))
-                    sizes.append((length, width))
-                except:
-                    continue
-        return sizes
-
     try:
         room_list = parse_sizes(room_sizes)
         bath_list = parse_sizes(bathroom_sizes)
@@ -75,7 +66,7 @@ def cement_mortar_logic(
 
         # 3️⃣ Flooring (1:4)
         flooring_thickness = 0.125  # 1.5 inch in ft
-        floor_area = sum(l * w for l, w in room_list + bath_list + kitchen_list)
+        floor_area = sum(room.area for room in room_list + bath_list + kitchen_list)
         total_floor_area = floor_area * number_of_floors
         flooring_volume = total_floor_area * flooring_thickness
         cement_cft_flooring = flooring_volume * (1 / 5)
@@ -124,7 +115,7 @@ def cement_mortar_logic(
         }
 
         # Optional: store in shared_inputs
-        shared_inputs["cement_mortar_data"] = result
+        ctx["cement_mortar_data"] = result
 
         return result
 
@@ -133,7 +124,6 @@ def cement_mortar_logic(
 
 
 cement_mortar_tool_func = cement_mortar_logic
-estimate_cement_mortar = function_tool(cement_mortar_logic)
 
 
 
@@ -1,10 +1,11 @@
 # tools/concrete_mix_tool.py
 
-import json
-from agents import function_tool
-from shared_inputs import shared_inputs
+from shared_inputs import EstimationContext, shared_inputs
+from price_catalog import load_prices
+from instrumentation import instrument
 
 
+@instrument()
 def concrete_logic(
     plot_length_ft: float = None,
     plot_width_ft: float = None,
@@ -16,26 +17,28 @@ def concrete_logic(
     ug_tank_width_ft: float = 4.0,
     include_overhead_tank: bool = True,
     oh_tank_length_ft: float = 5.0,
-    oh_tank_width_ft: float = 3.5
+    oh_tank_width_ft: float = 3.5,
+    ctx: EstimationContext = None,
 ) -> dict:
+    ctx = shared_inputs if ctx is None else ctx
+
     try:
         # 🧩 Pull from shared_inputs if missing
-        plot_length_ft = shared_inputs.get("plot_length_ft", plot_length_ft)
-        plot_width_ft = shared_inputs.get("plot_width_ft", plot_width_ft)
-        number_of_floors = shared_inputs.get("number_of_floors", number_of_floors)
-        number_of_rooms = shared_inputs.get("number_of_rooms", number_of_rooms)
-        number_of_columns = shared_inputs.get("number_of_columns", number_of_columns)
-        include_underground_tank = shared_inputs.get("include_underground_tank", include_underground_tank)
-        ug_tank_length_ft = shared_inputs.get("ug_tank_length_ft", ug_tank_length_ft)
-        ug_tank_width_ft = shared_inputs.get("ug_tank_width_ft", ug_tank_width_ft)
-        include_overhead_tank = shared_inputs.get("include_overhead_tank", include_overhead_tank)
-        oh_tank_length_ft = shared_inputs.get("oh_tank_length_ft", oh_tank_length_ft)
-        oh_tank_width_ft = shared_inputs.get("oh_tank_width_ft", oh_tank_width_ft)
+        plot_length_ft = ctx.get("plot_length_ft", plot_length_ft)
+        plot_width_ft = ctx.get("plot_width_ft", plot_width_ft)
+        number_of_floors = ctx.get("number_of_floors", number_of_floors)
+        number_of_rooms = ctx.get("number_of_rooms", number_of_rooms)
+        number_of_columns = ctx.get("number_of_columns", number_of_columns)
+        include_underground_tank = ctx.get("include_underground_tank", include_underground_tank)
+        ug_tank_length_ft = ctx.get("ug_tank_length_ft", ug_tank_length_ft)
+        ug_tank_width_ft = ctx.get("ug_tank_width_ft", ug_tank_width_ft)
+        include_overhead_tank = ctx.get("include_overhead_tank", include_overhead_tank)
+        oh_tank_length_ft = ctx.get("oh_tank_length_ft", oh_tank_length_ft)
+        oh_tank_width_ft = ctx.get("oh_tank_width_ft", oh_tank_width_ft)
 
         # 📦 Load prices
         try:
-            with open("material_prices.json", "r") as file:
-                prices = json.load(file)
+            prices = load_prices()
         except Exception as e:
             return {"error": f"Failed to load material_prices.json: {str(e)}"}
 
@@ -156,7 +159,7 @@ def concrete_logic(
         }
 
         # Optional: store in shared_inputs
-        shared_inputs["concrete_data"] = result
+        ctx["concrete_data"] = result
 
         return result
 
@@ -165,7 +168,6 @@ def concrete_logic(
 
 
 concrete_tool_func = concrete_logic
-estimate_concrete = function_tool(concrete_logic)
 
 
 
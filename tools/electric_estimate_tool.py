@@ -1,28 +1,26 @@
 # tools/electric_tool.py
 
-import json
-from agents import function_tool
-from shared_inputs import shared_inputs
+from boq import BOQ, price_boq
+from shared_inputs import EstimationContext, shared_inputs
+from price_catalog import load_prices
+from room_parser import count_sizes
+from instrumentation import instrument
 
 
-def electric_estimate_logic() -> dict:
-    try:
-        number_of_floors = shared_inputs["number_of_floors"]
-        number_of_rooms = shared_inputs["number_of_rooms"]
-        bathroom_sizes = shared_inputs["bathroom_sizes"]
-        kitchen_sizes = shared_inputs["kitchen_sizes"]
-        number_of_washingareas = shared_inputs["number_of_washingareas"]
-
-        # ✅ Dynamically infer counts from sizes
-        # number_of_rooms = len([b for b in room_sizes.split(",") if b.strip()])
-        number_of_bathrooms = len([b for b in bathroom_sizes.split(",") if b.strip()])
-        number_of_kitchens = len([k for k in kitchen_sizes.split(",") if k.strip()])
-        
-
-        with open("material_prices.json", "r") as file:
-            prices = json.load(file)
-    except Exception as e:
-        return {"error": f"Failed to load inputs or material_prices.json: {str(e)}"}
+def electric_takeoff(ctx: EstimationContext = None) -> BOQ:
+    """Wire and conduit feet, fittings and fixtures, no prices."""
+    ctx = shared_inputs if ctx is None else ctx
+
+    number_of_floors = ctx["number_of_floors"]
+    number_of_rooms = ctx["number_of_rooms"]
+    bathroom_sizes = ctx["bathroom_sizes"]
+    kitchen_sizes = ctx["kitchen_sizes"]
+    number_of_washingareas = ctx["number_of_washingareas"]
+
+    # ✅ Dynamically infer counts from sizes
+    # number_of_rooms = len([b for b in room_sizes.split(",") if b.strip()])
+    number_of_bathrooms = count_sizes(bathroom_sizes)
+    number_of_kitchens = count_sizes(kitchen_sizes)
 
     # Point counts
     light_points = (
@@ -48,71 +46,89 @@ def electric_estimate_logic() -> dict:
 
     electric_sheets = (number_of_rooms + number_of_bathrooms + number_of_kitchens 
                        + number_of_washingareas) * number_of_floors + ac_points + multi_plugs
-    led_lights = light_points
-    fan_boxes = fan_points
-    switch_boxes = electric_sheets
-    db_count = number_of_floors
-    breakers = (number_of_rooms * number_of_floors) + ac_points 
+
+    boq = BOQ("electric")
+    boq.add("wire_3_29", "wire_3_29.price_per_ft", wire_3_29_ft)
+    boq.add("wire_7_29", "wire_7_29.price_per_ft", wire_7_29_ft)
+    boq.add("wire_7_36", "wire_7_36.price_per_ft", wire_7_36_ft)
+    boq.add("wire_7_44", "wire_7_44.price_per_ft", wire_7_44_ft)
+    boq.add("conduit_pipe", "pipe.price_per_ft", conduit_pipe_ft)
+    boq.add("bands", "band.price_per_unit", band_count)
+    boq.add("plastic_sockets", "plastic_socket.price_per_unit", plastic_sockets)
+    boq.add("fan_boxes", "fan_box.price_per_unit", fan_points)
+    boq.add("switch_boxes", "switch_box.price_per_unit", electric_sheets)
+    boq.add("boxes_extra", None, 2)  # flat 2 PKR the boxes cost has always carried
+    boq.add("electric_sheets", "electric_sheet.price_per_unit", electric_sheets)
+    boq.add("led_lights", "led_light.price_per_unit", light_points)
+    boq.add("db", "db.price_per_unit", number_of_floors)
+    boq.add("breakers", "breaker.price_per_unit", (number_of_rooms * number_of_floors) + ac_points)
+    return boq
+
+
+def price_electric(boq: BOQ, prices: dict) -> dict:
+    """Price an electric BOQ. Raises KeyError for a missing catalog entry."""
+    cost = price_boq(boq, prices)
+    q = boq.quantity
 
     result = {
         "wiring": {
-            "3_29_ft": wire_3_29_ft,
-            "7_29_ft": wire_7_29_ft,
-            "7_36_ft": wire_7_36_ft,
-            "7_44_ft": wire_7_44_ft,
-            "cost": round(
-                wire_3_29_ft * prices["wire_3_29"]["price_per_ft"] +
-                wire_7_29_ft * prices["wire_7_29"]["price_per_ft"] +
-                wire_7_36_ft * prices["wire_7_36"]["price_per_ft"] +
-                wire_7_44_ft * prices["wire_7_44"]["price_per_ft"], 2
-            )
+            "3_29_ft": q("wire_3_29"),
+            "7_29_ft": q("wire_7_29"),
+            "7_36_ft": q("wire_7_36"),
+            "7_44_ft": q("wire_7_44"),
+            "cost": round(cost["wire_3_29"] + cost["wire_7_29"] + cost["wire_7_36"] + cost["wire_7_44"], 2)
         },
         "conduit_pipe": {
-            "length_ft": round(conduit_pipe_ft, 2),
-            "cost": round(conduit_pipe_ft * prices["pipe"]["price_per_ft"], 2)
+            "length_ft": round(q("conduit_pipe"), 2),
+            "cost": round(cost["conduit_pipe"], 2)
         },
         "bands_and_socket": {
-            "band_quantity": int(band_count),
-            "socket_quantity": int(plastic_sockets),
-            "cost": round(
-                band_count * prices["band"]["price_per_unit"] + 
-                plastic_sockets * prices["plastic_socket"]["price_per_unit"], 2),
+            "band_quantity": int(q("bands")),
+            "socket_quantity": int(q("plastic_sockets")),
+            "cost": round(cost["bands"] + cost["plastic_sockets"], 2),
             
         },
         "boxes": {
-            "fan_boxes": fan_boxes,
-            "switch_boxes": switch_boxes,
-            "cost": round(
-                fan_boxes * prices["fan_box"]["price_per_unit"] +
-                switch_boxes * prices["switch_box"]["price_per_unit"] + 2)
+            "fan_boxes": q("fan_boxes"),
+            "switch_boxes": q("switch_boxes"),
+            "cost": round(cost["fan_boxes"] + cost["switch_boxes"] + cost["boxes_extra"])
         },
 
         "electric_sheets": {
-            "quantity": electric_sheets,
-            "cost": round(electric_sheets * prices["electric_sheet"]["price_per_unit"], 2)
+            "quantity": q("electric_sheets"),
+            "cost": round(cost["electric_sheets"], 2)
         },
         "led_lights": {
-            "quantity": led_lights,
-            "cost": round(led_lights * prices["led_light"]["price_per_unit"], 2)
+            "quantity": q("led_lights"),
+            "cost": round(cost["led_lights"], 2)
         },
         "db_and_breakers": {
-            "db_quantity": db_count,
-            "breaker_quantity": breakers,
-            "cost": round(
-                db_count * prices["db"]["price_per_unit"] +
-                breakers * prices["breaker"]["price_per_unit"], 2
-            )
+            "db_quantity": q("db"),
+            "breaker_quantity": q("breakers"),
+            "cost": round(cost["db"] + cost["breakers"], 2)
         }
     }
 
     result["total_cost"] = round(sum(item["cost"] for item in result.values()), 2)
-    shared_inputs["electric_data"] = result
+    return result
+
+
+@instrument("electric")
+def electric_estimate_logic(ctx: EstimationContext = None) -> dict:
+    ctx = shared_inputs if ctx is None else ctx
+
+    try:
+        boq = electric_takeoff(ctx)
+        prices = load_prices()
+    except Exception as e:
+        return {"error": f"Failed to load inputs or material_prices.json: {str(e)}"}
+
+    result = price_electric(boq, prices)
+    ctx["electric_data"] = result
     return result
 
 
 # ✅ Wrapper for tool chaining
 electric_estimate_tool_func = electric_estimate_logic
 
-# ✅ Optional function tool
-estimate_electric = function_tool(electric_estimate_logic)
 
@@ -1,9 +1,11 @@
 # tools/gray_structure_tool.py
-import json
-from agents import function_tool
-from shared_inputs import shared_inputs
+from boq import BOQ, price_boq
+from shared_inputs import EstimationContext, shared_inputs
+from price_catalog import load_prices
+from room_parser import Room, parse_sizes
+from instrumentation import instrument
 
-def gray_structure_logic(
+def gray_structure_takeoff(
     number_of_floors: int = None,
     room_sizes: str = None,
     bathroom_sizes: str = None,
@@ -21,41 +23,44 @@ def gray_structure_logic(
     include_tower: bool = None,
     tower_length_ft: float = None,
     tower_width_ft: float = None,
-) -> dict:
+    ctx: EstimationContext = None,
+) -> BOQ:
+    """Bricks, mortar and concrete quantities, no prices."""
+    ctx = shared_inputs if ctx is None else ctx
 
     # --- Fallback to shared_inputs if args are None ---
-    number_of_floors = number_of_floors or shared_inputs.get("number_of_floors")
-    room_sizes = room_sizes or shared_inputs.get("room_sizes")
-    bathroom_sizes = bathroom_sizes or shared_inputs.get("bathroom_sizes")
-    kitchen_sizes = kitchen_sizes or shared_inputs.get("kitchen_sizes")
-    plot_length_ft = plot_length_ft or shared_inputs.get("plot_length_ft")
-    plot_width_ft = plot_width_ft or shared_inputs.get("plot_width_ft")
-    number_of_rooms = number_of_rooms or shared_inputs.get("number_of_rooms")
-    number_of_columns = number_of_columns or shared_inputs.get("number_of_columns")
+    number_of_floors = number_of_floors or ctx.get("number_of_floors")
+    room_sizes = room_sizes or ctx.get("room_sizes")
+    bathroom_sizes = bathroom_sizes or ctx.get("bathroom_sizes")
+    kitchen_sizes = kitchen_sizes or ctx.get("kitchen_sizes")
+    plot_length_ft = plot_length_ft or ctx.get("plot_length_ft")
+    plot_width_ft = plot_width_ft or ctx.get("plot_width_ft")
+    number_of_rooms = number_of_rooms or ctx.get("number_of_rooms")
+    number_of_columns = number_of_columns or ctx.get("number_of_columns")
 
     include_underground_tank = (
         include_underground_tank
         if include_underground_tank is not None
-        else shared_inputs.get("include_underground_tank", False)
+        else ctx.get("include_underground_tank", False)
     )
-    ug_tank_length_ft = ug_tank_length_ft or shared_inputs.get("ug_tank_length_ft", 0.0)
-    ug_tank_width_ft = ug_tank_width_ft or shared_inputs.get("ug_tank_width_ft", 0.0)
+    ug_tank_length_ft = ug_tank_length_ft or ctx.get("ug_tank_length_ft", 0.0)
+    ug_tank_width_ft = ug_tank_width_ft or ctx.get("ug_tank_width_ft", 0.0)
 
     include_overhead_tank = (
         include_overhead_tank
         if include_overhead_tank is not None
-        else shared_inputs.get("include_overhead_tank", False)
+        else ctx.get("include_overhead_tank", False)
     )
-    oh_tank_length_ft = oh_tank_length_ft or shared_inputs.get("oh_tank_length_ft", 0.0)
-    oh_tank_width_ft = oh_tank_width_ft or shared_inputs.get("oh_tank_width_ft", 0.0)
+    oh_tank_length_ft = oh_tank_length_ft or ctx.get("oh_tank_length_ft", 0.0)
+    oh_tank_width_ft = oh_tank_width_ft or ctx.get("oh_tank_width_ft", 0.0)
 
     include_tower = (
         include_tower
         if include_tower is not None
-        else shared_inputs.get("include_tower", False)
+        else ctx.get("include_tower", False)
     )
-    tower_length_ft = tower_length_ft or shared_inputs.get("tower_length_ft", 0.0)
-    tower_width_ft = tower_width_ft or shared_inputs.get("tower_width_ft", 0.0)
+    tower_length_ft = tower_length_ft or ctx.get("tower_length_ft", 0.0)
+    tower_width_ft = tower_width_ft or ctx.get("tower_width_ft", 0.0)
 
     # --- Defaults if tank/tower included but no size provided ---
     if include_underground_tank:
@@ -75,37 +80,20 @@ def gray_structure_logic(
         tower_width_ft = tower_width_ft if tower_width_ft > 0 else 6.0
     else:
         tower_length_ft = tower_width_ft = 0.0
-        
 
-    try:
-        with open("material_prices.json", "r") as file:
-            prices = json.load(file)
-    except Exception as e:
-        return {"error": f"Failed to load material_prices.json: {str(e)}"}
+    boq = BOQ("gray_structure")
 
     # -------------------- BRICKS --------------------
-    def parse_sizes(size_str):
-        sizes = []
-        for item in size_str.split(","):
-            item = item.strip().lower().replace(" ", "")
-            if "x" in item:
-                try:
-                    l, w = map(float, item.split("x"))
-                    sizes.append((l, w))
-                except:
-                    continue
-        return sizes
-
     room_list = parse_sizes(room_sizes)
     bath_list = parse_sizes(bathroom_sizes)
     kitchen_list = parse_sizes(kitchen_sizes)
 
     if not room_list:
-        room_list = [(12, 12)] * number_of_rooms
+        room_list = (Room(12, 12),) * number_of_rooms
     if not bath_list:
-        bath_list = [(6, 6)] * number_of_rooms
+        bath_list = (Room(6, 6),) * number_of_rooms
     if not kitchen_list:
-        kitchen_list = [(8, 10)]
+        kitchen_list = (Room(8, 10),)
 
     all_rooms = room_list + bath_list + kitchen_list
     bath_wall_list = bath_list
@@ -114,39 +102,23 @@ def gray_structure_logic(
     total_wall_area = 0
     total_bath_wall_area = 0
     total_ceiling_area = 0
-    for length, width in all_rooms:
-        perimeter = 2 * (length + width)
-        wall_area = perimeter * wall_height
-        total_wall_area += wall_area
-        ceiling_area = length * width
-        total_ceiling_area += ceiling_area
-
-    for length, width in bath_wall_list:
-        bath_perimeter = 2 * (length + width)
-        bath_wall_area = bath_perimeter * wall_height
-        total_bath_wall_area += bath_wall_area
+    for room in all_rooms:
+        total_wall_area += room.perimeter * wall_height
+        total_ceiling_area += room.area
+
+    for room in bath_wall_list:
+        total_bath_wall_area += room.perimeter * wall_height
 
     total_ceiling_area *= number_of_floors
     total_wall_area *= number_of_floors * 0.85 # less 15% bricks
     bricks_per_sqft = 1.5
     estimated_bricks = int(total_wall_area * bricks_per_sqft)
-    brick_price = prices.get("bricks", {}).get("price_per_brick", 0)
-    estimated_brick_cost = int(estimated_bricks * brick_price)
 
-    shared_inputs["bricks_data"] = {
-        "estimated_bricks": estimated_bricks,
-        "estimated_bricks_cost": estimated_brick_cost, 
-        "total_wall_area_sqft": total_wall_area
-    }
+    boq.add("bricks", "bricks.price_per_brick", estimated_bricks)
+    boq.measures["total_wall_area_sqft"] = total_wall_area
 
     # -------------------- CEMENT MORTAR --------------------
-    cement_price = prices.get("cement", {}).get("price_per_bag", 0)
-    sand_price = prices.get("sand", {}).get("price_per_cft", 0)
-    rohri_price = prices.get("rohri", {}).get("price_per_cft", 0)
-    floor_tiles_price = prices.get("flooring_tiles", {}).get("tiles_per_cmt", 0)
-    bath_tiles_price = prices.get("flooring_tiles", {}).get("tiles_per_cmt", 0)
-    floor_area = sum(l * w for l, w in all_rooms) * number_of_floors
-
+    floor_area = sum(room.area for room in all_rooms) * number_of_floors
 
     cement_bags_masonry = estimated_bricks / 200
     sand_cft_masonry = cement_bags_masonry * 7.5
@@ -170,27 +142,15 @@ def gray_structure_logic(
 
     total_cement_bags = cement_bags_masonry + cement_bags_plaster + cement_bags_flooring + cement_bags_base_ground
     total_sand_cft = sand_cft_masonry + sand_cft_plaster + sand_cft_flooring + sand_base_ground
-    total_cement_cost = total_cement_bags * cement_price
-    total_sand_cost = total_sand_cft * sand_price
-    rohri_cost = rohri_volume * rohri_price
-    floor_tiles_cost = flooring_tiles * floor_tiles_price
-    bath_tiles_cost = bath_wall_tiles * bath_tiles_price
-    total_mortar_cost = total_cement_cost + total_sand_cost + rohri_cost + floor_tiles_cost + bath_tiles_cost
 
-    shared_inputs["cement_mortar_data"] = {
-        "plaster_volume_sft": plaster_volume,
-        "cement_bags": total_cement_bags,
-        "sand_cft": total_sand_cft,
-        "rohri_cft": rohri_volume,
-        "floor_tiles_cft": flooring_tiles,
-        "bath_wall_tiles_cft": bath_wall_tiles,
-    }
+    boq.add("cement_mortar", "cement.price_per_bag", total_cement_bags)
+    boq.add("sand", "sand.price_per_cft", total_sand_cft)
+    boq.add("rohri", "rohri.price_per_cft", rohri_volume)
+    boq.add("floor_tiles", "flooring_tiles.tiles_per_cmt", flooring_tiles)
+    boq.add("bath_wall_tiles", "flooring_tiles.tiles_per_cmt", bath_wall_tiles)
+    boq.measures["plaster_volume_sft"] = plaster_volume
 
     # -------------------- CONCRETE MIX --------------------
-    bajri_price = prices.get("bajri", {}).get("price_per_cft", 0)
-    crush_price = prices.get("crush", {}).get("price_per_cft", 0)
-    marble_step_price = prices.get("marble_steps", {}).get("step_per_pcs", 0)
-
     # all volumes in cubic feet cft
     base_concrete = 50 * number_of_columns         # digginig 5(length) x 5(width) x 2(heigth) concrete filling
     short_col_concrete = 4 * number_of_columns     # 2(width) x 0.5(thickness) x 4(heigth)
@@ -237,7 +197,6 @@ def gray_structure_logic(
     step_volume = stair_width * tread_depth * riser_height
     stair_volume = number_of_floors * steps_per_floor * step_volume # total volume in cubic feet cft
     marble_steps = steps_per_floor * number_of_floors
-    marble_step_cost = marble_steps * marble_step_price
 
     # total volume in cubic feet cft
     total_volume = (
@@ -251,57 +210,134 @@ def gray_structure_logic(
     crush_cft = total_volume * (2 / 7)
     cement_bags_concrete = cement_cft / 1.25
 
-    cement_cost_concrete = cement_bags_concrete * cement_price
-    bajri_cost = bajri_cft * bajri_price
-    crush_cost = crush_cft * crush_price
-    
+    boq.add("cement_concrete", "cement.price_per_bag", cement_bags_concrete)
+    boq.add("bajri", "bajri.price_per_cft", bajri_cft)
+    boq.add("crush", "crush.price_per_cft", crush_cft)
+    # Marble steps are priced in the mortar breakdown but have never been part of total_cost
+    boq.add("marble_steps", "marble_steps.step_per_pcs", marble_steps, in_total=False)
+    boq.measures["total_volume_cft"] = total_volume
+
+    return boq
 
-    concrete_cost = cement_cost_concrete + bajri_cost + crush_cost 
+
+def price_gray_structure(boq: BOQ, prices: dict) -> dict:
+    """Price a gray structure BOQ; missing catalog entries count as 0 like the tool always has."""
+    cost = price_boq(boq, prices, default=0)
+    q = boq.quantity
+
+    # -------------------- BRICKS --------------------
+    estimated_brick_cost = int(cost["bricks"])
+
+    # -------------------- CEMENT MORTAR --------------------
+    total_cement_cost = cost["cement_mortar"]
+    total_sand_cost = cost["sand"]
+    rohri_cost = cost["rohri"]
+    floor_tiles_cost = cost["floor_tiles"]
+    bath_tiles_cost = cost["bath_wall_tiles"]
+    total_mortar_cost = total_cement_cost + total_sand_cost + rohri_cost + floor_tiles_cost + bath_tiles_cost
+
+    # -------------------- CONCRETE MIX --------------------
+    cement_cost_concrete = cost["cement_concrete"]
+    bajri_cost = cost["bajri"]
+    crush_cost = cost["crush"]
+    concrete_cost = cement_cost_concrete + bajri_cost + crush_cost
 
     total_cost = estimated_brick_cost + total_mortar_cost+ concrete_cost
 
-    result = {
+    return {
         "bricks": {
-            "estimated_bricks": estimated_bricks,
-            "total_wall_area_sqft": round(total_wall_area, 2),
-            "brick_price_per_unit": brick_price,
+            "estimated_bricks": q("bricks"),
+            "total_wall_area_sqft": round(boq.measures["total_wall_area_sqft"], 2),
+            "brick_price_per_unit": prices.get("bricks", {}).get("price_per_brick", 0),
             "estimated_brick_cost": estimated_brick_cost
         },
         "cement_mortar": {
-            "cement_bags": round(total_cement_bags, 1),
-            "sand_cft": round(total_sand_cft, 1),
-            "rohri_cft": round(rohri_volume, 1),
-            "floor_tiles_cmt": round(flooring_tiles,1),
-            "bath_wall_cmt": round(bath_wall_tiles,1),
+            "cement_bags": round(q("cement_mortar"), 1),
+            "sand_cft": round(q("sand"), 1),
+            "rohri_cft": round(q("rohri"), 1),
+            "floor_tiles_cmt": round(q("floor_tiles"),1),
+            "bath_wall_cmt": round(q("bath_wall_tiles"),1),
             "cement_cost": round(total_cement_cost),
             "sand_cost": round(total_sand_cost),
             "rohri_cost": round(rohri_cost),
-            "marble_steps_cost": round(marble_step_cost),
+            "marble_steps_cost": round(cost["marble_steps"]),
             "floor_tiles_cost": round(floor_tiles_cost),
             "bath_wall_tiles_cost": round(bath_tiles_cost)
         },
         "concrete_mix": {
-            "total_volume_cft": round(total_volume, 2),
-            "cement_bags": round(cement_bags_concrete, 1),
-            "bajri_cft": round(bajri_cft, 1),
-            "crush_cft": round(crush_cft, 1),
+            "total_volume_cft": round(boq.measures["total_volume_cft"], 2),
+            "cement_bags": round(q("cement_concrete"), 1),
+            "bajri_cft": round(q("bajri"), 1),
+            "crush_cft": round(q("crush"), 1),
             "cement_cost": round(cement_cost_concrete),
             "bajri_cost": round(bajri_cost),
-            "crush_cost": round(crush_cost),            
+            "crush_cost": round(crush_cost),
             "concrete_cost": round(concrete_cost)
         },
         "totals": {
-            "total_cement_bags": round(total_cement_bags + cement_bags_concrete, 1),
+            "total_cement_bags": round(q("cement_mortar") + q("cement_concrete"), 1),
             "total_cost": total_cost
         }
 
     }
-    
-    shared_inputs["gray_structure_data"] = result
+
+
+@instrument()
+def gray_structure_logic(
+    number_of_floors: int = None,
+    room_sizes: str = None,
+    bathroom_sizes: str = None,
+    kitchen_sizes: str = None,
+    plot_length_ft: float = None,
+    plot_width_ft: float = None,
+    number_of_rooms: int = None,
+    number_of_columns: int = None,
+    include_underground_tank: bool = None,
+    ug_tank_length_ft: float = None,
+    ug_tank_width_ft: float = None,
+    include_overhead_tank: bool = None,
+    oh_tank_length_ft: float = None,
+    oh_tank_width_ft: float = None,
+    include_tower: bool = None,
+    tower_length_ft: float = None,
+    tower_width_ft: float = None,
+    ctx: EstimationContext = None,
+) -> dict:
+    ctx = shared_inputs if ctx is None else ctx
+
+    boq = gray_structure_takeoff(
+        number_of_floors, room_sizes, bathroom_sizes, kitchen_sizes,
+        plot_length_ft, plot_width_ft, number_of_rooms, number_of_columns,
+        include_underground_tank, ug_tank_length_ft, ug_tank_width_ft,
+        include_overhead_tank, oh_tank_length_ft, oh_tank_width_ft,
+        include_tower, tower_length_ft, tower_width_ft,
+        ctx=ctx,
+    )
+
+    try:
+        prices = load_prices()
+    except Exception as e:
+        return {"error": f"Failed to load material_prices.json: {str(e)}"}
+
+    result = price_gray_structure(boq, prices)
+
+    ctx["bricks_data"] = {
+        "estimated_bricks": boq.quantity("bricks"),
+        "estimated_bricks_cost": result["bricks"]["estimated_brick_cost"],
+        "total_wall_area_sqft": boq.measures["total_wall_area_sqft"]
+    }
+    ctx["cement_mortar_data"] = {
+        "plaster_volume_sft": boq.measures["plaster_volume_sft"],
+        "cement_bags": boq.quantity("cement_mortar"),
+        "sand_cft": boq.quantity("sand"),
+        "rohri_cft": boq.quantity("rohri"),
+        "floor_tiles_cft": boq.quantity("floor_tiles"),
+        "bath_wall_tiles_cft": boq.quantity("bath_wall_tiles"),
+    }
+    ctx["gray_structure_data"] = result
     return result
 
 gray_structure_tool_func = gray_structure_logic
-estimate_gray_structure = function_tool(gray_structure_logic)
 
 
 
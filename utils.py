@@ -0,0 +1,152 @@
+# utils.py
+
+import copy
+import functools
+import inspect
+import json
+import threading
+from collections import OrderedDict
+
+from price_catalog import prices_version
+from room_parser import normalize_sizes
+from shared_inputs import EstimationContext, shared_inputs
+
+
+def estimate_tokens(text: str) -> int:
+    # Rough rule of thumb: ~4 characters per token for English/JSON
+    return (len(text) + 3) // 4
+
+
+class LRUCache:
+    """Small thread-safe LRU map with hit/miss counters."""
+
+    def __init__(self, maxsize: int = 256):
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, default=None):
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return self._data[key]
+            self.misses += 1
+            return default
+
+    def put(self, key, value):
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self.hits = self.misses = 0
+
+    def __len__(self):
+        return len(self._data)
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 3) if total else None,
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+        }
+
+
+class ToolCache(LRUCache):
+    """
+    Results of agent tool calls, keyed on the tool, its normalized arguments,
+    the price catalog version and the context keys the tool reads.
+
+    Read keys are registered per tool name (tools/__init__.py does this from
+    the ToolSpecs). Tools without registered reads are not cached, since we
+    can't tell when their result would go stale.
+    """
+
+    def __init__(self, maxsize: int = 256):
+        super().__init__(maxsize)
+        self.reads = {}
+
+    def register_reads(self, reads: dict):
+        self.reads.update({name: tuple(keys) for name, keys in reads.items()})
+
+    def key(self, name: str, ctx: dict, args: tuple, kwargs: dict):
+        normalize = lambda v: normalize_sizes(v) if isinstance(v, str) else v
+        return json.dumps(
+            [
+                name,
+                prices_version(),
+                [normalize(v) for v in args],
+                {k: normalize(v) for k, v in kwargs.items()},
+                {k: ctx.get(k) for k in self.reads[name]},
+            ],
+            sort_keys=True, default=repr,
+        )
+
+    def call(self, name: str, logic, ctx: EstimationContext, args: tuple, kwargs: dict):
+        if name not in self.reads:
+            return logic(*args, ctx=ctx, **kwargs)
+
+        key = self.key(name, ctx, args, kwargs)
+        cached = self.get(key)
+        if cached is not None:
+            # Replay what the original call wrote so the session context looks the same
+            result, written = copy.deepcopy(cached)
+            ctx.update(written)
+            return result
+
+        before = {k: id(v) for k, v in ctx.items()}
+        result = logic(*args, ctx=ctx, **kwargs)
+        written = {k: v for k, v in ctx.items() if k not in before or id(v) != before[k]}
+        self.put(key, copy.deepcopy((result, written)))
+        return result
+
+
+# Shared by every agent tool built with context_tool()
+tool_cache = ToolCache()
+
+
+def context_tool(logic, name: str = None):
+    """
+    Expose a *_logic function as an agent tool bound to the run's context.
+
+    The tool's first parameter is the RunContextWrapper (hidden from the model),
+    and the EstimationContext given to Runner.run(context=...) is passed to the
+    logic function as `ctx`. Without a run context the logic falls back to the
+    global shared_inputs.
+
+    Calls go through `tool_cache` under `name` (default: the function name
+    without "_logic"), so repeated questions in phase 2 reuse earlier results.
+    """
+    from agents import RunContextWrapper, function_tool  # only needed for the chat phase
+
+    name = name or logic.__name__.removesuffix("_logic")
+    sig = inspect.signature(logic)
+    params = [p for key, p in sig.parameters.items() if key != "ctx"]
+    wrapper_param = inspect.Parameter(
+        "wrapper",
+        inspect.Parameter.POSITIONAL_OR_KEYWORD,
+        annotation=RunContextWrapper[EstimationContext],
+    )
+
+    @functools.wraps(logic)
+    def tool(wrapper, *args, **kwargs):
+        ctx = shared_inputs if wrapper.context is None else wrapper.context
+        return tool_cache.call(name, logic, ctx, args, kwargs)
+
+    tool.__signature__ = sig.replace(parameters=[wrapper_param] + params)
+    tool.__annotations__ = {
+        "wrapper": wrapper_param.annotation,
+        **{k: v for k, v in logic.__annotations__.items() if k != "ctx"},
+    }
+    del tool.__wrapped__
+    return function_tool(tool)